@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Shared, path-keyed image cache with thread-pool decoding.
+
+PNG decoding happens on worker threads (pygame releases the GIL while
+SDL_image decodes); converting to the display format happens on the thread
+that asks for the image (for the farm scene, main.py's loading thread).
+Every image is loaded once per process no matter how many scenes, trees or
+maps ask for it. An optional on-disk cache stores decoded RGBA pixels so
+later starts skip PNG decoding entirely.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+from config import ASSET_LOADER_WORKERS, ASSET_DISK_CACHE
+
+_DISK_MAGIC = b'FGAC1'
+_HEADER = struct.Struct('<5sI')
+
+
+class AssetCache:
+    """Decode images in a thread pool and hand out converted surfaces by path."""
+
+    def __init__(self, workers: int = ASSET_LOADER_WORKERS, disk_cache: Optional[str] = ASSET_DISK_CACHE):
+        self.base_dir = os.path.dirname(os.path.abspath(__file__))
+        self.workers = max(1, int(workers))
+        self.disk_cache = self._resolve(disk_cache) if disk_cache else None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._images: Dict[Tuple[str, bool], pygame.Surface] = {}
+        self._disk_index: Optional[Dict[str, dict]] = None
+        self._disk_blob: Optional[memoryview] = None
+        self._disk_dirty = False
+        self._lock = threading.Lock()
+
+    def _resolve(self, path: str) -> str:
+        if not os.path.isabs(path):
+            path = os.path.join(self.base_dir, path)
+        return os.path.normpath(path)
+
+    def __contains__(self, path: str) -> bool:
+        path = self._resolve(path)
+        return (path, True) in self._images or (path, False) in self._images
+
+    # ==================== Loading ====================
+
+    def prefetch(self, paths: Iterable[str]):
+        """Start decoding ``paths`` in the background; returns immediately."""
+        self._open_disk_cache()
+        with self._lock:
+            for path in paths:
+                path = self._resolve(path)
+                if path in self._pending or (path, True) in self._images:
+                    continue
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                        thread_name_prefix='asset-loader')
+                self._pending[path] = self._executor.submit(self._decode, path)
+
+    def load(self, path: str, convert_alpha: bool = True) -> pygame.Surface:
+        """Return the cached surface for ``path``, decoding it if needed.
+
+        Raises the decode error (e.g. FileNotFoundError) if the file cannot be read.
+        """
+        path = self._resolve(path)
+        key = (path, convert_alpha)
+        surf = self._images.get(key)
+        if surf is not None:
+            return surf
+
+        with self._lock:
+            future = self._pending.pop(path, None)
+        if future is not None:
+            surf = future.result()
+        else:
+            self._open_disk_cache()
+            surf = self._decode(path)
+
+        if pygame.display.get_surface() is None:
+            # Nothing to convert to yet; hand out the raw surface uncached
+            return surf
+        surf = surf.convert_alpha() if convert_alpha else surf.convert()
+        with self._lock:
+            self._images[key] = surf
+        return surf
+
+    def load_many(self, paths: Iterable[str], convert_alpha: bool = True) -> List[pygame.Surface]:
+        """Decode ``paths`` in parallel and return their surfaces in order."""
+        paths = list(paths)
+        self.prefetch(paths)
+        return [self.load(path, convert_alpha) for path in paths]
+
+    def clear(self):
+        """Drop every cached surface (e.g. after the display mode changes)."""
+        with self._lock:
+            self._images.clear()
+
+    def shutdown(self):
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _decode(self, path: str) -> pygame.Surface:
+        entry = self._disk_entry(path)
+        if entry is not None:
+            start = entry['offset']
+            pixels = self._disk_blob[start:start + entry['length']]
+            return pygame.image.frombuffer(pixels, (entry['w'], entry['h']), 'RGBA')
+        self._disk_dirty = self.disk_cache is not None
+        return pygame.image.load(path)
+
+    # ==================== Disk Cache ====================
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _disk_key(self, path: str) -> str:
+        return os.path.relpath(path, self.base_dir).replace(os.sep, '/')
+
+    def _disk_entry(self, path: str) -> Optional[dict]:
+        if not self._disk_index:
+            return None
+        entry = self._disk_index.get(self._disk_key(path))
+        if entry is None or self._stamp(path) != (entry['mtime_ns'], entry['size']):
+            return None
+        return entry
+
+    def _open_disk_cache(self):
+        """Read the disk cache once; a missing or corrupt file is simply ignored."""
+        if self.disk_cache is None or self._disk_index is not None:
+            return
+        self._disk_index = {}
+        if not os.path.exists(self.disk_cache):
+            return
+        try:
+            with open(self.disk_cache, 'rb') as f:
+                data = f.read()
+            magic, index_len = _HEADER.unpack_from(data)
+            if magic != _DISK_MAGIC:
+                return
+            start = _HEADER.size
+            self._disk_index = json.loads(data[start:start + index_len].decode('utf-8'))
+            self._disk_blob = memoryview(data)[start + index_len:]
+        except Exception as exc:
+            print(f"Ignoring unreadable asset cache {self.disk_cache}: {exc}")
+            self._disk_index = {}
+            self._disk_blob = None
+
+    def save_disk_cache(self) -> bool:
+        """Write decoded pixels of every cached image if anything was decoded from PNG."""
+        if self.disk_cache is None or not self._disk_dirty:
+            return False
+        index = {}
+        chunks = []
+        offset = 0
+        with self._lock:
+            images = [(path, surf) for (path, alpha), surf in self._images.items() if alpha]
+        for path, surf in images:
+            stamp = self._stamp(path)
+            if stamp is None:
+                continue
+            pixels = pygame.image.tobytes(surf, 'RGBA')
+            index[self._disk_key(path)] = {
+                'mtime_ns': stamp[0], 'size': stamp[1],
+                'w': surf.get_width(), 'h': surf.get_height(),
+                'offset': offset, 'length': len(pixels),
+            }
+            chunks.append(pixels)
+            offset += len(pixels)
+        header = json.dumps(index).encode('utf-8')
+        try:
+            os.makedirs(os.path.dirname(self.disk_cache), exist_ok=True)
+            tmp_path = self.disk_cache + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER.pack(_DISK_MAGIC, len(header)))
+                f.write(header)
+                for pixels in chunks:
+                    f.write(pixels)
+            os.replace(tmp_path, self.disk_cache)
+        except OSError as exc:
+            print(f"Failed to write asset cache {self.disk_cache}: {exc}")
+            return False
+        self._disk_dirty = False
+        return True
+
+
+# Global asset cache instance
+asset_cache = None
+
+
+def get_asset_cache() -> AssetCache:
+    """Get the shared asset cache"""
+    global asset_cache
+    if asset_cache is None:
+        asset_cache = AssetCache()
+    return asset_cache
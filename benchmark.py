@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+Headless FarmScene benchmark.
+
+Runs the farm scene with the dummy SDL video driver against the in-memory
+(or SQLite) database, replays a scripted input loop (walking, tool swings, seeding,
+day transitions) for N frames and reports per-phase frame timings.
+
+    python benchmark.py --frames 1200 --columns 20 --rows 12
+    python benchmark.py --backend sqlite
+    python benchmark.py --trace trace.json   # Chrome trace of the run (profiler.py)
+    python benchmark.py --fps 20 --tick-rate 60   # render at 20 fps, simulate 60 ticks/s
+
+Frames are not paced to the wall clock: each one stands for 1 / fps seconds
+of game time, which the fixed-timestep clock (fixed_timestep.py) turns into
+simulation ticks, so the run covers frames / fps game seconds as fast as the
+machine allows.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from config import DEMO_PLOT_COLUMNS, DEMO_PLOT_ROWS, SCREEN_WIDTH, SCREEN_HEIGHT, SIM_TICK_RATE
+from fixed_timestep import FixedTimestep
+from memory_database import MemoryDatabase
+from profiler import get_profiler
+
+PHASES = ['update', 'map', 'plots', 'entities', 'ui', 'frame']
+
+MOVE_KEYS = {
+    'up': pygame.K_w,
+    'down': pygame.K_s,
+    'left': pygame.K_a,
+    'right': pygame.K_d,
+}
+
+# (action, argument, seconds). 'walk' holds a direction key, 'key' presses a
+# key once, 'idle' does nothing and 'sleep' starts the bed/day transition.
+DEFAULT_SCRIPT = [
+    ('walk', 'up', 0.6),
+    ('walk', 'left', 1.9),
+    ('key', pygame.K_SPACE, 0.4),      # hoe
+    ('key', pygame.K_e, 0.0),
+    ('key', pygame.K_SPACE, 0.4),      # axe
+    ('key', pygame.K_e, 0.0),
+    ('key', pygame.K_SPACE, 0.4),      # water
+    ('key', pygame.K_LCTRL, 0.4),      # seed
+    ('walk', 'left', 0.5),
+    ('key', pygame.K_x, 0.0),
+    ('key', pygame.K_LCTRL, 0.4),
+    ('key', pygame.K_SPACE, 0.4),
+    ('walk', 'up', 0.8),
+    ('key', pygame.K_i, 0.3),          # inventory open
+    ('key', pygame.K_i, 0.0),          # inventory close
+    ('walk', 'right', 2.4),
+    ('idle', None, 0.5),
+    ('sleep', None, 4.5),
+    ('walk', 'down', 1.4),
+]
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed(): only the held keys are down."""
+
+    def __init__(self):
+        self.held = set()
+
+    def __call__(self):
+        return self
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class PhaseTimer:
+    """Accumulates wall time spent in wrapped methods, per frame and phase."""
+
+    def __init__(self):
+        self.current = defaultdict(float)
+        self.samples = defaultdict(list)
+
+    def wrap(self, obj, attr, phase):
+        func = getattr(obj, attr)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.current[phase] += time.perf_counter() - start
+
+        setattr(obj, attr, timed)
+
+    def end_frame(self):
+        for phase in PHASES:
+            self.samples[phase].append(self.current.get(phase, 0.0))
+        self.current.clear()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class ScriptPlayer:
+    """Feeds the scripted actions into the scene, one frame at a time."""
+
+    def __init__(self, scene, keys, script):
+        self.scene = scene
+        self.keys = keys
+        self.script = script
+        self.index = -1
+        self.remaining = 0.0
+
+    def _start(self, step):
+        action, arg, seconds = step
+        self.keys.held.clear()
+        self.remaining = seconds
+        if action == 'walk':
+            self.keys.held.add(MOVE_KEYS[arg])
+        elif action == 'key':
+            event = pygame.event.Event(pygame.KEYDOWN, key=arg, mod=0, unicode='')
+            self.scene.handle_event(event)
+        elif action == 'sleep':
+            self.scene.player.sleep = True
+
+    def advance(self, dt):
+        self.remaining -= dt
+        while self.remaining <= 0:
+            self.index = (self.index + 1) % len(self.script)
+            self._start(self.script[self.index])
+            if self.remaining > 0:
+                break
+
+
+def build_scene(columns, rows, seed, backend='memory'):
+    """Create a FarmScene backed by a seeded in-memory or SQLite database."""
+    from farm_scene import FarmScene
+
+    if backend == 'sqlite':
+        from sqlite_database import SQLiteDatabase
+        db = SQLiteDatabase(':memory:')
+        db.connect()
+        db.seed_demo_data(columns, rows, seed)
+    else:
+        db = MemoryDatabase().seed_demo_data(columns, rows, seed)
+    player = db.get_player_by_id(1)
+    farm = db.get_farm_by_id(1)
+    screen = pygame.display.get_surface()
+    return FarmScene(screen, db, player, farm), db
+
+
+def instrument(scene, timer):
+    """Wrap the scene's draw phases with timers."""
+    if scene.tilemap:
+        timer.wrap(scene.tilemap, 'draw', 'map')
+    timer.wrap(scene, 'draw_plots', 'plots')
+    timer.wrap(scene, 'draw_dynamic_entities', 'entities')
+    timer.wrap(scene, 'draw_ui', 'ui')
+    timer.wrap(scene, 'draw_help', 'ui')
+    timer.wrap(scene.inventory_ui, 'draw', 'ui')
+    timer.wrap(scene.overlay_ui, 'draw', 'ui')
+    timer.wrap(scene.transition, 'play', 'ui')
+
+
+def run(frames=600, columns=DEMO_PLOT_COLUMNS, rows=DEMO_PLOT_ROWS, seed=1, fps=60, script=None, backend='memory',
+        trace=None, tick_rate=SIM_TICK_RATE):
+    """Run the benchmark and return {phase: {p50, p95, p99, mean}} in milliseconds.
+
+    With ``trace`` (a path) the built-in profiler records the run and writes
+    it there as Chrome trace JSON.
+    """
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    load_start = time.perf_counter()
+    scene, db = build_scene(columns, rows, seed, backend)
+    load_time = time.perf_counter() - load_start
+
+    keys = ScriptedKeys()
+    scene.key_source = keys
+    driver = ScriptPlayer(scene, keys, script or DEFAULT_SCRIPT)
+    timer = PhaseTimer()
+    instrument(scene, timer)
+    profiler = get_profiler()
+    if trace:
+        profiler.set_enabled(True)
+
+    timestep = FixedTimestep(tick_rate)
+    frame_time = 1.0 / fps
+    run_start = time.perf_counter()
+    for _ in range(frames):
+        frame_start = time.perf_counter()
+        profiler.begin_frame()
+
+        start = time.perf_counter()
+        for _ in range(timestep.advance(frame_time)):
+            driver.advance(timestep.dt)
+            with profiler.section('update'):
+                scene.update(timestep.dt)
+        timer.current['update'] += time.perf_counter() - start
+
+        with profiler.section('draw'):
+            scene.draw(timestep.alpha)
+        timer.current['frame'] += time.perf_counter() - frame_start
+        timer.end_frame()
+        profiler.end_frame()
+    run_time = time.perf_counter() - run_start
+    if trace:
+        trace = profiler.export_trace(trace)
+        profiler.set_enabled(False)
+
+    report = {
+        'frames': frames,
+        'plots': len(scene.plots),
+        'scene_load_ms': load_time * 1000.0,
+        'load_stages_ms': {name: seconds * 1000.0 for name, seconds in scene.progress.timings.items()},
+        'run_seconds': run_time,
+        'ticks': timestep.ticks,
+        'sim_seconds': timestep.sim_time,
+        'realtime_factor': timestep.sim_time / run_time if run_time else 0.0,
+        'backend': backend,
+        'db_queries': getattr(db, 'query_count', None),
+        'db_updates': getattr(db, 'update_count', None),
+        'trace': trace,
+        'phases': {},
+    }
+    for phase in PHASES:
+        samples = [value * 1000.0 for value in timer.samples[phase]]
+        report['phases'][phase] = {
+            'p50': percentile(samples, 50),
+            'p95': percentile(samples, 95),
+            'p99': percentile(samples, 99),
+            'mean': sum(samples) / len(samples) if samples else 0.0,
+        }
+    db.disconnect()
+    pygame.quit()
+    return report
+
+
+def print_report(report):
+    counters = ''
+    if report['db_queries'] is not None:
+        # Only the in-memory backend counts its queries
+        counters = f"  DB queries/updates: {report['db_queries']}/{report['db_updates']}"
+    print(f"Frames: {report['frames']}  Plots: {report['plots']}  "
+          f"Scene load: {report['scene_load_ms']:.1f} ms  "
+          f"Backend: {report['backend']}{counters}")
+    print(f"Simulated {report['sim_seconds']:.1f} s ({report['ticks']} ticks) "
+          f"in {report['run_seconds']:.2f} s: {report['realtime_factor']:.1f}x real time")
+    stages = sorted(report['load_stages_ms'].items(), key=lambda item: -item[1])
+    print("Load stages: " + "  ".join(f"{name} {ms:.1f} ms" for name, ms in stages))
+    print(f"{'phase':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for phase in PHASES:
+        stats = report['phases'][phase]
+        print(f"{phase:<10}{stats['p50']:>10.3f}{stats['p95']:>10.3f}"
+              f"{stats['p99']:>10.3f}{stats['mean']:>10.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless FarmScene frame-time benchmark")
+    parser.add_argument('--frames', type=int, default=600, help="frames to simulate")
+    parser.add_argument('--columns', type=int, default=DEMO_PLOT_COLUMNS, help="plot grid columns")
+    parser.add_argument('--rows', type=int, default=DEMO_PLOT_ROWS, help="plot grid rows")
+    parser.add_argument('--fps', type=int, default=60, help="rendered frames per game second")
+    parser.add_argument('--tick-rate', type=int, default=SIM_TICK_RATE,
+                        help="fixed simulation ticks per game second")
+    parser.add_argument('--seed', type=int, default=1, help="seed for the demo farm")
+    parser.add_argument('--backend', choices=['memory', 'sqlite'], default='memory',
+                        help="database backend for the demo farm")
+    parser.add_argument('--json', metavar='PATH', help="also write the report as JSON")
+    parser.add_argument('--trace', metavar='PATH', help="also write a Chrome trace of the run")
+    args = parser.parse_args(argv)
+
+    report = run(args.frames, args.columns, args.rows, args.seed, fps=args.fps,
+                 backend=args.backend, trace=args.trace, tick_rate=args.tick_rate)
+    print_report(report)
+    if report['trace']:
+        print(f"Trace written to {report['trace']}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
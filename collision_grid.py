@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Tile-grid collision built from the TMX "Collision" tile layer.
+
+Blocked tiles live in a NumPy boolean array, so a tile lookup is one index
+and a movement sweep only reads the tile columns/rows the hitbox passes
+through. ``rects`` merges blocked tiles greedily into a small set of
+pygame.Rects for code that still wants rectangles.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pygame
+
+
+class CollisionGrid:
+    """Blocked/free flag per map tile with swept-axis movement queries."""
+
+    def __init__(self, blocked: np.ndarray, tile_width: int, tile_height: int):
+        self.blocked = np.asarray(blocked, dtype=bool)
+        self.rows, self.cols = self.blocked.shape
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self._rects: Optional[List[pygame.Rect]] = None
+
+    @classmethod
+    def from_gids(cls, gids: Sequence[int], cols: int, rows: int,
+                  tile_width: int, tile_height: int) -> "CollisionGrid":
+        """Every non-empty cell of a row-major tile layer blocks movement."""
+        gids = np.asarray(gids, dtype=np.uint32)
+        return cls(gids.reshape(rows, cols) != 0, tile_width, tile_height)
+
+    def __len__(self) -> int:
+        """Number of blocked tiles."""
+        return int(self.blocked.sum())
+
+    # ==================== Lookups ====================
+
+    def is_blocked(self, tile_x: int, tile_y: int) -> bool:
+        """Tiles outside the grid are free (world bounds are clamped elsewhere)."""
+        if 0 <= tile_x < self.cols and 0 <= tile_y < self.rows:
+            return bool(self.blocked[tile_y, tile_x])
+        return False
+
+    def is_blocked_at(self, x: float, y: float) -> bool:
+        return self.is_blocked(int(x // self.tile_width), int(y // self.tile_height))
+
+    def _span(self, start: int, end: int, size: int, count: int):
+        """Tile indices covering pixels [start, end), clipped to the grid."""
+        first = max(0, start // size)
+        last = min(count - 1, (end - 1) // size)
+        return first, last
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        """True if ``rect`` overlaps any blocked tile."""
+        if rect.width <= 0 or rect.height <= 0:
+            return False
+        x0, x1 = self._span(rect.left, rect.right, self.tile_width, self.cols)
+        y0, y1 = self._span(rect.top, rect.bottom, self.tile_height, self.rows)
+        if x0 > x1 or y0 > y1:
+            return False
+        return bool(self.blocked[y0:y1 + 1, x0:x1 + 1].any())
+
+    # ==================== Swept Movement ====================
+
+    def sweep_x(self, rect: pygame.Rect, dx: int) -> int:
+        """How far ``rect`` may move by ``dx`` pixels horizontally before touching a blocked tile."""
+        if not dx:
+            return 0
+        y0, y1 = self._span(rect.top, rect.bottom, self.tile_height, self.rows)
+        if y0 > y1:
+            return dx
+        size = self.tile_width
+        if dx > 0:
+            first, last = rect.right // size, (rect.right + dx - 1) // size
+        else:
+            first, last = (rect.left + dx) // size, (rect.left - 1) // size
+        lo, hi = max(0, first), min(self.cols - 1, last)
+        if lo > hi:
+            return dx
+        hit = np.flatnonzero(self.blocked[y0:y1 + 1, lo:hi + 1].any(axis=0))
+        if not hit.size:
+            return dx
+        if dx > 0:
+            return (lo + int(hit[0])) * size - rect.right
+        return (lo + int(hit[-1]) + 1) * size - rect.left
+
+    def sweep_y(self, rect: pygame.Rect, dy: int) -> int:
+        """How far ``rect`` may move by ``dy`` pixels vertically before touching a blocked tile."""
+        if not dy:
+            return 0
+        x0, x1 = self._span(rect.left, rect.right, self.tile_width, self.cols)
+        if x0 > x1:
+            return dy
+        size = self.tile_height
+        if dy > 0:
+            first, last = rect.bottom // size, (rect.bottom + dy - 1) // size
+        else:
+            first, last = (rect.top + dy) // size, (rect.top - 1) // size
+        lo, hi = max(0, first), min(self.rows - 1, last)
+        if lo > hi:
+            return dy
+        hit = np.flatnonzero(self.blocked[lo:hi + 1, x0:x1 + 1].any(axis=1))
+        if not hit.size:
+            return dy
+        if dy > 0:
+            return (lo + int(hit[0])) * size - rect.bottom
+        return (lo + int(hit[-1]) + 1) * size - rect.top
+
+    # ==================== Rect View ====================
+
+    @property
+    def rects(self) -> List[pygame.Rect]:
+        """Blocked tiles merged greedily (widest run, then grow down) into world rects."""
+        if self._rects is None:
+            self._rects = self._merge_rects()
+        return self._rects
+
+    def _merge_rects(self) -> List[pygame.Rect]:
+        remaining = self.blocked.copy()
+        rects = []
+        for ty in range(self.rows):
+            tx = 0
+            while tx < self.cols:
+                if not remaining[ty, tx]:
+                    tx += 1
+                    continue
+                end_x = tx
+                while end_x + 1 < self.cols and remaining[ty, end_x + 1]:
+                    end_x += 1
+                end_y = ty
+                while end_y + 1 < self.rows and remaining[end_y + 1, tx:end_x + 1].all():
+                    end_y += 1
+                remaining[ty:end_y + 1, tx:end_x + 1] = False
+                rects.append(pygame.Rect(tx * self.tile_width, ty * self.tile_height,
+                                         (end_x - tx + 1) * self.tile_width,
+                                         (end_y - ty + 1) * self.tile_height))
+                tx = end_x + 1
+        return rects
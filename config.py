@@ -32,6 +32,9 @@ FARM_BG_SCALE_TO_SCREEN = False  # Keep original resolution so the world map can
 # TMX map / layered world configuration
 USE_TMX_MAP = True  # Toggle to False to fall back to static background rendering
 TMX_MAP_PATH = 'map.tmx'
+MAP_CHUNK_SIZE = 512  # Static TMX layers are pre-rendered into chunks of this size (pixels)
+MAP_CACHE_DIR = '.cache/map'  # Compiled TMX cache (skips XML parsing on later loads); None to disable
+SPATIAL_CELL_SIZE = 256  # Cell size (pixels) of the spatial grid used for plots, trees and obstacles
 LAYERS = {
     'water': 0,
     'ground': 1,
@@ -55,7 +58,9 @@ APPLE_POS = {
 # obstacle rects: 
 # Player/world alignment on the custom background
 FARM_PLAYER_SPAWN = (1600, 1800)  # Starting position once the farm scene loads
-FARM_PLOT_OFFSET = (800, 1500)   # Top-left corner where database plots should be drawn
+FARM_PLOT_OFFSET = (800, 1500)   # Top-left corner where database plots should be drawn (snapped to the tile grid with a TMX map)
+DEMO_PLOT_COLUMNS = 4  # Plot grid of seeded demo farms (benchmark, replays, farm_server)
+DEMO_PLOT_ROWS = 10    # 4 x 10 fits the Farmable tiles at FARM_PLOT_OFFSET
 FARM_OBSTACLE_RECTS = [
     # (x, y, width, height) rectangles that block player movement
     (1350, 260, 420, 260),   # top housing/platform
@@ -93,6 +98,8 @@ LOGIN_CARD_Y = 200           # Card vertical position
 LOGIN_CARD_WIDTH = 400       # Card width
 LOGIN_CARD_HEIGHT = 280      # Card height
 LOGIN_CARD_ALPHA = 220       # Card transparency (0-255, lower = more transparent)
+LOGIN_PAGE_SIZE = 50         # Players (with their farms) fetched per directory page
+LOGIN_DIRECTORY_PAGES = 3    # Pages kept in memory around the selected player
 
 # Common presets examples:
 # 'left' layout: Person on right, UI on left
@@ -105,6 +112,10 @@ LOGIN_CARD_ALPHA = 220       # Card transparency (0-255, lower = more transparen
 # LOGIN_CARD_Y = 100
 
 # Database Configuration
+# Backend: 'mssql' (SQL Server via pymssql), 'sqlite' (local file) or 'memory' (demo data, nothing saved)
+DB_BACKEND = 'mssql'
+SQLITE_DB_PATH = 'farm_game.db'  # Relative paths are resolved against the game directory
+SQLITE_SEED_DEMO = True  # Fill an empty SQLite database with a demo player and farm
 DB_CONFIG = {
     'server': '.',
     'user': 'ADMINISTART\谈烨',
@@ -112,13 +123,32 @@ DB_CONFIG = {
     'database': 'FarmGameDB',
     'charset': 'utf8'
 }
+DB_WRITE_FLUSH_INTERVAL = 0.25  # Seconds the write-behind queue waits to coalesce routine writes
+DB_WRITE_MAX_RETRIES = 3        # Failed write-behind batches are retried this many times
+DB_POOL_SIZE = 4                # Pooled connections (and db.submit worker threads) per database
+DB_POOL_TIMEOUT = 10.0          # Seconds a caller waits for a free pooled connection
+# Read-through cache of query results: seconds a table's rows are served from memory
+# (0 / missing = always query). Inventory is also kept in sync by this client's writes.
+DB_CACHE_TTL = {
+    'ItemCatalog': 600,
+    'CropVariety': 600,
+    'Player': 30,
+    'Farm': 30,
+    'Inventory': 120,
+}
 
 # Window Configuration
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 # SCREEN_WIDTH = 3200
 # SCREEN_HEIGHT = 2560
-FPS = 60
+FPS = 60  # Render frame cap (simulation speed does not depend on it)
+SIM_TICK_RATE = 60         # Fixed simulation updates per second
+SIM_MAX_FRAME_TIME = 0.25  # Longer frames are clamped so the simulation never spirals catching up
+TRANSITION_FADE_TIME = 2.1  # Seconds the day transition takes to fade out (and again to fade in)
+# Opt-in: repaint only changed regions of the farm scene and call
+# pygame.display.update(rects); falls back to a full redraw when the camera scrolls
+DIRTY_RECT_RENDERING = False
 GAME_TITLE = "Farm Game" # 鏍囬 
 #GAME_TITLE = "閫夋嫨浣犵殑鍐滃満鍜岀帺瀹? # 鏍囬 
 
@@ -141,6 +171,10 @@ GRAPHICS_PATH = 'graphics'  # Path to graphics folder
 
 # Plot Configuration
 TILE_SIZE = 64
+GROWTH_TICK_INTERVAL = 1.0  # Seconds between growth engine steps
+CROP_WITHER_FACTOR = 2.0  # Crops wither once GrowthHours * factor have passed (daily tick)
+RAIN_CHANCE = 0.35       # Chance that it rains overnight
+RAIN_WATER_DELTA = 25    # Water added to every plot when it rains
 PLOT_COLORS = {
     'Empty': COLOR_BROWN,
     'Growing': COLOR_LIGHT_GREEN,
@@ -163,6 +197,40 @@ PLAYER_TOOL_OFFSET = {
     for direction, offsets in _PLAYER_TOOL_OFFSET_RATIO.items()
 }
 
+# Maximum number of pre-scaled surfaces kept by ResourceManager.get_scaled (LRU)
+SCALED_CACHE_SIZE = 256
+
+# Maximum number of rendered text / panel surfaces kept by the HUD text cache (LRU)
+TEXT_CACHE_SIZE = 512
+
+# Frame profiler: F3 in the farm scene shows the overlay and starts recording,
+# F4 writes the recorded frames as Chrome trace JSON to PROFILER_TRACE_DIR
+PROFILER_ENABLED = False      # record from startup (e.g. to profile loading)
+PROFILER_HISTORY = 120        # frames shown in the frame-time graph
+PROFILER_TRACE_FRAMES = 600   # frames kept for trace export
+PROFILER_TRACE_DIR = '.cache/traces'  # Relative to the game directory
+
+# Session recording (replay.py): each farm visit is saved to REPLAY_DIR when
+# leaving the farm and can be replayed headless with `python replay.py <file>`
+REPLAY_RECORDING = False
+REPLAY_DIR = '.cache/replays'  # Relative to the game directory
+
+# Size (pixels) of the tool / seed icons in the overlay slots
+OVERLAY_ICON_SIZE = 64
+
+# Startup asset pipeline: PNGs are decoded on this many worker threads
+ASSET_LOADER_WORKERS = min(8, os.cpu_count() or 1)
+# Optional on-disk cache of decoded pixels (skips PNG decoding on later starts); None disables it
+ASSET_DISK_CACHE = None  # e.g. '.cache/assets.bin'
+# Character, soil, crop and overlay frames are packed into one texture atlas per family;
+# packed atlases are cached here as <family>.atlas + <family>.json, relative to the game
+# directory (None keeps them in memory only)
+ATLAS_CACHE_DIR = '.cache/atlas'
+
+# Headless multi-farm simulation (farm_server.py): worker processes and farms per job
+SERVER_WORKERS = os.cpu_count() or 1
+SERVER_SHARD_SIZE = 256
+
 # Animation Configuration
 ANIMATION_SPEED = 0.15  # Seconds per frame
 WATER_ANIMATION_SPEED = 0.2  # For water tiles
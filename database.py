@@ -2,28 +2,424 @@
 # """
 # Database Connection and Operations Module
 # """
-import pymssql
-from config import DB_CONFIG
+import functools
+import queue
+import threading
+import time
+from config import (DB_BACKEND, DB_CACHE_TTL, DB_CONFIG, DB_WRITE_FLUSH_INTERVAL,
+                    DB_WRITE_MAX_RETRIES, CROP_WITHER_FACTOR, LOGIN_PAGE_SIZE, SQLITE_DB_PATH,
+                    SQLITE_SEED_DEMO)
+from db_pool import ConnectionPool, AsyncQueries
+from profiler import profiled
 
+try:
+    import pymssql
+except ImportError:  # Only the SQL Server backend needs it
+    pymssql = None
 
-class Database:
-    """Database Connection Class"""
+
+def create_connection():
+    """Open a new pymssql connection using DB_CONFIG"""
+    if pymssql is None:
+        raise ImportError(
+            "pymssql is required for the SQL Server backend. Install it with "
+            "'pip install pymssql' or set DB_BACKEND = 'sqlite' in config.py."
+        )
+    return pymssql.connect(
+        server=DB_CONFIG['server'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        database=DB_CONFIG['database'],
+        charset=DB_CONFIG['charset']
+    )
+
+
+def _copy_rows(value):
+    """Copy of cached rows (lists / dicts are copied, column values are shared)"""
+    if isinstance(value, list):
+        return [_copy_rows(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_rows(item) for key, item in value.items()}
+    return value
+
+
+class ReadCache:
+    """
+    Read-through cache of query results, keyed by (table, key).
     
-    def __init__(self):
+    Each table has its own TTL (DB_CACHE_TTL); tables without one are never
+    cached. Writes invalidate a table (or one key), and bump the table's
+    generation so a load that raced with the write is not stored. Callers
+    get copies, so they may modify the rows they receive.
+    """
+    
+    def __init__(self, ttls=None):
+        self.ttls = dict(DB_CACHE_TTL if ttls is None else ttls)
+        self.lock = threading.Lock()
+        self.entries = {}         # (table, key) -> [expires_at, value]
+        self.generations = {}     # table -> write counter
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, table, key, load):
+        """Cached value of (table, key), calling load() on a miss or after the TTL"""
+        ttl = self.ttls.get(table)
+        if not ttl:
+            return load()
+        with self.lock:
+            entry = self.entries.get((table, key))
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return _copy_rows(entry[1])
+            self.misses += 1
+            generation = self.generations.get(table, 0)
+        value = load()
+        with self.lock:
+            if self.generations.get(table, 0) == generation:
+                self.entries[(table, key)] = [time.monotonic() + ttl, _copy_rows(value)]
+        return value
+    
+    def modify(self, table, key, update):
+        """Apply update(value) to a cached entry in place (no-op if not cached)"""
+        with self.lock:
+            self.generations[table] = self.generations.get(table, 0) + 1
+            entry = self.entries.get((table, key))
+            if entry and entry[0] > time.monotonic():
+                update(entry[1])
+                return True
+            return False
+    
+    def invalidate(self, table=None, key=None):
+        """Drop one key of a table, a whole table, or (no arguments) everything"""
+        with self.lock:
+            if table is None:
+                for name in set(self.generations) | {name for name, _ in self.entries}:
+                    self.generations[name] = self.generations.get(name, 0) + 1
+                self.entries.clear()
+                return
+            self.generations[table] = self.generations.get(table, 0) + 1
+            if key is not None:
+                self.entries.pop((table, key), None)
+            else:
+                for entry_key in [k for k in self.entries if k[0] == table]:
+                    del self.entries[entry_key]
+
+
+PLAYER_COLUMNS = ('PlayerId', 'Name', 'Level', 'Exp', 'CurrencyGold', 'CurrencyGem', 'Status')
+
+
+def _group_player_farms(rows):
+    """Player rows LEFT JOINed with their farms -> one player dict per player with a 'Farms' list"""
+    players = []
+    for row in rows:
+        if not players or players[-1]['PlayerId'] != row['PlayerId']:
+            player = {column: row[column] for column in PLAYER_COLUMNS}
+            player['Farms'] = []
+            players.append(player)
+        if row['FarmId'] is not None:
+            players[-1]['Farms'].append({'FarmId': row['FarmId'], 'PlayerId': row['PlayerId'],
+                                         'Name': row['FarmName'], 'SoilQuality': row['SoilQuality']})
+    return players
+
+
+def _like_prefix(text):
+    """LIKE pattern matching names that start with ``text`` (wildcards escaped with \\)"""
+    for char in ('\\', '%', '_', '['):
+        text = text.replace(char, '\\' + char)
+    return text + '%'
+
+
+def cached_read(table):
+    """Serve a Database getter from self.cache (keyed by its arguments) for the table's TTL"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            return self.cache.get(table, (func.__name__,) + args, lambda: func(self, *args))
+        return wrapper
+    return decorate
+
+
+class WriteBehindQueue:
+    """
+    Background writer for routine gameplay writes.
+
+    Plot level updates are coalesced per PlotId (last value wins), inventory
+    changes per (FarmId, ItemId) (deltas are summed) and action logs are
+    appended. A worker thread flushes everything pending in one transaction
+    on its own connection, so the game loop never waits on SQL Server for
+    these calls. Failed batches are retried and reported via poll_failures();
+    plots whose levels were given up on are reported via poll_dropped_plots().
+    """
+    
+    def __init__(self, connection_factory, flush_interval=DB_WRITE_FLUSH_INTERVAL,
+                 max_retries=DB_WRITE_MAX_RETRIES):
+        self.connection_factory = connection_factory
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        
+        self.plot_levels = {}     # PlotId -> {'WaterLevel': x, 'FertilizerLevel': y}
+        self.inventory = {}       # (FarmId, ItemId) -> quantity delta
+        self.actions = []         # [(PlayerId, FarmId, Action, MetaJson), ...]
+        self.in_flight = None     # Batch currently being written
+        self.flush_requested = False  # flush() is waiting: write without the coalescing delay
+        self.retries = 0
+        self.failures = queue.Queue()
+        # PlotIds of the in-flight batch whose levels must no longer be written
+        self.cancelled = set()
+        self.writing_plot = None  # PlotId whose level UPDATE the worker is executing
+        # PlotIds whose queued levels were discarded after max_retries failures
+        self.dropped_plots = set()
+        
         self.conn = None
-        self.cursor = None
+        self.cond = threading.Condition()
+        # Held while a batch is written; readers that overlay pending writes
+        # take it too so they never see a batch both in the DB and in memory.
+        self.io_lock = threading.Lock()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self.thread.start()
+    
+    # ---------- producer side (game thread) ----------
+    
+    def set_plot_levels(self, plot_id, water_level=None, fertilizer_level=None):
+        """Queue a soil moisture / fertilizer update"""
+        if water_level is None and fertilizer_level is None:
+            return False
+        with self.cond:
+            levels = self.plot_levels.setdefault(plot_id, {})
+            if water_level is not None:
+                levels['WaterLevel'] = water_level
+            if fertilizer_level is not None:
+                levels['FertilizerLevel'] = fertilizer_level
+            self.cond.notify()
+        return True
+    
+    def discard_plot_levels(self, plot_id):
+        """Drop queued levels for a plot that is about to be reset synchronously.
+
+        Levels already in the batch being written are cancelled and the worker
+        skips them, so the caller does not wait for the batch; at most for the
+        single-row UPDATE of this plot if it is running right now.
+        """
+        with self.cond:
+            self.plot_levels.pop(plot_id, None)
+            if self.in_flight and plot_id in self.in_flight['plot_levels']:
+                self.cancelled.add(plot_id)
+                self.cond.wait_for(lambda: self.writing_plot != plot_id)
+    
+    def update_inventory(self, farm_id, item_id, quantity_change):
+        """Queue an inventory quantity change"""
+        with self.cond:
+            key = (farm_id, item_id)
+            self.inventory[key] = self.inventory.get(key, 0) + quantity_change
+            self.cond.notify()
+        return True
+    
+    def log_action(self, player_id, farm_id, action, meta_json):
+        """Queue an action log row"""
+        with self.cond:
+            self.actions.append((player_id, farm_id, action, meta_json))
+            self.cond.notify()
+        return True
+    
+    def pending_plot_levels(self):
+        """Snapshot of queued + in-flight plot levels (call while holding io_lock)"""
+        with self.cond:
+            merged = {}
+            for batch in (self.in_flight, {'plot_levels': self.plot_levels}):
+                if not batch:
+                    continue
+                for plot_id, levels in batch['plot_levels'].items():
+                    if batch is self.in_flight and plot_id in self.cancelled:
+                        continue
+                    merged.setdefault(plot_id, {}).update(levels)
+            return merged
+    
+    def pending_inventory(self, farm_id):
+        """Snapshot of queued + in-flight inventory deltas for a farm (call while holding io_lock)"""
+        with self.cond:
+            merged = {}
+            for batch in (self.in_flight, {'inventory': self.inventory}):
+                if not batch:
+                    continue
+                for (fid, item_id), delta in batch['inventory'].items():
+                    if fid == farm_id and delta:
+                        merged[item_id] = merged.get(item_id, 0) + delta
+            return merged
+    
+    def poll_failures(self):
+        """Return (and clear) failure messages reported by the worker"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.failures.get_nowait())
+            except queue.Empty:
+                return messages
+    
+    def poll_dropped_plots(self):
+        """Return (and clear) PlotIds whose queued levels were discarded"""
+        with self.cond:
+            dropped, self.dropped_plots = self.dropped_plots, set()
+        return sorted(dropped)
+    
+    def has_pending(self):
+        return bool(self.plot_levels or self.inventory or self.actions)
+    
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far has been written (or timeout)"""
+        with self.cond:
+            if self.has_pending() or self.in_flight is not None:
+                self.flush_requested = True
+                self.cond.notify_all()
+            return self.cond.wait_for(
+                lambda: not self.has_pending() and self.in_flight is None,
+                timeout
+            )
+    
+    def stop(self, timeout=5.0):
+        """Flush remaining writes and stop the worker"""
+        self.flush(timeout)
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        self.thread.join(timeout)
+        if self.conn:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+    
+    # ---------- worker side ----------
+    
+    def _run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.has_pending() or not self.running)
+                if not self.running and not self.has_pending():
+                    return
+                # Give the game a moment to pile up more writes for the same keys,
+                # unless someone is blocked in flush()
+                self.cond.wait_for(lambda: self.flush_requested or not self.running,
+                                   self.flush_interval)
+                self.flush_requested = False
+            self._flush_batch()
+    
+    def _flush_batch(self):
+        with self.io_lock:
+            with self.cond:
+                batch = {
+                    'plot_levels': self.plot_levels,
+                    'inventory': self.inventory,
+                    'actions': self.actions,
+                }
+                self.plot_levels, self.inventory, self.actions = {}, {}, []
+                self.in_flight = batch
+            ok, error = self._write(batch)
+            with self.cond:
+                self.in_flight = None
+                if ok:
+                    self.retries = 0
+                else:
+                    self._requeue(batch, error)
+                self.cancelled.clear()
+                if not self.has_pending():
+                    self.flush_requested = False
+                self.cond.notify_all()
+    
+    def _write(self, batch):
+        try:
+            if self.conn is None:
+                self.conn = self.connection_factory()
+            cursor = self.conn.cursor()
+            for plot_id, levels in batch['plot_levels'].items():
+                fields = [f"{name} = %s" for name in levels]
+                params = list(levels.values()) + [plot_id]
+                with self.cond:
+                    # Reset by harvest / clear since the batch was taken
+                    if plot_id in self.cancelled:
+                        continue
+                    self.writing_plot = plot_id
+                try:
+                    cursor.execute(
+                        f"UPDATE game.Plot SET {', '.join(fields)} WHERE PlotId = %s",
+                        tuple(params)
+                    )
+                finally:
+                    with self.cond:
+                        self.writing_plot = None
+                        self.cond.notify_all()
+            for (farm_id, item_id), delta in batch['inventory'].items():
+                if delta:
+                    cursor.execute(Database.INVENTORY_MERGE_SQL,
+                                   (farm_id, item_id, delta, delta))
+            for row in batch['actions']:
+                cursor.execute(Database.ACTION_LOG_SQL, row)
+            self.conn.commit()
+            cursor.close()
+            return True, None
+        except Exception as e:
+            print(f"Write-behind flush error: {e}")
+            try:
+                if self.conn:
+                    self.conn.rollback()
+            except Exception:
+                # Connection is broken; reconnect on the next batch
+                self.conn = None
+            return False, e
+    
+    def _requeue(self, batch, error):
+        """Put a failed batch back in front of newer writes (caller holds cond)"""
+        self.retries += 1
+        if self.retries > self.max_retries:
+            self.retries = 0
+            self.failures.put(f"Save failed, changes discarded: {error}")
+            self.dropped_plots.update(plot_id for plot_id in batch['plot_levels']
+                                      if plot_id not in self.cancelled)
+            return
+        self.failures.put(f"Save failed, retrying: {error}")
+        for plot_id, levels in batch['plot_levels'].items():
+            if plot_id in self.cancelled:
+                continue
+            newer = self.plot_levels.get(plot_id, {})
+            self.plot_levels[plot_id] = {**levels, **newer}
+        for key, delta in batch['inventory'].items():
+            self.inventory[key] = self.inventory.get(key, 0) + delta
+        self.actions = batch['actions'] + self.actions
+
+
+class Database(AsyncQueries):
+    """Database Connection Class (pooled connections, safe to call from any thread)"""
+    
+    INVENTORY_MERGE_SQL = """
+        MERGE game.Inventory AS t
+        USING (SELECT %s AS FarmId, %s AS ItemId) AS s
+        ON (t.FarmId = s.FarmId AND t.ItemId = s.ItemId)
+        WHEN MATCHED THEN 
+            UPDATE SET Quantity = t.Quantity + %s
+        WHEN NOT MATCHED THEN 
+            INSERT (FarmId, ItemId, Quantity) 
+            VALUES (s.FarmId, s.ItemId, %s);
+        """
+    
+    ACTION_LOG_SQL = """
+        INSERT INTO game.ActionLog(PlayerId, FarmId, Action, MetaJson)
+        VALUES (%s, %s, %s, %s)
+        """
+    
+    def __init__(self):
+        self.pool = None
+        self.write_queue = None
+        self.cache = ReadCache()
         
     def connect(self):
         """Connect to database"""
         try:
-            self.conn = pymssql.connect(
-                server=DB_CONFIG['server'],
-                user=DB_CONFIG['user'],
-                password=DB_CONFIG['password'],
-                database=DB_CONFIG['database'],
-                charset=DB_CONFIG['charset']
-            )
-            self.cursor = self.conn.cursor(as_dict=True)
+            self.pool = ConnectionPool(create_connection)
+            # Open the first connection now so a bad config fails here
+            with self.pool.connection():
+                pass
+            self.write_queue = WriteBehindQueue(create_connection)
             print("Database connected successfully!")
             return True
         except Exception as e:
@@ -32,40 +428,67 @@ class Database:
     
     def disconnect(self):
         """Disconnect from database"""
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
+        self.shutdown_queries()
+        if self.write_queue:
+            self.write_queue.stop()
+            self.write_queue = None
+        if self.pool:
+            self.pool.close()
+            self.pool = None
         print("Database disconnected")
     
-    def execute_query(self, query, params=None):
-        """Execute query statement"""
+    @staticmethod
+    def _run(conn, query, params, fetch=True, commit=False):
+        """
+        Run one statement on a pooled connection with its own cursor; returns
+        its rows, or the number of rows it changed when ``fetch`` is False
+        """
+        cursor = conn.cursor(as_dict=True)
         try:
             if params:
-                self.cursor.execute(query, params)
+                cursor.execute(query, params)
             else:
-                self.cursor.execute(query)
-            return self.cursor.fetchall()
+                cursor.execute(query)
+            result = cursor.fetchall() if fetch else cursor.rowcount
+            if commit:
+                conn.commit()
+            return result
+        finally:
+            cursor.close()
+    
+    @profiled('db.query', 'db')
+    def execute_query(self, query, params=None):
+        """Execute query statement"""
+        try:
+            with self.pool.connection() as conn:
+                return self._run(conn, query, params)
         except Exception as e:
             print(f"Query error: {e}")
             return []
     
+    @profiled('db.update', 'db')
     def execute_update(self, query, params=None):
-        """Execute update statement"""
+        """Execute update statement; returns the number of rows changed (False on error)"""
         try:
-            if params:
-                self.cursor.execute(query, params)
-            else:
-                self.cursor.execute(query)
-            self.conn.commit()
-            return True
+            with self.pool.connection() as conn:
+                return self._run(conn, query, params, fetch=False, commit=True)
         except Exception as e:
             print(f"Update error: {e}")
-            self.conn.rollback()
             return False
     
+    @profiled('db.batch', 'db')
+    def execute_batch(self, query, params=None):
+        """Execute a write batch that ends in a SELECT, commit, and return its rows (None on error)"""
+        try:
+            with self.pool.connection() as conn:
+                return self._run(conn, query, params, commit=True)
+        except Exception as e:
+            print(f"Batch error: {e}")
+            return None
+    
     # ==================== Player Related ====================
     
+    @cached_read('Player')
     def get_all_players(self):
         """Get all players"""
         query = """
@@ -76,6 +499,7 @@ class Database:
         """
         return self.execute_query(query)
     
+    @cached_read('Player')
     def get_player_by_id(self, player_id):
         """Get player info by ID"""
         query = """
@@ -86,8 +510,56 @@ class Database:
         result = self.execute_query(query, (player_id,))
         return result[0] if result else None
     
+    def get_player_page(self, key=None, limit=LOGIN_PAGE_SIZE, backward=False):
+        """
+        Keyset page of active players in PlayerId order, each with its farms
+        in a 'Farms' list (one joined query). Forward: the first ``limit``
+        players after PlayerId ``key``; backward: the last ``limit`` players
+        before it. ``key=None`` gives the first / last page.
+        """
+        where = "Status = 'Active'"
+        params = [limit]
+        if key is not None:
+            where += " AND PlayerId < %s" if backward else " AND PlayerId > %s"
+            params.append(key)
+        query = f"""
+        SELECT p.PlayerId, p.Name, p.Level, p.Exp, p.CurrencyGold, p.CurrencyGem, p.Status,
+               f.FarmId, f.Name AS FarmName, f.SoilQuality
+        FROM (
+            SELECT TOP (%s) PlayerId, Name, Level, Exp, CurrencyGold, CurrencyGem, Status
+            FROM game.Player
+            WHERE {where}
+            ORDER BY PlayerId {'DESC' if backward else 'ASC'}
+        ) AS p
+        LEFT JOIN game.Farm AS f ON f.PlayerId = p.PlayerId
+        ORDER BY p.PlayerId, f.FarmId
+        """
+        return _group_player_farms(self.execute_query(query, tuple(params)))
+    
+    def count_active_players(self, before_id=None):
+        """Number of active players (with a PlayerId below ``before_id`` if given)"""
+        query = "SELECT COUNT(*) AS Total FROM game.Player WHERE Status = 'Active'"
+        params = None
+        if before_id is not None:
+            query += " AND PlayerId < %s"
+            params = (before_id,)
+        result = self.execute_query(query, params)
+        return result[0]['Total'] if result else 0
+    
+    def find_player_by_name(self, prefix):
+        """First active player (by name, then PlayerId) whose name starts with ``prefix``"""
+        query = """
+        SELECT TOP 1 PlayerId, Name, Level, Exp, CurrencyGold, CurrencyGem, Status
+        FROM game.Player
+        WHERE Status = 'Active' AND Name LIKE %s ESCAPE '\\'
+        ORDER BY Name, PlayerId
+        """
+        result = self.execute_query(query, (_like_prefix(prefix),))
+        return result[0] if result else None
+    
     # ==================== Farm Related ====================
     
+    @cached_read('Farm')
     def get_player_farms(self, player_id):
         """Get all farms of a player"""
         query = """
@@ -98,6 +570,7 @@ class Database:
         """
         return self.execute_query(query, (player_id,))
     
+    @cached_read('Farm')
     def get_farm_by_id(self, farm_id):
         """Get farm info by ID"""
         query = """
@@ -111,7 +584,7 @@ class Database:
     # ==================== Plot Related ====================
     
     def get_farm_plots(self, farm_id):
-        """Get all plots of a farm"""
+        """Get all plots of a farm (queued level changes applied on top)"""
         query = """
         SELECT p.PlotId, p.FarmId, p.X, p.Y, p.Status, 
                p.CropVarietyId, p.PlantedAt, p.WaterLevel, p.FertilizerLevel,
@@ -121,7 +594,76 @@ class Database:
         WHERE p.FarmId = %s
         ORDER BY p.X, p.Y
         """
-        return self.execute_query(query, (farm_id,))
+        return self._query_plots(query, (farm_id,))
+    
+    def get_plot(self, plot_id):
+        """Get a single plot (same columns as get_farm_plots)"""
+        query = """
+        SELECT p.PlotId, p.FarmId, p.X, p.Y, p.Status, 
+               p.CropVarietyId, p.PlantedAt, p.WaterLevel, p.FertilizerLevel,
+               cv.Name AS CropName, cv.GrowthHours
+        FROM game.Plot p
+        LEFT JOIN game.CropVariety cv ON cv.CropVarietyId = p.CropVarietyId
+        WHERE p.PlotId = %s
+        """
+        result = self._query_plots(query, (plot_id,))
+        return result[0] if result else None
+    
+    def apply_daily_tick(self, farm_id, rain_delta=0, wither_factor=CROP_WITHER_FACTOR):
+        """
+        Advance a farm by one day in a single round trip: add rain water,
+        move Growing crops to Mature once GrowthHours have passed and to
+        Withered after GrowthHours * wither_factor, then return all plots.
+        Returns None if the batch failed.
+        """
+        if self.write_queue:
+            # Queued levels must land first or they would overwrite the rain
+            self.write_queue.flush()
+        query = """
+        SET NOCOUNT ON;
+        UPDATE p
+        SET WaterLevel = CASE
+                WHEN ISNULL(p.WaterLevel, 0) + %s > 100 THEN 100
+                ELSE ISNULL(p.WaterLevel, 0) + %s
+            END,
+            Status = CASE
+                WHEN p.Status IN ('Growing', 'Mature') AND p.PlantedAt IS NOT NULL
+                     AND cv.GrowthHours > 0
+                     AND DATEDIFF(SECOND, p.PlantedAt, SYSUTCDATETIME())
+                         >= cv.GrowthHours * 3600.0 * %s THEN 'Withered'
+                WHEN p.Status = 'Growing' AND p.PlantedAt IS NOT NULL
+                     AND DATEDIFF(SECOND, p.PlantedAt, SYSUTCDATETIME())
+                         >= ISNULL(cv.GrowthHours, 0) * 3600.0 THEN 'Mature'
+                ELSE p.Status
+            END
+        FROM game.Plot p
+        LEFT JOIN game.CropVariety cv ON cv.CropVarietyId = p.CropVarietyId
+        WHERE p.FarmId = %s;
+        
+        SELECT p.PlotId, p.FarmId, p.X, p.Y, p.Status, 
+               p.CropVarietyId, p.PlantedAt, p.WaterLevel, p.FertilizerLevel,
+               cv.Name AS CropName, cv.GrowthHours
+        FROM game.Plot p
+        LEFT JOIN game.CropVariety cv ON cv.CropVarietyId = p.CropVarietyId
+        WHERE p.FarmId = %s
+        ORDER BY p.X, p.Y;
+        """
+        return self.execute_batch(
+            query, (rain_delta, rain_delta, wither_factor, farm_id, farm_id)
+        )
+    
+    def _query_plots(self, query, params):
+        """Run a plot query and apply queued level changes on top"""
+        if not self.write_queue:
+            return self.execute_query(query, params)
+        with self.write_queue.io_lock:
+            plots = self.execute_query(query, params)
+            pending = self.write_queue.pending_plot_levels()
+        for plot in plots:
+            levels = pending.get(plot['PlotId'])
+            if levels:
+                plot.update(levels)
+        return plots
     
     def update_plot_status(self, plot_id, status):
         """Update plot status"""
@@ -139,20 +681,32 @@ class Database:
         SET Status = 'Growing', CropVarietyId = %s, PlantedAt = SYSUTCDATETIME()
         WHERE PlotId = %s AND Status = 'Empty'
         """
-        return self.execute_update(query, (crop_variety_id, plot_id))
+        # 0 rows: the plot was no longer empty on the server
+        return self.execute_update(query, (crop_variety_id, plot_id)) > 0
     
     def harvest_plot(self, plot_id):
-        """Harvest crop"""
+        """Harvest crop (also accepts Growing crops whose GrowthHours have passed)"""
+        if self.write_queue:
+            self.write_queue.discard_plot_levels(plot_id)
         query = """
-        UPDATE game.Plot
+        UPDATE p
         SET Status = 'Empty', CropVarietyId = NULL, PlantedAt = NULL, 
             WaterLevel = 0, FertilizerLevel = 0
-        WHERE PlotId = %s AND Status = 'Mature'
+        FROM game.Plot p
+        LEFT JOIN game.CropVariety cv ON cv.CropVarietyId = p.CropVarietyId
+        WHERE p.PlotId = %s
+          AND (p.Status = 'Mature'
+               OR (p.Status = 'Growing' AND p.PlantedAt IS NOT NULL
+                   AND DATEDIFF(SECOND, p.PlantedAt, SYSUTCDATETIME())
+                       >= ISNULL(cv.GrowthHours, 0) * 3600.0))
         """
-        return self.execute_update(query, (plot_id,))
+        # 0 rows: the server does not consider the crop ripe (yet)
+        return self.execute_update(query, (plot_id,)) > 0
 
     def reset_plot(self, plot_id):
         """Force reset plot to empty state (used for clearing withered crops)."""
+        if self.write_queue:
+            self.write_queue.discard_plot_levels(plot_id)
         query = """
         UPDATE game.Plot
         SET Status = 'Empty', CropVarietyId = NULL, PlantedAt = NULL,
@@ -177,36 +731,90 @@ class Database:
         params.append(plot_id)
         return self.execute_update(query, tuple(params))
     
+    def queue_plot_levels(self, plot_id, water_level=None, fertilizer_level=None):
+        """Write-behind version of set_plot_levels (never blocks the caller)"""
+        if not self.write_queue:
+            return self.set_plot_levels(plot_id, water_level, fertilizer_level)
+        return self.write_queue.set_plot_levels(plot_id, water_level, fertilizer_level)
+    
     # ==================== Inventory Related ====================
     
     def get_farm_inventory(self, farm_id):
-        """Get farm inventory"""
+        """Get farm inventory (served from the in-memory item map once loaded)"""
+        stock = self.cache.get('Inventory', farm_id, lambda: self._load_inventory(farm_id))
+        rows = [row for row in stock.values() if row['Quantity'] > 0]
+        rows.sort(key=lambda row: (row['ItemType'], row['Name']))
+        return rows
+    
+    def _load_inventory(self, farm_id):
+        """Query a farm's inventory as {ItemId: row} (queued quantity changes applied on top)"""
         query = """
         SELECT i.InventoryId, i.FarmId, i.ItemId, i.Quantity,
                ic.Name, ic.ItemType, ic.BasePrice
         FROM game.Inventory i
         JOIN game.ItemCatalog ic ON ic.ItemId = i.ItemId
-        WHERE i.FarmId = %s AND i.Quantity > 0
+        WHERE i.FarmId = %s
         ORDER BY ic.ItemType, ic.Name
         """
-        return self.execute_query(query, (farm_id,))
+        if not self.write_queue:
+            return {row['ItemId']: row for row in self.execute_query(query, (farm_id,))}
+        with self.write_queue.io_lock:
+            rows = self.execute_query(query, (farm_id,))
+            pending = self.write_queue.pending_inventory(farm_id)
+        if pending:
+            by_item = {row['ItemId']: row for row in rows}
+            for item_id, delta in pending.items():
+                if item_id in by_item:
+                    by_item[item_id]['Quantity'] += delta
+                else:
+                    # Kept even when not positive: later deltas add up on this row
+                    item = self.get_item_by_id(item_id)
+                    if item:
+                        rows.append({
+                            'InventoryId': None, 'FarmId': farm_id, 'ItemId': item_id,
+                            'Quantity': delta, 'Name': item['Name'],
+                            'ItemType': item['ItemType'], 'BasePrice': item['BasePrice']
+                        })
+        return {row['ItemId']: row for row in rows}
+    
+    def _cache_inventory_change(self, farm_id, item_id, quantity_change):
+        """Apply a written / queued quantity change to the cached item map"""
+        # Looked up outside the cache lock (ItemCatalog is cached too)
+        item = self.get_item_by_id(item_id)
+        
+        def apply(stock):
+            row = stock.get(item_id)
+            if row is not None:
+                row['Quantity'] += quantity_change
+            elif item:
+                stock[item_id] = {
+                    'InventoryId': None, 'FarmId': farm_id, 'ItemId': item_id,
+                    'Quantity': quantity_change, 'Name': item['Name'],
+                    'ItemType': item['ItemType'], 'BasePrice': item['BasePrice']
+                }
+        
+        if not self.cache.modify('Inventory', farm_id, apply):
+            self.cache.invalidate('Inventory', farm_id)
     
     def update_inventory(self, farm_id, item_id, quantity_change):
         """Update inventory quantity"""
-        query = """
-        MERGE game.Inventory AS t
-        USING (SELECT %s AS FarmId, %s AS ItemId) AS s
-        ON (t.FarmId = s.FarmId AND t.ItemId = s.ItemId)
-        WHEN MATCHED THEN 
-            UPDATE SET Quantity = t.Quantity + %s
-        WHEN NOT MATCHED THEN 
-            INSERT (FarmId, ItemId, Quantity) 
-            VALUES (s.FarmId, s.ItemId, %s);
-        """
-        return self.execute_update(query, (farm_id, item_id, quantity_change, quantity_change))
+        success = self.execute_update(self.INVENTORY_MERGE_SQL,
+                                      (farm_id, item_id, quantity_change, quantity_change))
+        if success:
+            self._cache_inventory_change(farm_id, item_id, quantity_change)
+        return success
+    
+    def queue_inventory_change(self, farm_id, item_id, quantity_change):
+        """Write-behind version of update_inventory (never blocks the caller)"""
+        if not self.write_queue:
+            return self.update_inventory(farm_id, item_id, quantity_change)
+        success = self.write_queue.update_inventory(farm_id, item_id, quantity_change)
+        self._cache_inventory_change(farm_id, item_id, quantity_change)
+        return success
     
     # ==================== Crop Variety Related ====================
     
+    @cached_read('CropVariety')
     def get_all_crop_varieties(self):
         """Get all crop varieties"""
         query = """
@@ -218,6 +826,7 @@ class Database:
     
     # ==================== Item Related ====================
     
+    @cached_read('ItemCatalog')
     def get_all_items(self):
         """Get all items"""
         query = """
@@ -227,17 +836,63 @@ class Database:
         """
         return self.execute_query(query)
     
+    @cached_read('ItemCatalog')
+    def get_item_by_id(self, item_id):
+        """Get item catalog entry by ID"""
+        query = """
+        SELECT ItemId, Name, ItemType, StackLimit, BasePrice
+        FROM game.ItemCatalog
+        WHERE ItemId = %s
+        """
+        result = self.execute_query(query, (item_id,))
+        return result[0] if result else None
+    
     # ==================== Action Log ====================
     
     def log_action(self, player_id, farm_id, action, meta_json):
         """Log player action"""
-        query = """
-        INSERT INTO game.ActionLog(PlayerId, FarmId, Action, MetaJson)
-        VALUES (%s, %s, %s, %s)
-        """
-        return self.execute_update(query, (player_id, farm_id, action, meta_json))
+        return self.execute_update(self.ACTION_LOG_SQL, (player_id, farm_id, action, meta_json))
+    
+    def queue_action_log(self, player_id, farm_id, action, meta_json):
+        """Write-behind version of log_action (never blocks the caller)"""
+        if not self.write_queue:
+            return self.log_action(player_id, farm_id, action, meta_json)
+        return self.write_queue.log_action(player_id, farm_id, action, meta_json)
+    
+    def poll_write_failures(self):
+        """Failure messages from the write-behind queue since the last poll"""
+        if not self.write_queue:
+            return []
+        failures = self.write_queue.poll_failures()
+        if failures:
+            # Queued inventory deltas may have been dropped; re-read the true stock
+            self.cache.invalidate('Inventory')
+        return failures
+    
+    def poll_dropped_plots(self):
+        """PlotIds whose queued levels the write-behind queue gave up on (re-read them)"""
+        if not self.write_queue:
+            return []
+        return self.write_queue.poll_dropped_plots()
+    
+    def invalidate_cache(self, table=None, key=None):
+        """Forget cached rows (e.g. after another client changed them)"""
+        self.cache.invalidate(table, key)
+
+
+def create_database(backend=DB_BACKEND):
+    """Create the Database for a backend name: 'mssql', 'sqlite' or 'memory'"""
+    if backend == 'mssql':
+        return Database()
+    if backend == 'sqlite':
+        from sqlite_database import SQLiteDatabase
+        return SQLiteDatabase(SQLITE_DB_PATH, seed_demo=SQLITE_SEED_DEMO)
+    if backend == 'memory':
+        from memory_database import MemoryDatabase
+        return MemoryDatabase().seed_demo_data()
+    raise ValueError(f"Unknown DB_BACKEND: {backend!r}")
 
 
 # Global database instance
-db = Database()
+db = create_database()
 
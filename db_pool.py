@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Connection pooling and future-returning queries shared by the database backends.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from config import DB_POOL_SIZE, DB_POOL_TIMEOUT
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections.
+
+    Connections are opened lazily up to ``size``; a caller that finds the
+    pool exhausted waits up to ``timeout`` seconds for one to be returned.
+    Each call gets a connection to itself, so the main thread, the scene
+    loader and the query workers never share a cursor.
+    """
+    
+    def __init__(self, connection_factory, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT):
+        self.connection_factory = connection_factory
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.opened = 0
+        self.lock = threading.Lock()
+        self.closed = False
+    
+    def acquire(self):
+        """Take an idle connection, open a new one, or wait for one to be released"""
+        if self.closed:
+            raise RuntimeError("Connection pool is closed")
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            can_open = self.opened < self.size
+            if can_open:
+                self.opened += 1
+        if can_open:
+            try:
+                return self.connection_factory()
+            except Exception:
+                with self.lock:
+                    self.opened -= 1
+                raise
+        try:
+            return self.idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection available after {self.timeout}s")
+    
+    def release(self, conn, broken=False):
+        """Return a connection; broken ones are closed and replaced on demand"""
+        if broken or self.closed:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            with self.lock:
+                self.opened -= 1
+            return
+        self.idle.put(conn)
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for one call; rolls back if the call raises"""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.release(conn, broken)
+    
+    def close(self):
+        """Close every idle connection; busy ones are closed when released"""
+        self.closed = True
+        while True:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self.release(conn, broken=True)
+
+
+class AsyncQueries:
+    """
+    Future-returning access to any database method.
+
+    ``db.submit(db.get_farm_plots, farm_id)`` (or ``db.submit('get_farm_plots',
+    farm_id)``) runs the call on a worker thread and returns a
+    concurrent.futures.Future, so scenes can start several queries at once
+    and poll ``future.done()`` instead of blocking the frame.
+    """
+    
+    query_workers = DB_POOL_SIZE
+    _executor = None
+    _executor_lock = threading.Lock()
+    
+    def submit(self, method, *args, **kwargs):
+        """Run ``method(*args, **kwargs)`` in the background and return a Future"""
+        if isinstance(method, str):
+            method = getattr(self, method)
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.query_workers,
+                                                    thread_name_prefix="db-query")
+            executor = self._executor
+        return executor.submit(method, *args, **kwargs)
+    
+    def shutdown_queries(self):
+        """Wait for submitted queries and stop the worker threads"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Dirty-rectangle bookkeeping for the opt-in partial redraw mode.
+
+Each frame the scene reports the screen rect and a small "signature" (any
+comparable value describing what is drawn there) for every region that can
+change on its own. Regions whose rect or signature differ from the previous
+frame, plus regions that appeared or disappeared, become dirty.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+
+def merge_rects(rects: List[pygame.Rect], margin: int = 0) -> List[pygame.Rect]:
+    """Union rects that overlap (or lie within ``margin`` pixels) until none do."""
+    merged = [pygame.Rect(rect) for rect in rects if rect.width > 0 and rect.height > 0]
+    changed = True
+    while changed:
+        changed = False
+        result: List[pygame.Rect] = []
+        for rect in merged:
+            for other in result:
+                if other.inflate(margin * 2, margin * 2).colliderect(rect):
+                    other.union_ip(rect)
+                    changed = True
+                    break
+            else:
+                result.append(rect)
+        merged = result
+    return merged
+
+
+class DirtyRectTracker:
+    """Compares tracked regions between frames and returns what must be repainted."""
+
+    def __init__(self, screen_rect: pygame.Rect, full_redraw_ratio: float = 0.5, margin: int = 8):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.full_redraw_ratio = full_redraw_ratio
+        self.margin = margin
+        self.previous: Dict[Hashable, Tuple[pygame.Rect, Any]] = {}
+        self.current: Dict[Hashable, Tuple[pygame.Rect, Any]] = {}
+        self.rects: List[pygame.Rect] = []
+        self.full = True
+
+    def invalidate(self):
+        """Force the next frame to be a full redraw."""
+        self.full = True
+
+    def begin_frame(self):
+        self.current = {}
+        self.rects = []
+
+    def track(self, key: Hashable, rect: pygame.Rect, signature: Any = None):
+        """Report that ``rect`` shows ``signature`` this frame."""
+        rect = rect.clip(self.screen_rect)
+        state = (rect, signature)
+        self.current[key] = state
+        old = self.previous.get(key)
+        if old is None:
+            self.rects.append(rect)
+        elif old != state:
+            self.rects.append(old[0])
+            self.rects.append(rect)
+
+    def end_frame(self) -> Optional[List[pygame.Rect]]:
+        """Return merged dirty rects, or None if the whole screen should be redrawn."""
+        for key, (rect, _) in self.previous.items():
+            if key not in self.current:
+                self.rects.append(rect)
+        self.previous = self.current
+
+        if self.full:
+            self.full = False
+            return None
+        rects = merge_rects(self.rects, self.margin)
+        area = sum(rect.width * rect.height for rect in rects)
+        if area > self.full_redraw_ratio * self.screen_rect.width * self.screen_rect.height:
+            return None
+        return rects
@@ -9,7 +9,9 @@ import random
 import pygame
 from typing import Callable, Iterable, Tuple
 
-from config import LAYERS, APPLE_POS, APPLE_SPAWN_CHANCE
+from asset_cache import get_asset_cache
+from config import LAYERS, APPLE_POS
+from farm_sim import TreeState
 
 
 class Generic(pygame.sprite.Sprite):
@@ -29,7 +31,8 @@ class Particle(Generic):
 
     def __init__(self, pos, surf, groups, z, duration=300):
         super().__init__(pos, surf, groups, z)
-        self.start_time = pygame.time.get_ticks()
+        # Lifetime in ms of simulation time, so it is the same in replays
+        self.age = 0.0
         self.duration = duration
 
         mask = pygame.mask.from_surface(self.image)
@@ -38,74 +41,73 @@ class Particle(Generic):
         self.image = white_surf
 
     def update(self, dt):
-        now = pygame.time.get_ticks()
-        if now - self.start_time > self.duration:
+        self.age += dt * 1000.0
+        if self.age > self.duration:
             self.kill()
 
 
 class Tree(Generic):
     """Interactive tree that can drop apples and be chopped for wood."""
 
-    def __init__(self, pos, surf, groups, name, player_add: Callable[[str], None]):
+    def __init__(self, pos, surf, groups, name, player_add: Callable[[str], None],
+                 rng: random.Random = None):
         super().__init__(pos, surf, groups, z=LAYERS['main'])
-        self.health = 5
+        # Random source for apples (the scene's seeded one, so replays match)
+        self.rng = rng if rng is not None else random
         self.alive = True
         self.name = name
         base_dir = os.path.dirname(os.path.abspath(__file__))
         stump_file = "small.png" if name.lower() == "small" else "large.png"
-        self.stump_surf = pygame.image.load(
-            os.path.join(base_dir, "graphics", "stumps", stump_file)
-        ).convert_alpha()
-
-        self.apple_surf = pygame.image.load(
-            os.path.join(base_dir, "graphics", "fruit", "apple.png")
-        ).convert_alpha()
+        assets = get_asset_cache()
+        self.stump_surf = assets.load(os.path.join(base_dir, "graphics", "stumps", stump_file))
+        self.apple_surf = assets.load(os.path.join(base_dir, "graphics", "fruit", "apple.png"))
         self.apple_pos = APPLE_POS.get('Small' if name.lower() == 'small' else 'Large', [])
         self.apple_sprites = pygame.sprite.Group()
+        # Health and apples live in the render-free TreeState (farm_sim.py)
+        self.state = TreeState(len(self.apple_pos), self.rng)
+        self.apple_by_slot = {}
         self.create_fruit()
 
         self.player_add = player_add
 
     def create_fruit(self):
-        for offset in self.apple_pos:
-            if random.random() < APPLE_SPAWN_CHANCE:
-                pos = (self.rect.left + offset[0], self.rect.top + offset[1])
-                Generic(
-                    pos=pos,
-                    surf=self.apple_surf,
-                    groups=[self.apple_sprites, self.groups()[0]],
-                    z=LAYERS['fruit']
-                )
+        for slot in self.state.apples:
+            offset = self.apple_pos[slot]
+            pos = (self.rect.left + offset[0], self.rect.top + offset[1])
+            self.apple_by_slot[slot] = Generic(
+                pos=pos,
+                surf=self.apple_surf,
+                groups=[self.apple_sprites, self.groups()[0]],
+                z=LAYERS['fruit']
+            )
 
     def damage(self):
         if not self.alive:
             return
-        self.health -= 1
-        self.drop_apple()
-        self.check_death()
-
-    def drop_apple(self):
-        apples = self.apple_sprites.sprites()
-        if apples:
-            apple = random.choice(apples)
-            Particle(
-                pos=apple.rect.topleft,
-                surf=apple.image,
-                groups=self.groups()[0],
-                z=LAYERS['fruit']
-            )
-            apple.kill()
-            if self.player_add:
-                self.player_add('apple')
+        slot, felled = self.state.chop(self.rng)
+        if slot is not None:
+            self.drop_apple(self.apple_by_slot.pop(slot))
+        if felled:
+            self.fell()
+
+    def drop_apple(self, apple):
+        Particle(
+            pos=apple.rect.topleft,
+            surf=apple.image,
+            groups=self.groups()[0],
+            z=LAYERS['fruit']
+        )
+        apple.kill()
+        if self.player_add:
+            self.player_add('apple')
 
-    def check_death(self):
-        if self.health > 0:
-            return
+    def fell(self):
         Particle(self.rect.topleft, self.image, self.groups()[0], LAYERS['fruit'], 400)
         self.image = self.stump_surf
         self.rect = self.image.get_rect(midbottom=self.rect.midbottom)
         self.hitbox = self.rect.copy().inflate(-10, -self.rect.height * 0.6)
         self.apple_sprites.empty()
+        self.apple_by_slot.clear()
         self.alive = False
         if self.player_add:
             self.player_add('wood')
@@ -3,7 +3,6 @@
 Farm Game Main Scene
 """
 import pygame
-import json
 import os
 import random
 from datetime import datetime
@@ -11,10 +10,20 @@ from config import *
 from player import Player
 from inventory_ui import InventoryUI
 from resource_manager import get_resources
+from asset_cache import get_asset_cache
 from overlay_ui import OverlayUI
 from map_loader import FarmMap
 from environment_sprites import Tree, Interaction
+from spatial_index import SpatialGrid
+from plot_grid import PlotGrid
+from soil_layer import SoilLayer
+from dirty_rects import DirtyRectTracker
+from text_cache import get_text_cache
+from farm_sim import FarmSimulation
 from transition import Transition
+from load_progress import LoadProgress
+from profiler import get_profiler, profiled
+from profiler_overlay import ProfilerOverlay
 
 
 def get_font(size):
@@ -30,20 +39,46 @@ def get_font(size):
 class FarmScene:
     """Farm Main Scene"""
     
-    def __init__(self, screen, db, player_data, farm_data):
+    # Loading stages and their share of the progress bar
+    LOAD_STAGES = {'database': 1, 'map': 6, 'resources': 2, 'world': 1}
+    
+    def __init__(self, screen, db, player_data, farm_data, progress=None, rng=None):
         self.screen = screen
         self.db = db
         self.player_data = player_data
         self.farm_data = farm_data
+        self.progress = progress if progress is not None else LoadProgress(self.LOAD_STAGES)
+        # Plots, growth, trees, inventory changes and the daily tick; the scene
+        # adds input, messages and drawing. Every random decision of the scene
+        # (decorations, apples, rain) comes from one generator, so a recorded
+        # seed reproduces the session
+        self.rng = rng if rng is not None else random.Random()
+        self.sim = FarmSimulation(db, player_data, farm_data, self.rng)
+        self.sim.plot_changed = self.plot_changed
+        
+        # Startup queries (pooled connections) and TMX parsing run concurrently;
+        # each result is only waited for where the scene first needs it
+        items_query = self.db.submit(self.db.get_all_items)
+        varieties_query = self.db.submit(self.db.get_all_crop_varieties)
+        plots_query = self.db.submit(self.db.get_farm_plots, farm_data['FarmId'])
+        self.progress.track('database', [items_query, varieties_query, plots_query])
+        map_task = self.progress.run_async('map', self.parse_tmx_map)
+        with self.progress.stage('resources'):
+            self.resources = get_resources()
+        
         try:
-            self.item_catalog = {item['Name'].lower(): item for item in self.db.get_all_items()}
+            self.item_catalog = {item['Name'].lower(): item for item in items_query.result()}
         except Exception:
             self.item_catalog = {}
+        self.sim.item_catalog = self.item_catalog
         
         self.font_large = get_font(FONT_SIZE_LARGE)
         self.font_medium = get_font(FONT_SIZE_MEDIUM)
         self.font_small = get_font(FONT_SIZE_SMALL)
         self.font_tiny = get_font(FONT_SIZE_TINY)
+        self.text_cache = get_text_cache()
+        self.profiler = get_profiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler, self.font_tiny, self.text_cache)
         
         # World alignment / collision data
         if isinstance(FARM_PLOT_OFFSET, (tuple, list)) and len(FARM_PLOT_OFFSET) == 2:
@@ -56,17 +91,25 @@ class FarmScene:
             self.player_spawn = None
         self.world_obstacles = []
         self.map_collision_rects = []
+        # Blocked tiles of the TMX Collision layer (player movement sweeps against it)
+        self.collision_grid = None
         self.tilemap = None
         self.environment_group = pygame.sprite.Group()
         self.trees = []
-        self.tree_hitboxes = []
         self.interaction_sprites = pygame.sprite.Group()
-        self.day_counter = 1
+        # Spatial indexes so culling / lookups only touch nearby objects
+        self.plot_index = SpatialGrid(SPATIAL_CELL_SIZE)
+        self.tree_index = SpatialGrid(SPATIAL_CELL_SIZE)
+        self.obstacle_index = SpatialGrid(SPATIAL_CELL_SIZE)
+        # Tile -> plot table built from the TMX Farmable layer (None without a map)
+        self.plot_grid = None
         self.debug_draw = False
+        # Keyboard state provider (scripted input can replace it)
+        self.key_source = pygame.key.get_pressed
 
-        # Load plot data
-        self.plots = []
-        self.load_plots()
+        # Autotiled soil of all plots, baked into one surface
+        self.soil_layer = SoilLayer(self.get_soil_image, TILE_SIZE)
+        self.load_plots(plots_query.result())
         
         # Calculate farm size
         if self.plots:
@@ -82,7 +125,8 @@ class FarmScene:
             self.player_spawn = (self.map_width // 2, self.map_height // 2)
 
         # TMX map (overrides world size/spawn if available)
-        self.load_tmx_map()
+        self.load_tmx_map(map_task.result())
+        self.progress.begin('world')
         self.load_interactions_from_map()
         
         # Create player
@@ -92,6 +136,11 @@ class FarmScene:
         # Camera
         self.camera_x = 0
         self.camera_y = 0
+        self.prev_camera = (0, 0)  # camera at the previous simulation tick
+        
+        # Dirty-rect rendering (DIRTY_RECT_RENDERING): regions drawn last frame
+        self.dirty_rects = DirtyRectTracker(self.screen.get_rect())
+        self.last_camera = None
         
         # UI system
         self.inventory_ui = InventoryUI(screen, db)
@@ -104,7 +153,8 @@ class FarmScene:
         self.selected_plot = None
         
         # Load crop varieties
-        self.crop_varieties = self.db.get_all_crop_varieties()
+        self.crop_varieties = varieties_query.result()
+        self.sim.crop_varieties = {cv['CropVarietyId']: cv for cv in self.crop_varieties}
         self.seed_item_to_variety = {
             cv['SeedItemId']: cv for cv in self.crop_varieties if cv.get('SeedItemId')
         }
@@ -116,8 +166,6 @@ class FarmScene:
         self.show_help = True
         self.help_timer = 10.0  # Auto-hide after 10 seconds
         
-        # Load graphics resources
-        self.resources = get_resources()
         self.overlay_ui = OverlayUI(screen, self.player, self.resources)
         self.load_trees_from_map()
 
@@ -125,9 +173,9 @@ class FarmScene:
         self.background_image = None
         self.load_background()
         self.build_world_obstacles()
-        self.world_obstacles.extend(self.tree_hitboxes)
         if self.background_image:
             self.build_world_obstacles_from_background()
+        self.build_obstacle_index()
         
         # Ground tile surface (for tiled background)
         self.ground_tile = None
@@ -137,6 +185,30 @@ class FarmScene:
         # Environment decorations (trees, bushes, etc.)
         self.decorations = []
         self.init_decorations()
+        self.progress.end('world')
+        self.progress.finish()
+    
+    # Simulation state, kept in self.sim (farm_sim.FarmSimulation)
+    @property
+    def plots(self):
+        return self.sim.plots
+    
+    @property
+    def plots_by_id(self):
+        return self.sim.plots_by_id
+    
+    @property
+    def day_counter(self):
+        return self.sim.day_counter
+    
+    @property
+    def clock(self):
+        """Epoch seconds for crop growth (replays substitute their tick clock)"""
+        return self.sim.clock
+    
+    @clock.setter
+    def clock(self, clock):
+        self.sim.clock = clock
     
     def init_decorations(self):
         """Initialize environment decorations"""
@@ -144,7 +216,6 @@ class FarmScene:
             # The background image already contains baked-in environment art.
             self.decorations = []
             return
-        import random
         
         # Add decorations around the farm
         decoration_types = [
@@ -161,67 +232,83 @@ class FarmScene:
         
         for _ in range(num_decorations):
             # Random position
-            x = random.randint(-1, self.max_x)
-            y = random.randint(-1, self.max_y)
+            x = self.rng.randint(-1, self.max_x)
+            y = self.rng.randint(-1, self.max_y)
             
             # Check if position overlaps with plots
             is_plot = any(p['X'] == x and p['Y'] == y for p in self.plots)
             
             if not is_plot:
                 # Random decoration type
-                dec_type, width, height = random.choice(decoration_types)
+                dec_type, width, height = self.rng.choice(decoration_types)
                 
                 if dec_type in self.resources.objects_images:
                     self.decorations.append({
                         'type': dec_type,
-                        'x': x * TILE_SIZE + random.randint(-10, 10),
-                        'y': y * TILE_SIZE + random.randint(-10, 10),
+                        'x': x * TILE_SIZE + self.rng.randint(-10, 10),
+                        'y': y * TILE_SIZE + self.rng.randint(-10, 10),
                         'width': width,
                         'height': height,
                         'layer': 1 if 'tree' in dec_type else 0  # Trees behind, others in front
                     })
 
-    def load_tmx_map(self):
-        """Load TMX map and build layered sprites plus collision data."""
+    def parse_tmx_map(self):
+        """Parse the TMX map into a FarmMap (None if disabled, missing or broken)."""
         if not USE_TMX_MAP:
-            return
+            return None
         
+        script_dir = os.path.dirname(os.path.abspath(__file__))
         map_path = TMX_MAP_PATH
         if not os.path.isabs(map_path):
-            script_dir = os.path.dirname(os.path.abspath(__file__))
             map_path = os.path.join(script_dir, map_path)
+        cache_dir = MAP_CACHE_DIR
+        if cache_dir and not os.path.isabs(cache_dir):
+            cache_dir = os.path.join(script_dir, cache_dir)
         
         if not os.path.exists(map_path):
             print(f"TMX map not found: {map_path}")
+            return None
+        
+        try:
+            tilemap = FarmMap(map_path, LAYERS, MAP_CHUNK_SIZE, cache_dir)
+        except Exception as e:
+            print(f"Failed to load TMX map: {e}")
+            return None
+        print(f"Loaded TMX map: {map_path}" + (" (compiled cache)" if tilemap.from_cache else ""))
+        return tilemap
+    
+    def load_tmx_map(self, tilemap=None):
+        """Load TMX map and build layered sprites plus collision data."""
+        if tilemap is None:
+            tilemap = self.parse_tmx_map()
+        if tilemap is None:
             return
         
         try:
-            self.tilemap = FarmMap(map_path, LAYERS)
+            self.tilemap = tilemap
             self.map_collision_rects = [rect.copy() for rect in self.tilemap.collision_rects]
+            self.collision_grid = self.tilemap.collision_grid
             self.map_width = max(self.map_width, self.tilemap.width)
             self.map_height = max(self.map_height, self.tilemap.height)
+            self.build_plot_grid()
             
             spawn_x, spawn_y = self.player_spawn or (self.map_width // 2, self.map_height // 2)
             spawn_x = max(0, min(spawn_x, max(0, self.map_width - PLAYER_SIZE)))
             spawn_y = max(0, min(spawn_y, max(0, self.map_height - PLAYER_SIZE)))
             self.player_spawn = (spawn_x, spawn_y)
-            
-            print(f"Loaded TMX map: {map_path}")
         except Exception as e:
             print(f"Failed to load TMX map: {e}")
             self.tilemap = None
             self.map_collision_rects = []
+            self.collision_grid = None
+            self.plot_grid = None
 
     def load_interactions_from_map(self):
         """Load interaction trigger areas (bed, trader, etc.) from TMX."""
         self.interaction_sprites.empty()
-        if not self.tilemap or not getattr(self.tilemap, 'tmx_data', None):
-            return
-        try:
-            player_layer = self.tilemap.tmx_data.get_layer_by_name('Player')
-        except (ValueError, KeyError):
+        if not self.tilemap:
             return
-        for obj in player_layer:
+        for obj in self.tilemap.objects('Player'):
             name = (obj.name or '').strip()
             if name.lower() == 'start' and not FARM_PLAYER_SPAWN:
                 self.player_spawn = (obj.x, obj.y)
@@ -237,12 +324,12 @@ class FarmScene:
         """Instantiate trees from the TMX object layer."""
         self.environment_group.empty()
         self.trees = []
-        self.tree_hitboxes = []
-        if not self.tilemap or not getattr(self.tilemap, 'tmx_data', None):
+        self.sim.trees = []
+        self.tree_index.clear()
+        if not self.tilemap:
             return
-        try:
-            trees_layer = self.tilemap.tmx_data.get_layer_by_name('Trees')
-        except (KeyError, ValueError):
+        trees_layer = self.tilemap.objects('Trees')
+        if not trees_layer:
             return
         surface_map = {
             'small': self.resources.objects_images.get('tree_small'),
@@ -255,9 +342,11 @@ class FarmScene:
                 continue
             pos_x = obj.x
             pos_y = obj.y - surf.get_height()
-            tree = Tree((pos_x, pos_y), surf, [self.environment_group], name, self.collect_tree_item)
+            tree = Tree((pos_x, pos_y), surf, [self.environment_group], name, self.collect_tree_item,
+                        self.rng)
             self.trees.append(tree)
-            self.tree_hitboxes.append(tree.hitbox)
+            self.sim.trees.append(tree.state)
+            self.tree_index.insert(tree, tree.hitbox)
     
     def load_background(self):
         """Load custom background image"""
@@ -276,7 +365,7 @@ class FarmScene:
             
             if os.path.exists(image_path):
                 try:
-                    original_image = pygame.image.load(image_path).convert_alpha()
+                    original_image = get_asset_cache().load(image_path)
                     if FARM_BG_SCALE_TO_SCREEN:
                         self.background_image = pygame.transform.scale(
                             original_image,
@@ -297,6 +386,7 @@ class FarmScene:
                     self.player.set_position(spawn_x, spawn_y)
                     
                     self.update_camera()
+                    self.prev_camera = (self.camera_x, self.camera_y)
                     
                     print(f"Loaded farm background image: {image_path}")
                 except Exception as e:
@@ -311,21 +401,58 @@ class FarmScene:
             self.background_image = None
             self.world_obstacles = []
     
-    def load_plots(self):
-        """Load plot data"""
-        self.plots = self.db.get_farm_plots(self.farm_data['FarmId'])
+    def load_plots(self, plots=None):
+        """Load all plot data (full resync, used on scene start and day change)"""
+        self.sim.load_plots(plots)
+        self.apply_plot_offsets()
+
+    def plot_changed(self, plot):
+        """A plot's row, status or stage changed in the simulation: (re-)place and redraw it"""
+        self.prepare_plot(plot)
+        self.soil_layer.update(plot)
+
+    def build_plot_grid(self):
+        """Index plots per map tile, using the Farmable layer as the farmable mask."""
+        compiled = self.tilemap.compiled
+        tile_w, tile_h = compiled.tile_width, compiled.tile_height
+        cols, rows = compiled.width // tile_w, compiled.height // tile_h
+        layer = self.tilemap.tile_layer('Farmable')
+        if layer is not None:
+            self.plot_grid = PlotGrid.from_gids(layer.gids, layer.cols, layer.rows, tile_w, tile_h)
+        else:
+            self.plot_grid = PlotGrid(cols, rows, tile_w, tile_h)
+        # Plots sit on whole map tiles, so snap their origin down to the tile grid
+        self.plot_offset_x -= self.plot_offset_x % tile_w
+        self.plot_offset_y -= self.plot_offset_y % tile_h
         self.apply_plot_offsets()
 
     def apply_plot_offsets(self):
         """Pre-compute world positions for each plot so we can align with the background map"""
+        self.plot_index.clear()
+        if self.plot_grid is not None:
+            self.plot_grid.clear()
         for plot in self.plots:
-            world_x = self.plot_offset_x + plot['X'] * TILE_SIZE
-            world_y = self.plot_offset_y + plot['Y'] * TILE_SIZE
-            plot['world_x'] = world_x
-            plot['world_y'] = world_y
-            plot['world_rect'] = pygame.Rect(world_x, world_y, TILE_SIZE, TILE_SIZE)
-            plot['WaterLevel'] = plot.get('WaterLevel') or 0
-            plot['FertilizerLevel'] = plot.get('FertilizerLevel') or 0
+            self.prepare_plot(plot)
+        if self.plot_grid is not None:
+            misplaced = [plot for plot in self.plots if not plot.get('farmable', True)]
+            if misplaced:
+                cells = ', '.join(f"({plot['X']}, {plot['Y']})" for plot in misplaced[:8])
+                more = '...' if len(misplaced) > 8 else ''
+                print(f"Warning: {len(misplaced)} plot(s) are not on Farmable map tiles: {cells}{more}")
+        self.soil_layer.rebuild(self.plots)
+
+    def prepare_plot(self, plot):
+        """Compute a plot's world rect, normalise its levels and (re)index it."""
+        world_x = self.plot_offset_x + plot['X'] * TILE_SIZE
+        world_y = self.plot_offset_y + plot['Y'] * TILE_SIZE
+        plot['world_x'] = world_x
+        plot['world_y'] = world_y
+        plot['world_rect'] = pygame.Rect(world_x, world_y, TILE_SIZE, TILE_SIZE)
+        plot['WaterLevel'] = plot.get('WaterLevel') or 0
+        plot['FertilizerLevel'] = plot.get('FertilizerLevel') or 0
+        self.plot_index.update(plot, plot['world_rect'])
+        if self.plot_grid is not None:
+            plot['farmable'] = self.plot_grid.place(plot)
 
     def find_variety_by_keyword(self, keyword):
         """Locate crop variety by fuzzy keyword (corn/tomato)."""
@@ -346,6 +473,19 @@ class FarmScene:
             x, y, w, h = rect_data
             self.world_obstacles.append(pygame.Rect(x, y, w, h))
 
+    def build_obstacle_index(self):
+        """Index static obstacles plus trees (whose hitbox changes once chopped)."""
+        self.obstacle_index.clear()
+        for rect in self.world_obstacles:
+            self.obstacle_index.insert(rect, rect)
+        for tree in self.trees:
+            self.obstacle_index.insert(tree, tree.hitbox)
+
+    def refresh_tree(self, tree):
+        """Re-index a tree after its hitbox changed (e.g. it became a stump)."""
+        self.tree_index.update(tree, tree.hitbox)
+        self.obstacle_index.update(tree, tree.hitbox)
+
     def build_world_obstacles_from_background(self, alpha_threshold=10, solid_ratio_threshold=0.2):
         """
         Sample the background image and add collision rectangles wherever the image
@@ -387,31 +527,16 @@ class FarmScene:
                     rect.clamp_ip(world_bounds)
                     self.world_obstacles.append(rect)
 
-    def find_item_catalog_entry(self, candidates):
-        if not isinstance(candidates, (list, tuple)):
-            candidates = [candidates]
-        for name in candidates:
-            item = self.item_catalog.get(name.lower())
-            if item:
-                return item
-        return None
-
     def collect_tree_item(self, tag):
         """Add apples/wood from trees into inventory (if possible)."""
-        keywords = {
-            'apple': ['apple', '鑻规灉'],
-            'wood': ['wood', '鏈ㄦ潗']
-        }
-        candidate = keywords.get(tag.lower(), [tag])
-        item_entry = self.find_item_catalog_entry(candidate)
+        try:
+            item_entry = self.sim.collect(tag)
+        except Exception:
+            item_entry = None
         if item_entry:
-            try:
-                if self.db.update_inventory(self.farm_data['FarmId'], item_entry['ItemId'], 1):
-                    self.add_message(f"Obtained {item_entry['Name']} x1", 1.5)
-                    self.inventory_ui.load_inventory()
-                    return
-            except Exception:
-                pass
+            self.add_message(f"Obtained {item_entry['Name']} x1", 1.5)
+            self.inventory_ui.refresh()
+            return
         self.add_message(f"Obtained {tag} (not registered in item catalog)锛堟湭鍦ㄧ墿鍝佽〃涓敞鍐岋級", 1.5)
     
     def add_message(self, text, duration=3.0):
@@ -419,12 +544,18 @@ class FarmScene:
         self.messages.append({'text': text, 'timer': duration})
     
     def update(self, dt):
-        """Update scene"""
+        """Advance the scene by one fixed simulation tick of dt seconds"""
+        # Interpolated drawing blends from here to the state after this tick
+        self.player.store_previous_position()
+        self.prev_camera = (self.camera_x, self.camera_y)
+        if self.player.sleep:
+            self.transition.update(dt)
+        
         if self.inventory_ui.is_visible:
             return  # Pause game update when inventory is open
         
         # Get key states
-        keys_pressed = pygame.key.get_pressed()
+        keys_pressed = self.key_source()
         
         # Update player
         self.player.update(
@@ -433,16 +564,27 @@ class FarmScene:
             TILE_SIZE,
             self.map_width,
             self.map_height,
-            self.world_obstacles
+            self.obstacle_index,
+            self.collision_grid
         )
         self.environment_group.update(dt)
         
+        # Advance crop growth for every plot at a fixed rate
+        self.sim.tick(dt)
+        
         # Update camera
         self.update_camera()
         
         # Check nearby plots
         self.check_nearby_plots()
         
+        # Report background save failures
+        for error in self.db.poll_write_failures():
+            self.add_message(error, 3.0)
+        # Levels that never reached the database: show the saved ones again
+        for plot_id in self.db.poll_dropped_plots():
+            self.sim.refresh_plot(plot_id)
+        
         # Update messages
         for msg in self.messages[:]:
             msg['timer'] -= dt
@@ -479,7 +621,11 @@ class FarmScene:
         self.selected_plot = None
         min_dist = float('inf')
         
-        for plot in self.plots:
+        if self.plot_grid is not None:
+            nearby = self.plot_grid.plots_in_rect(interaction_zone)
+        else:
+            nearby = self.plot_index.query_rect(interaction_zone)
+        for plot in nearby:
             plot_rect = plot.get('world_rect')
             if not plot_rect:
                 continue
@@ -509,22 +655,23 @@ class FarmScene:
     def get_target_plot(self):
         """Return plot located at the player's tool target point."""
         target_x, target_y = self.player.get_tool_target()
-        for plot in self.plots:
-            rect = plot.get('world_rect')
-            if rect and rect.collidepoint(target_x, target_y):
-                return plot
-        return None
+        if self.plot_grid is not None:
+            return self.plot_grid.plot_at(target_x, target_y)
+        hits = self.plot_index.query_point(target_x, target_y)
+        return hits[0] if hits else None
 
     def get_target_tree(self):
         """Return tree under the player's tool target, if any."""
         target_x, target_y = self.player.get_tool_target()
-        for tree in self.trees:
-            if tree.hitbox.collidepoint(target_x, target_y):
-                return tree
-        return None
+        hits = self.tree_index.query_point(target_x, target_y)
+        return hits[0] if hits else None
     
     def handle_event(self, event):
         """Handle event"""
+        # The window contents were lost: repaint everything (input changes are tracked)
+        if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE):
+            self.dirty_rects.invalidate()
+        
         # Handle UI events first
         if self.inventory_ui.is_visible:
             if self.inventory_ui.handle_event(event):
@@ -576,6 +723,16 @@ class FarmScene:
             # Toggle debug overlay
             if event.key == pygame.K_F3:
                 self.debug_draw = not self.debug_draw
+                self.profiler.set_enabled(self.debug_draw)
+                # Debug outlines reach past the tracked player region
+                self.dirty_rects.invalidate()
+                return None
+            
+            # Save the profiled frames as a Chrome trace
+            if event.key == pygame.K_F4 and self.profiler.enabled:
+                path = self.profiler.export_trace()
+                if path:
+                    self.add_message(f"Trace saved: {path}", 3.0)
                 return None
             
             # Return to login screen
@@ -636,17 +793,10 @@ class FarmScene:
     # 新的一天开始
     def start_new_day(self):
         """Simple daily reset hook triggered when sleeping in the bed."""
-        raining = random.random() < 0.35
-        if raining:
-            for plot in self.plots:
-                try:
-                    new_water = min(100, (plot.get('WaterLevel') or 0) + 25)
-                    self.db.set_plot_levels(plot['PlotId'], water_level=new_water)
-                except Exception:
-                    pass
-        self.day_counter += 1
-        self.load_plots()
-        self.inventory_ui.load_inventory()
+        # Rain and crop growth are applied server-side in one batch
+        self.sim.start_new_day()
+        self.apply_plot_offsets()
+        self.inventory_ui.refresh()
         self.add_message(f"Day {self.day_counter} begins!", 2.5)
 
     def use_selected_tool(self):
@@ -665,6 +815,8 @@ class FarmScene:
                 tree = self.get_target_tree()
                 if tree:
                     tree.damage()
+                    if not tree.alive:
+                        self.refresh_tree(tree)
                     result = True
 
         if tool:
@@ -693,7 +845,6 @@ class FarmScene:
 
         if self.plant_crop(plot['PlotId'], preferred_variety):
             self.add_message(f"Sowed {preferred_variety['Name']}", 2.0)
-            self.load_plots()
         self.player.start_tool_animation()
 
     def apply_water(self, plot, amount=30):
@@ -702,8 +853,7 @@ class FarmScene:
         if new_water == plot.get('WaterLevel'):
             self.add_message("Soil moisture is already sufficient.", 1.5)
             return True
-        if self.db.set_plot_levels(plot['PlotId'], water_level=new_water):
-            plot['WaterLevel'] = new_water
+        if self.sim.set_levels(plot, water_level=new_water):
             self.add_message("Water +30", 1.5)
             return True
         self.add_message("Watering failed.", 1.5)
@@ -715,8 +865,7 @@ class FarmScene:
         if new_fert == plot.get('FertilizerLevel'):
             self.add_message("Soil is already fertile.", 1.5)
             return True
-        if self.db.set_plot_levels(plot['PlotId'], fertilizer_level=new_fert):
-            plot['FertilizerLevel'] = new_fert
+        if self.sim.set_levels(plot, fertilizer_level=new_fert):
             self.add_message("Hoeing improved fertility.", 1.5)
             return True
         self.add_message("Hoeing failed.", 1.5)
@@ -729,10 +878,9 @@ class FarmScene:
             self.harvest_crop(plot['PlotId'])
             return True
         if plot['Status'] == 'Withered':
-            if self.db.reset_plot(plot['PlotId']):
+            if self.sim.clear(plot['PlotId']):
                 self.add_message("Cleared withered crop", 2.0)
-                self.load_plots()
-                self.inventory_ui.load_inventory()
+                self.inventory_ui.refresh()
                 return True
             self.add_message("Clear failed", 1.5)
             return False
@@ -767,27 +915,15 @@ class FarmScene:
             return
         
         # Deduct seed
-        if self.db.update_inventory(self.farm_data['FarmId'], seed['ItemId'], -1):
-            # Plant
-            if self.db.plant_crop(plot_id, crop_variety['CropVarietyId']):
+        if self.sim.change_inventory(seed['ItemId'], -1):
+            # Plant (logs the action and reloads the planted plot)
+            if self.sim.plant(plot_id, crop_variety):
                 self.add_message(f"Planted {crop_variety['Name']}!", 2.0)
-                
-                # Log action
-                meta = json.dumps({
-                    'PlotId': plot_id,
-                    'CropVarietyId': crop_variety['CropVarietyId']
-                }, ensure_ascii=False)
-                self.db.log_action(self.player_data['PlayerId'], 
-                                  self.farm_data['FarmId'], 
-                                  'Plant', meta)
-                
-                # Reload plots
-                self.load_plots()
                 return True
             else:
                 self.add_message("Planting failed!", 2.0)
                 # Return seed
-                self.db.update_inventory(self.farm_data['FarmId'], seed['ItemId'], 1)
+                self.sim.change_inventory(seed['ItemId'], 1)
         else:
             self.add_message("Insufficient seeds!", 2.0)
         return False
@@ -829,51 +965,40 @@ class FarmScene:
             self.add_message("Crop info not found!", 2.0)
             return
         
-        # Calculate yield (simplified version, considering soil quality)
-        base_yield = crop_variety['BaseYield']
-        soil_quality = self.farm_data['SoilQuality']
-        water_level = plot['WaterLevel']
-        fertilizer_level = plot['FertilizerLevel']
-        
-        yield_amount = int(base_yield * (1 + soil_quality / 200.0 + 
-                                        water_level / 200.0 + 
-                                        fertilizer_level / 100.0))
-        yield_amount = max(1, yield_amount)
-        
-        # Add produce to inventory
-        produce_item_id = crop_variety['ProduceItemId']
-        if self.db.update_inventory(self.farm_data['FarmId'], produce_item_id, yield_amount):
-            # Clear plot
-            if self.db.harvest_plot(plot_id):
-                self.add_message(f"Harvested {yield_amount} {plot['CropName']}!", 3.0)
-                
-                # Log action
-                meta = json.dumps({
-                    'PlotId': plot_id,
-                    'Yield': yield_amount
-                }, ensure_ascii=False)
-                self.db.log_action(self.player_data['PlayerId'],
-                                  self.farm_data['FarmId'],
-                                  'Harvest', meta)
-                
-                # Reload
-                self.load_plots()
-                self.inventory_ui.load_inventory()
-            else:
-                self.add_message("Harvest failed!", 2.0)
+        # Clears the plot, adds the produce (yield scales with soil quality,
+        # water and fertilizer), logs the action and reloads the plot
+        crop_name = plot['CropName']
+        yield_amount = self.sim.harvest(plot, crop_variety)
+        if yield_amount is not None:
+            self.add_message(f"Harvested {yield_amount} {crop_name}!", 3.0)
+            self.inventory_ui.refresh()
         else:
-            self.add_message("Inventory full!", 2.0)
+            self.add_message("Harvest failed!", 2.0)
     
     def clear_withered(self, plot_id):
         """Clear withered crop"""
-        if self.db.reset_plot(plot_id):
+        if self.sim.clear(plot_id):
             self.add_message("Cleared withered crop", 2.0)
-            self.load_plots()
         else:
             self.add_message("Clear failed!", 2.0)
     
-    def draw(self):
-        """Draw scene"""
+    def render_camera(self, alpha=1.0):
+        """Camera position ``alpha`` of the way from the previous tick to the latest"""
+        prev_x, prev_y = self.prev_camera
+        return (round(prev_x + (self.camera_x - prev_x) * alpha),
+                round(prev_y + (self.camera_y - prev_y) * alpha))
+    
+    def draw(self, alpha=1.0):
+        """Draw scene, interpolated ``alpha`` (0..1) of a tick past the previous update"""
+        camera = (self.camera_x, self.camera_y)
+        self.camera_x, self.camera_y = self.render_camera(alpha)
+        try:
+            self.draw_scene(alpha)
+        finally:
+            self.camera_x, self.camera_y = camera
+    
+    def draw_scene(self, alpha):
+        """Draw every layer at the current (render) camera position"""
         # Draw background / TMX map
         if self.tilemap:
             self.screen.fill(COLOR_GREEN)
@@ -896,7 +1021,7 @@ class FarmScene:
         self.draw_plots()
         
         # Draw dynamic entities (trees, apples, particles, player)
-        self.draw_dynamic_entities()
+        self.draw_dynamic_entities(alpha)
         
         # Draw decorations (layer 1 - in front of player for depth effect)
         self.draw_decorations(layer=1)
@@ -916,6 +1041,100 @@ class FarmScene:
 
         if self.player.sleep:
             self.transition.play()
+
+        if self.profiler.enabled:
+            self.profiler_overlay.draw(self.screen)
+    
+    def draw_dirty(self, alpha=1.0):
+        """
+        Dirty-rect version of draw(): repaints only the regions that changed
+        since the last frame. Returns the rects for pygame.display.update, or
+        None if the whole frame was redrawn (camera scrolled, panels open, ...).
+        """
+        camera = (self.camera_x, self.camera_y)
+        self.camera_x, self.camera_y = self.render_camera(alpha)
+        try:
+            return self._draw_dirty(alpha)
+        finally:
+            self.camera_x, self.camera_y = camera
+    
+    def _draw_dirty(self, alpha):
+        tracker = self.dirty_rects
+        tracker.begin_frame()
+        camera = (self.camera_x, self.camera_y)
+        panels = (self.inventory_ui.is_visible, self.show_help, self.player.sleep)
+        if camera != self.last_camera or any(panels):
+            tracker.invalidate()
+        self.last_camera = camera
+        # Closing a panel or ending the transition also needs one full redraw
+        tracker.track('panels', self.screen.get_rect(), panels)
+        self.track_dirty_regions(tracker, alpha)
+        
+        rects = tracker.end_frame()
+        if rects is None:
+            self.draw_scene(alpha)
+            return None
+        if rects:
+            # One pass clipped to the union of the dirty rects. pygame.draw output
+            # differs right at a clip edge, so repaint a slightly larger area and
+            # only present the inner rects
+            self.screen.set_clip(rects[0].unionall(rects[1:]).inflate(8, 8))
+            self.draw_scene(alpha)
+            self.screen.set_clip(None)
+        return rects
+    
+    def track_dirty_regions(self, tracker, alpha=1.0):
+        """Report every region that can change without the camera moving"""
+        view_rect = pygame.Rect(self.camera_x, self.camera_y, SCREEN_WIDTH, SCREEN_HEIGHT)
+        
+        # Plots: status, crop stage, selection and the water overlay frame
+        water_frames = len(self.resources.soil_water_images) or 1
+        water_frame = (pygame.time.get_ticks() // 200) % water_frames
+        for plot in self.plot_index.query_rect(view_rect):
+            plot_rect = plot.get('world_rect')
+            if not plot_rect:
+                continue
+            watered = plot.get('WaterLevel', 0) > 50 and plot['Status'] != 'Empty'
+            signature = (plot['Status'], plot.get('GrowthStage'), plot.get('CropName'),
+                         self.soil_layer.shown(plot), water_frame if watered else None,
+                         plot is self.selected_plot)
+            tracker.track(('plot', plot['PlotId']),
+                          plot_rect.move(-self.camera_x, -self.camera_y).inflate(8, 8),
+                          signature)
+        
+        # Trees, apples and particles
+        for sprite in self.environment_group.sprites():
+            if sprite.rect.colliderect(view_rect):
+                tracker.track(('sprite', id(sprite)),
+                              sprite.rect.move(-self.camera_x, -self.camera_y),
+                              id(sprite.image))
+        
+        # Player (moves and animates)
+        render_rect = self.player.render_rect(alpha)
+        player_rect = pygame.Rect(int(render_rect.x - self.camera_x),
+                                  int(render_rect.y - self.camera_y),
+                                  self.player.width, self.player.height)
+        tracker.track('player', player_rect.inflate(8, 8),
+                      (self.player.current_action, self.player.animation_frame, self.debug_draw))
+        
+        # Profiler overlay (new graph column every frame)
+        if self.profiler.enabled:
+            tracker.track('profiler', self.profiler_overlay.area(self.screen.get_rect()),
+                          self.profiler.frame_index)
+        
+        # HUD
+        tracker.track('hud', pygame.Rect(0, 0, SCREEN_WIDTH, 80),
+                      (self.player_data['Name'], self.player_data['Level'],
+                       self.player_data['CurrencyGold'], self.player_data['CurrencyGem'],
+                       self.farm_data['Name'], self.farm_data['SoilQuality']))
+        tracker.track('hint', pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT - 80, 300, 40),
+                      self.interaction_hint)
+        if self.messages:
+            tracker.track('messages', pygame.Rect(0, 70, SCREEN_WIDTH, 40 * len(self.messages) + 40),
+                          tuple((msg['text'], min(255, int(msg['timer'] * 255)))
+                                for msg in self.messages))
+        tracker.track('overlay', self.overlay_ui.get_rect(),
+                      (self.player.selected_tool, self.player.selected_seed))
     
     def draw_tiled_ground(self):
         """Draw tiled ground background"""
@@ -952,21 +1171,23 @@ class FarmScene:
                 y + dec['height'] < 0 or y > SCREEN_HEIGHT):
                 continue
             
-            # Get decoration image
-            dec_img = self.resources.objects_images.get(dec['type'])
-            if dec_img:
-                # Scale to desired size
-                scaled_img = pygame.transform.scale(dec_img, (dec['width'], dec['height']))
+            # Get decoration image (pre-scaled to the desired size)
+            scaled_img = self.resources.get_scaled(
+                f"objects/{dec['type']}", (dec['width'], dec['height'])
+            )
+            if scaled_img:
                 self.screen.blit(scaled_img, (x, y))
 
-    def draw_dynamic_entities(self):
+    @profiled('entities')
+    def draw_dynamic_entities(self, alpha=1.0):
         """Draw trees/apples/particles along with the player, sorted by y."""
         sprites = list(self.environment_group.sprites())
         sprites.append(self.player)
+        self.profiler.count('blits', len(sprites))
         sprites.sort(key=lambda spr: (getattr(spr,'z', LAYERS['main']), spr.rect.bottom if hasattr(spr,'rect') else 0))
         for sprite in sprites:
             if sprite is self.player:
-                self.player.draw(self.screen, self.camera_x, self.camera_y)
+                self.player.draw(self.screen, self.camera_x, self.camera_y, alpha)
                 if self.debug_draw:
                     self._draw_player_debug()
             else:
@@ -983,10 +1204,20 @@ class FarmScene:
         dx, dy = PLAYER_TOOL_OFFSET.get(self.player.direction, (0, 0))
         target_pos = hitbox_rect.centerx + dx, hitbox_rect.centery + dy
         pygame.draw.circle(self.screen, (0, 120, 255), target_pos, 5)
+        if self.collision_grid is not None:
+            view_rect = pygame.Rect(self.camera_x, self.camera_y, SCREEN_WIDTH, SCREEN_HEIGHT)
+            for rect in self.collision_grid.rects:
+                if rect.colliderect(view_rect):
+                    pygame.draw.rect(self.screen, (255, 160, 0),
+                                     rect.move(-self.camera_x, -self.camera_y), 1)
     
+    @profiled('plots')
     def draw_plots(self):
         """Draw all plots"""
-        for plot in self.plots:
+        view_rect = pygame.Rect(self.camera_x, self.camera_y, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.soil_layer.draw(self.screen, self.camera_x, self.camera_y)
+        blits = 1
+        for plot in self.plot_index.query_rect(view_rect):
             plot_rect = plot.get('world_rect')
             if not plot_rect:
                 continue
@@ -998,8 +1229,9 @@ class FarmScene:
                 y + TILE_SIZE < 0 or y > SCREEN_HEIGHT):
                 continue
             
-            # Draw soil background
-            self.draw_soil_tile(plot, x, y)
+            # Water overlay (the soil itself comes from the baked soil layer)
+            if self.draw_soil_water(plot, x, y):
+                blits += 1
             
             # Border
             border_color = COLOR_YELLOW if plot == self.selected_plot else COLOR_BLACK
@@ -1011,24 +1243,28 @@ class FarmScene:
             if plot['Status'] in ['Growing', 'Mature', 'Withered']:
                 if plot['CropName']:
                     # Crop name
-                    name_text = self.font_tiny.render(plot['CropName'], True, COLOR_BLACK)
+                    name_text = self.text_cache.render(self.font_tiny, plot['CropName'], COLOR_BLACK)
                     name_rect = name_text.get_rect(center=(x + TILE_SIZE // 2, y + 15))
                     
                     # Text background
                     bg_rect = name_rect.inflate(4, 2)
                     pygame.draw.rect(self.screen, COLOR_WHITE, bg_rect)
                     self.screen.blit(name_text, name_rect)
+                    blits += 1
                 
                 # Draw crop visual stage (simple graphics)
-                self.draw_crop_visual(plot, x, y)
+                if self.draw_crop_visual(plot, x, y):
+                    blits += 1
             
             # Draw coordinates (for debugging)
-            coord_text = self.font_tiny.render(f"({plot['X']},{plot['Y']})", 
-                                              True, COLOR_GRAY)
+            coord_text = self.text_cache.render(self.font_tiny, f"({plot['X']},{plot['Y']})", 
+                                              COLOR_GRAY)
             self.screen.blit(coord_text, (x + 2, y + TILE_SIZE - 15))
+            blits += 1
+        self.profiler.count('blits', blits)
     
     def draw_crop_visual(self, plot, x, y):
-        """Draw crop visual effect"""
+        """Draw crop visual effect; returns whether the crop image was blitted"""
         status = plot['Status']
         crop_name = plot.get('CropName', '').lower()
         
@@ -1040,6 +1276,7 @@ class FarmScene:
             crop_rect = crop_image.get_rect()
             crop_rect.center = (x + TILE_SIZE // 2, y + TILE_SIZE // 2)
             self.screen.blit(crop_image, crop_rect)
+            return True
         else:
             # Fallback to simple graphics
             center_x = x + TILE_SIZE // 2
@@ -1071,31 +1308,25 @@ class FarmScene:
                 pygame.draw.line(self.screen, COLOR_GRAY,
                                (center_x - 8, center_y - 8),
                                (center_x + 8, center_y + 8), 2)
+        return False
     
-    def draw_soil_tile(self, plot, x, y):
-        """Draw soil tile with proper graphics"""
-        status = plot['Status']
-        rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-        
-        # Try to use real soil graphics
-        if status != 'Empty' and 'o' in self.resources.soil_images:
-            # Use the basic soil tile
-            soil_img = self.resources.soil_images['o']
-            scaled_soil = pygame.transform.scale(soil_img, (TILE_SIZE, TILE_SIZE))
-            self.screen.blit(scaled_soil, (x, y))
-            
-            # If watered, add water overlay
-            if plot.get('WaterLevel', 0) > 50:
-                if self.resources.soil_water_images:
-                    # Use animated water overlay
-                    frame_idx = (pygame.time.get_ticks() // 200) % len(self.resources.soil_water_images)
-                    water_img = self.resources.soil_water_images[frame_idx]
-                    scaled_water = pygame.transform.scale(water_img, (TILE_SIZE, TILE_SIZE))
-                    self.screen.blit(scaled_water, (x, y))
-        else:
-            # Fallback to colored rectangles
-            color = PLOT_COLORS.get(status, COLOR_BROWN)
-            pygame.draw.rect(self.screen, color, rect)
+    def get_soil_image(self, variant):
+        """Soil graphic (e.g. 'o', 'lr', 'tbl') scaled to a tile, or None if missing."""
+        if variant not in self.resources.soil_images:
+            return None
+        return self.resources.get_scaled(f'soil/{variant}', TILE_SIZE)
+    
+    def draw_soil_water(self, plot, x, y):
+        """Draw the animated water overlay on watered, tilled soil; returns whether it blitted"""
+        shown = self.soil_layer.shown(plot)
+        if not shown or shown[0] != 'soil':
+            return False
+        if plot.get('WaterLevel', 0) > 50 and self.resources.soil_water_images:
+            frame_idx = (pygame.time.get_ticks() // 200) % len(self.resources.soil_water_images)
+            scaled_water = self.resources.get_scaled(f'soil_water/{frame_idx}', TILE_SIZE)
+            self.screen.blit(scaled_water, (x, y))
+            return True
+        return False
     
     def get_crop_image(self, plot):
         """Get crop image based on plot data"""
@@ -1109,19 +1340,8 @@ class FarmScene:
         if status == 'Withered':
             return None  # No specific image for withered
         
-        growth_stage = 0
-        if status == 'Growing':
-            # Calculate growth progress
-            if plot.get('PlantedAt') and plot.get('GrowthHours'):
-                planted_time = plot['PlantedAt']
-                growth_hours = plot['GrowthHours']
-                now = datetime.utcnow()
-                elapsed = (now - planted_time).total_seconds() / 3600
-                progress = min(1.0, elapsed / growth_hours)
-                # Map progress to stage 0-2 for growing
-                growth_stage = min(2, int(progress * 3))
-        elif status == 'Mature':
-            growth_stage = 3  # Final stage
+        # Stage 0-2 while growing, 3 when mature (kept up to date by the growth engine)
+        growth_stage = max(0, plot.get('GrowthStage', 0))
         
         # Try to get the crop image
         if '鐜夌背' in crop_name or 'corn' in crop_name:
@@ -1134,50 +1354,49 @@ class FarmScene:
         
         return None
     
+    @profiled('ui')
     def draw_ui(self):
         """Draw UI elements"""
         # Top info bar
         panel_height = 80
         panel_rect = pygame.Rect(0, 0, SCREEN_WIDTH, panel_height)
-        panel_surface = pygame.Surface((SCREEN_WIDTH, panel_height))
-        panel_surface.set_alpha(200)
-        panel_surface.fill(COLOR_BLACK)
+        panel_surface = self.text_cache.panel((SCREEN_WIDTH, panel_height), COLOR_BLACK, 200)
         self.screen.blit(panel_surface, (0, 0))
         
         # Player info
         y_pos = 10
-        player_text = self.font_medium.render(
+        player_text = self.text_cache.render(self.font_medium, 
             f"Player: {self.player_data['Name']} (Lv.{self.player_data['Level']})",
-            True, COLOR_WHITE
+            COLOR_WHITE
         )
         self.screen.blit(player_text, (20, y_pos))
         
         # Farm info
-        farm_text = self.font_small.render(
+        farm_text = self.text_cache.render(self.font_small, 
             f"Farm: {self.farm_data['Name']} | Soil Quality: {self.farm_data['SoilQuality']}",
-            True, COLOR_LIGHT_GRAY
+            COLOR_LIGHT_GRAY
         )
         self.screen.blit(farm_text, (20, y_pos + 30))
         
         # Currency info
-        gold_text = self.font_medium.render(
+        gold_text = self.text_cache.render(self.font_medium, 
             f"Gold: {self.player_data['CurrencyGold']:.2f}",
-            True, COLOR_YELLOW
+            COLOR_YELLOW
         )
         gold_rect = gold_text.get_rect(right=SCREEN_WIDTH - 150, y=y_pos)
         self.screen.blit(gold_text, gold_rect)
         
-        gem_text = self.font_medium.render(
+        gem_text = self.text_cache.render(self.font_medium, 
             f"Gem: {self.player_data['CurrencyGem']}",
-            True, COLOR_BLUE
+            COLOR_BLUE
         )
         gem_rect = gem_text.get_rect(right=SCREEN_WIDTH - 20, y=y_pos)
         self.screen.blit(gem_text, gem_rect)
         
         # Shortcut hints
-        shortcuts = self.font_small.render(
+        shortcuts = self.text_cache.render(self.font_small, 
             "[Space]Tool [Ctrl]Seed [I]Inventory [H]Help [Q/E]Tool [Z/X]Seed [ESC]Exit",
-            True, COLOR_LIGHT_GRAY
+            COLOR_LIGHT_GRAY
         )
         shortcuts_rect = shortcuts.get_rect(right=SCREEN_WIDTH - 20, y=y_pos + 35)
         self.screen.blit(shortcuts, shortcuts_rect)
@@ -1188,7 +1407,7 @@ class FarmScene:
             pygame.draw.rect(self.screen, COLOR_BLACK, hint_bg, border_radius=5)
             pygame.draw.rect(self.screen, COLOR_WHITE, hint_bg, 2, border_radius=5)
             
-            hint_text = self.font_small.render(self.interaction_hint, True, COLOR_WHITE)
+            hint_text = self.text_cache.render(self.font_small, self.interaction_hint, COLOR_WHITE)
             hint_rect = hint_text.get_rect(center=hint_bg.center)
             self.screen.blit(hint_text, hint_rect)
         
@@ -1196,15 +1415,18 @@ class FarmScene:
         msg_y = 100
         for msg in self.messages:
             alpha = min(255, int(msg['timer'] * 255))
-            msg_surface = self.font_medium.render(msg['text'], True, COLOR_WHITE)
-            msg_surface.set_alpha(alpha)
+            msg_surface = self.text_cache.render(self.font_medium, msg['text'], COLOR_WHITE)
             
             # Background
             bg_rect = msg_surface.get_rect(center=(SCREEN_WIDTH // 2, msg_y))
             bg_rect.inflate_ip(20, 10)
-            bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-            bg_surface.set_alpha(alpha // 2)
-            bg_surface.fill(COLOR_BLACK)
+            bg_surface = self.text_cache.panel(bg_rect.size, COLOR_BLACK, 127)
+            if alpha < 255:
+                # Fading out: per-frame alpha goes on a copy, cached surfaces stay shared
+                msg_surface = msg_surface.copy()
+                msg_surface.set_alpha(alpha)
+                bg_surface = bg_surface.copy()
+                bg_surface.set_alpha(alpha // 2)
             self.screen.blit(bg_surface, bg_rect)
             
             self.screen.blit(msg_surface, (SCREEN_WIDTH // 2 - msg_surface.get_width() // 2, msg_y))
@@ -1218,9 +1440,7 @@ class FarmScene:
         help_y = 100
         
         # Semi-transparent background
-        help_surface = pygame.Surface((help_width, help_height))
-        help_surface.set_alpha(220)
-        help_surface.fill(COLOR_WHITE)
+        help_surface = self.text_cache.panel((help_width, help_height), COLOR_WHITE, 220)
         self.screen.blit(help_surface, (help_x, help_y))
         
         # Border
@@ -1228,7 +1448,7 @@ class FarmScene:
         pygame.draw.rect(self.screen, COLOR_BLACK, help_rect, 2, border_radius=5)
         
         # Title
-        title = self.font_medium.render("Game Help [H]", True, COLOR_DARK_GREEN)
+        title = self.text_cache.render(self.font_medium, "Game Help [H]", COLOR_DARK_GREEN)
         self.screen.blit(title, (help_x + 20, help_y + 10))
         
         # Help content
@@ -1250,7 +1470,7 @@ class FarmScene:
         y_offset = help_y + 50
         for text in help_texts:
             if text:
-                help_line = self.font_small.render(text, True, COLOR_BLACK)
+                help_line = self.text_cache.render(self.font_small, text, COLOR_BLACK)
                 self.screen.blit(help_line, (help_x + 20, y_offset))
             y_offset += 25
 
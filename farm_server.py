@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Headless multi-farm simulation.
+
+Farm ids are split into shards of SERVER_SHARD_SIZE and handed to a
+multiprocessing pool. Every worker process opens its own database and runs
+farm_sim.FarmSimulation for each farm of a shard: load the plots, advance
+growth, optionally harvest / clear / replant plots, and run the daily tick. No
+window is opened and nothing is drawn.
+
+Each farm runs on its own SimClock, which moves one day forward per daily
+tick (in --steps equal parts), so crops ripen and wither between days. The
+'memory' and 'sqlite' backends read that clock too; SQL Server only knows its
+own clock, so 'mssql' runs are limited to a single day.
+
+    python farm_server.py --farms 5000 --days 3
+    python farm_server.py --farms 5000 --workers 8 --harvest
+    python farm_server.py --backend sqlite --farms 2000 --seed-db
+
+Backends: 'memory' seeds the same demo farms in every worker (benchmarks),
+'sqlite' shares SQLITE_DB_PATH between the workers and 'mssql' uses the
+configured server.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from config import (DEMO_PLOT_COLUMNS, DEMO_PLOT_ROWS, GROWTH_TICK_INTERVAL, SERVER_SHARD_SIZE,
+                    SERVER_WORKERS)
+from farm_sim import FarmSimulation
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+DAY_SECONDS = 24 * 3600
+_EPOCH = datetime(1970, 1, 1)
+
+
+class SimClock:
+    """Simulated epoch seconds of one farm; only moves when advanced."""
+
+    def __init__(self, start: float):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+    def utcnow(self) -> datetime:
+        """Same time as a naive UTC datetime (database clocks)"""
+        return _EPOCH + timedelta(seconds=self.now)
+
+
+def open_database(backend, farm_count=1, columns=DEMO_PLOT_COLUMNS, rows=DEMO_PLOT_ROWS, seed=1):
+    """Connected database for a worker ('memory' is seeded with ``farm_count`` demo farms)"""
+    if backend == 'memory':
+        from memory_database import MemoryDatabase
+        return MemoryDatabase().seed_demo_data(columns, rows, seed, farm_count)
+    from database import create_database
+    db = create_database(backend)
+    if not db.connect():
+        raise RuntimeError(f"Cannot connect to the {backend} database")
+    return db
+
+
+def simulate_farm(db, farm_id, days=1, steps=1, harvest=False, seed=1, catalog=None,
+                  sim_start=None):
+    """Run one farm for ``days`` daily ticks; returns its FarmSimulation (None if missing).
+
+    ``catalog`` is (item rows, crop variety rows); queried when not given. With
+    ``sim_start`` (epoch seconds) the farm and the database run on a SimClock
+    that advances DAY_SECONDS / steps after every growth step (and harvest);
+    without it they use the real clock.
+    """
+    farm = db.get_farm_by_id(farm_id)
+    if not farm:
+        return None
+    clock = SimClock(sim_start) if sim_start is not None else None
+    if clock:
+        db.clock = clock.utcnow
+    sim = FarmSimulation(db, {'PlayerId': farm['PlayerId']}, farm,
+                         random.Random(seed * 1000003 + farm_id), clock or time.time)
+    sim.load_catalog(*(catalog or ()))
+    sim.load_plots()
+    for _ in range(days):
+        for _ in range(steps):
+            sim.tick(GROWTH_TICK_INTERVAL)
+            if harvest:
+                harvest_farm(sim)
+            if clock:
+                clock.advance(DAY_SECONDS / steps)
+        sim.start_new_day()
+    return sim
+
+
+def harvest_farm(sim):
+    """Harvest every mature plot, clear every withered one and replant the empty ones"""
+    for plot in list(sim.plots):
+        if plot['Status'] == 'Mature':
+            variety = sim.crop_varieties.get(plot['CropVarietyId'])
+            if variety:
+                sim.harvest(plot, variety)
+        elif plot['Status'] == 'Withered':
+            sim.clear(plot['PlotId'])
+    replant_farm(sim)
+
+
+def replant_farm(sim):
+    """Plant a random variety on every empty plot while the farm has seeds for it"""
+    seeds = {row['ItemId']: row['Quantity'] for row in sim.db.get_farm_inventory(sim.farm_id)
+             if row['ItemType'] == 'Seed'}
+    for plot in list(sim.plots):
+        if plot['Status'] != 'Empty':
+            continue
+        varieties = [variety for variety in sim.crop_varieties.values()
+                     if seeds.get(variety['SeedItemId'], 0) > 0]
+        if not varieties:
+            return
+        variety = sim.rng.choice(varieties)
+        seed_id = variety['SeedItemId']
+        if not sim.change_inventory(seed_id, -1):
+            continue
+        if sim.plant(plot['PlotId'], variety):
+            seeds[seed_id] -= 1
+        else:
+            sim.change_inventory(seed_id, 1)
+
+
+def _init_worker(backend, farm_count, columns, rows, seed):
+    db = open_database(backend, farm_count, columns, rows, seed)
+    _worker['db'] = db
+    # Catalog rows are the same for every farm: query them once per worker
+    _worker['catalog'] = (db.get_all_items(), db.get_all_crop_varieties())
+
+
+def _run_shard(job):
+    """Simulate one shard of farm ids in a worker; returns its counters"""
+    farm_ids, days, steps, harvest, seed, sim_start = job
+    db = _worker['db']
+    start = time.perf_counter()
+    farms = missing = 0
+    delta = Counter()
+    for farm_id in farm_ids:
+        sim = simulate_farm(db, farm_id, days, steps, harvest, seed, _worker['catalog'],
+                            sim_start)
+        if sim is None:
+            missing += 1
+            continue
+        farms += 1
+        delta.update(sim.inventory_delta)
+    write_queue = getattr(db, 'write_queue', None)
+    if write_queue:
+        write_queue.flush()
+    return {
+        'worker': os.getpid(),
+        'farms': farms,
+        'missing': missing,
+        'seconds': time.perf_counter() - start,
+        'inventory_delta': dict(delta),
+    }
+
+
+def shard(farm_ids, size):
+    return [farm_ids[i:i + size] for i in range(0, len(farm_ids), size)]
+
+
+def run(farms=1000, workers=SERVER_WORKERS, days=1, steps=1, harvest=False, backend='memory',
+        columns=DEMO_PLOT_COLUMNS, rows=DEMO_PLOT_ROWS, seed=1, shard_size=SERVER_SHARD_SIZE,
+        seed_db=False):
+    """Simulate farms 1..farms on a process pool; returns a throughput report."""
+    if backend == 'mssql' and days > 1:
+        raise ValueError("SQL Server runs on its own clock: only one day can be simulated")
+    if seed_db and backend == 'sqlite':
+        db = open_database(backend)
+        db.seed_demo_data(columns, rows, seed, farms)
+        db.disconnect()
+
+    # Every farm starts at the same simulated instant (SQL Server keeps real time)
+    sim_start = None if backend == 'mssql' else time.time()
+    jobs = [(ids, days, steps, harvest, seed, sim_start)
+            for ids in shard(list(range(1, farms + 1)), shard_size)]
+    per_worker = defaultdict(lambda: {'farms': 0, 'seconds': 0.0, 'shards': 0})
+    delta = Counter()
+    missing = 0
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, _init_worker,
+                              (backend, farms, columns, rows, seed)) as pool:
+        for result in pool.imap_unordered(_run_shard, jobs):
+            stats = per_worker[result['worker']]
+            stats['farms'] += result['farms']
+            stats['seconds'] += result['seconds']
+            stats['shards'] += 1
+            missing += result['missing']
+            delta.update(result['inventory_delta'])
+    wall = time.perf_counter() - start
+
+    simulated = sum(stats['farms'] for stats in per_worker.values())
+    return {
+        'backend': backend,
+        'workers': workers,
+        'farms': simulated,
+        'missing': missing,
+        'days': days,
+        'wall_seconds': wall,
+        'farms_per_second': simulated / wall if wall else 0.0,
+        'farm_days_per_second': simulated * days / wall if wall else 0.0,
+        'per_worker': {
+            pid: dict(stats, farms_per_second=stats['farms'] / stats['seconds']
+                      if stats['seconds'] else 0.0)
+            for pid, stats in sorted(per_worker.items())
+        },
+        'inventory_delta': dict(sorted(delta.items())),
+    }
+
+
+def print_report(report):
+    print(f"Backend: {report['backend']}  Workers: {report['workers']}  "
+          f"Farms: {report['farms']} (missing {report['missing']})  Days: {report['days']}")
+    print(f"Wall: {report['wall_seconds']:.2f} s (including worker startup)  "
+          f"{report['farms_per_second']:.0f} farms/s  "
+          f"{report['farm_days_per_second']:.0f} farm-days/s")
+    # Per worker: time spent inside shards, so setup and idle waiting are excluded
+    print(f"{'worker':<10}{'shards':>8}{'farms':>10}{'busy s':>10}{'farms/s':>10}")
+    for pid, stats in report['per_worker'].items():
+        print(f"{pid:<10}{stats['shards']:>8}{stats['farms']:>10}"
+              f"{stats['seconds']:>10.2f}{stats['farms_per_second']:>10.0f}")
+    if report['inventory_delta']:
+        print("Inventory delta: " + "  ".join(f"item {item_id}: {quantity:+d}"
+                                              for item_id, quantity in report['inventory_delta'].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless multi-farm simulation on a process pool")
+    parser.add_argument('--farms', type=int, default=1000, help="simulate farm ids 1..N")
+    parser.add_argument('--workers', type=int, default=SERVER_WORKERS, help="worker processes")
+    parser.add_argument('--days', type=int, default=1, help="daily ticks per farm")
+    parser.add_argument('--steps', type=int, default=1,
+                        help="growth steps (and harvests) per simulated day")
+    parser.add_argument('--harvest', action='store_true',
+                        help="harvest mature, clear withered and replant empty plots after every growth step")
+    parser.add_argument('--backend', choices=['memory', 'sqlite', 'mssql'], default='memory',
+                        help="database every worker opens")
+    parser.add_argument('--columns', type=int, default=DEMO_PLOT_COLUMNS, help="plot columns of demo farms")
+    parser.add_argument('--rows', type=int, default=DEMO_PLOT_ROWS, help="plot rows of demo farms")
+    parser.add_argument('--seed', type=int, default=1, help="seed for demo farms and rain")
+    parser.add_argument('--shard-size', type=int, default=SERVER_SHARD_SIZE,
+                        help="farms per pool job")
+    parser.add_argument('--seed-db', action='store_true',
+                        help="fill the sqlite database with the demo farms first")
+    parser.add_argument('--json', metavar='PATH', help="also write the report as JSON")
+    args = parser.parse_args(argv)
+    if args.backend == 'mssql' and args.days > 1:
+        parser.error("--backend mssql runs on the server's clock: only --days 1 can be simulated")
+
+    report = run(args.farms, args.workers, args.days, args.steps, args.harvest, args.backend,
+                 args.columns, args.rows, args.seed, args.shard_size, args.seed_db)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Render-free farm simulation: plots, crop growth, trees, inventory deltas and
+the daily tick, on top of the Database API.
+
+FarmScene drives one FarmSimulation and only adds input, messages and
+drawing; farm_server.py runs thousands of them headless. Nothing here
+imports pygame.
+"""
+from __future__ import annotations
+
+import json
+import random
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import APPLE_SPAWN_CHANCE, GROWTH_TICK_INTERVAL, RAIN_CHANCE, RAIN_WATER_DELTA
+from growth_engine import GrowthEngine, GrowthEvent
+
+# Catalog names (lower case) tried for items that trees drop
+TREE_ITEM_NAMES = {
+    'apple': ['apple', '鑻规灉'],
+    'wood': ['wood', '鏈ㄦ潗'],
+}
+TREE_HEALTH = 5
+
+
+class TreeState:
+    """Health and remaining apples (indices of the tree's apple slots) of one tree."""
+
+    def __init__(self, slots: int, rng: random.Random, health: int = TREE_HEALTH):
+        self.health = health
+        self.alive = True
+        self.apples = [slot for slot in range(slots) if rng.random() < APPLE_SPAWN_CHANCE]
+
+    def chop(self, rng: random.Random) -> Tuple[Optional[int], bool]:
+        """One axe hit: returns (slot of the apple that fell or None, whether it was felled)"""
+        if not self.alive:
+            return None, False
+        self.health -= 1
+        slot = None
+        if self.apples:
+            slot = rng.choice(self.apples)
+            self.apples.remove(slot)
+        felled = self.health <= 0
+        if felled:
+            self.alive = False
+            self.apples.clear()
+        return slot, felled
+
+
+class FarmSimulation:
+    """Simulation state of one farm; every change goes through the database."""
+
+    def __init__(self, db, player_data: dict, farm_data: dict,
+                 rng: Optional[random.Random] = None, clock: Callable[[], float] = time.time):
+        self.db = db
+        self.player_data = player_data
+        self.farm_data = farm_data
+        self.farm_id = farm_data['FarmId']
+        # Rain and apples; seeded for replays and reproducible server runs
+        self.rng = rng if rng is not None else random.Random()
+        # Epoch seconds crop growth is measured against
+        self.clock = clock
+        self.plots: List[dict] = []
+        self.plots_by_id: Dict[int, dict] = {}
+        self.growth = GrowthEngine()
+        self.growth_timer = 0.0
+        self.day_counter = 1
+        self.trees: List[TreeState] = []
+        self.item_catalog: Dict[str, dict] = {}      # lower-case name -> item row
+        self.crop_varieties: Dict[int, dict] = {}    # CropVarietyId -> variety row
+        # Net item quantities this simulation added to / took from the inventory
+        self.inventory_delta: Counter = Counter()
+        # Called with each plot whose row, status or stage changed (scene redraws it)
+        self.plot_changed: Optional[Callable[[dict], None]] = None
+
+    # ==================== Catalog ====================
+
+    def load_catalog(self, items=None, varieties=None):
+        """Item catalog and crop varieties (queried when not given)"""
+        if items is None:
+            items = self.db.get_all_items()
+        if varieties is None:
+            varieties = self.db.get_all_crop_varieties()
+        self.item_catalog = {item['Name'].lower(): item for item in items}
+        self.crop_varieties = {cv['CropVarietyId']: cv for cv in varieties}
+
+    def find_item(self, names) -> Optional[dict]:
+        """First catalog item matching one of ``names``"""
+        if not isinstance(names, (list, tuple)):
+            names = [names]
+        for name in names:
+            item = self.item_catalog.get(name.lower())
+            if item:
+                return item
+        return None
+
+    # ==================== Plots and Growth ====================
+
+    def load_plots(self, plots=None) -> List[dict]:
+        """Full resync (start and day change); plots are queried when not given"""
+        if plots is None:
+            plots = self.db.get_farm_plots(self.farm_id)
+        self.plots = plots
+        self.plots_by_id = {plot['PlotId']: plot for plot in self.plots}
+        self.growth.load(self.plots)
+        # The caller re-places every plot after a full load: no per-plot notifications
+        self.apply_growth_events(self.growth.step(self.clock()), notify=False)
+        return self.plots
+
+    def refresh_plot(self, plot_id) -> Optional[dict]:
+        """Re-fetch a single plot and patch it in place."""
+        row = self.db.get_plot(plot_id)
+        plot = self.plots_by_id.get(plot_id)
+        if not row:
+            return plot
+        if plot is None:
+            # Plot was added since the last full load
+            self.plots.append(row)
+            self.plots_by_id[plot_id] = row
+            plot = row
+        else:
+            # Update the existing dict so references (selected_plot, indexes) stay valid
+            plot.update(row)
+        self._changed(plot)
+        self.growth.update_plot(plot)
+        self.apply_growth_events(self.growth.step(self.clock()))
+        return plot
+
+    def apply_growth_events(self, events: List[GrowthEvent], notify: bool = True):
+        """Copy status / stage changes from the growth engine onto plot dicts."""
+        for event in events:
+            plot = self.plots_by_id.get(event.plot_id)
+            if not plot:
+                continue
+            plot['Status'] = event.new_status
+            plot['GrowthStage'] = event.new_stage
+            if notify:
+                self._changed(plot)
+
+    def tick(self, dt: float):
+        """Advance dt seconds: crops grow in steps of GROWTH_TICK_INTERVAL"""
+        self.growth_timer += dt
+        if self.growth_timer >= GROWTH_TICK_INTERVAL:
+            self.growth_timer = 0.0
+            self.apply_growth_events(self.growth.step(self.clock()))
+
+    def start_new_day(self) -> bool:
+        """Overnight rain and crop status in one server-side batch; returns whether it rained"""
+        raining = self.rng.random() < RAIN_CHANCE
+        rain_delta = RAIN_WATER_DELTA if raining else 0
+        plots = self.db.apply_daily_tick(self.farm_id, rain_delta)
+        self.day_counter += 1
+        self.load_plots(plots)
+        return raining
+
+    def _changed(self, plot: dict):
+        if self.plot_changed:
+            self.plot_changed(plot)
+
+    # ==================== Actions ====================
+
+    def set_levels(self, plot: dict, water_level=None, fertilizer_level=None) -> bool:
+        """Queue a soil moisture / fertilizer change and mirror it locally"""
+        if not self.db.queue_plot_levels(plot['PlotId'], water_level=water_level,
+                                         fertilizer_level=fertilizer_level):
+            return False
+        if water_level is not None:
+            plot['WaterLevel'] = water_level
+        if fertilizer_level is not None:
+            plot['FertilizerLevel'] = fertilizer_level
+        self.growth.set_levels(plot['PlotId'], water_level, fertilizer_level)
+        return True
+
+    def change_inventory(self, item_id, quantity) -> bool:
+        """Queue an inventory change and count it in inventory_delta"""
+        if not self.db.queue_inventory_change(self.farm_id, item_id, quantity):
+            return False
+        self.inventory_delta[item_id] += quantity
+        return True
+
+    def log_action(self, action: str, **meta):
+        self.db.queue_action_log(self.player_data['PlayerId'], self.farm_id, action,
+                                 json.dumps(meta, ensure_ascii=False))
+
+    # plant / harvest / clear stay synchronous on purpose (unlike the queued
+    # levels, inventory and logs): the UPDATE is conditional on the server's
+    # plot state and clock, so its result decides the outcome shown to the
+    # player and whether produce is granted, and get_plot re-reads the row the
+    # next click is checked against. They are a single click each, not per frame.
+
+    def plant(self, plot_id, variety: dict) -> bool:
+        """Plant ``variety`` (its seed must already be taken from the inventory)"""
+        if not self.db.plant_crop(plot_id, variety['CropVarietyId']):
+            # The server rejected it (plot no longer empty): pick up its real state
+            self.refresh_plot(plot_id)
+            return False
+        self.log_action('Plant', PlotId=plot_id, CropVarietyId=variety['CropVarietyId'])
+        self.refresh_plot(plot_id)
+        return True
+
+    def harvest_yield(self, plot: dict, variety: dict) -> int:
+        """Produce for a harvest (base yield scaled by soil quality, water and fertilizer)"""
+        soil_quality = self.farm_data['SoilQuality']
+        amount = int(variety['BaseYield'] * (1 + soil_quality / 200.0 +
+                                             plot['WaterLevel'] / 200.0 +
+                                             plot['FertilizerLevel'] / 100.0))
+        return max(1, amount)
+
+    def harvest(self, plot: dict, variety: dict) -> Optional[int]:
+        """Harvest a plot; returns the produce added to the inventory (None if it failed)"""
+        amount = self.harvest_yield(plot, variety)
+        # Produce is only granted once the server actually cleared the plot; a
+        # rejected harvest (not ripe by server time, already harvested) re-syncs it
+        if not self.db.harvest_plot(plot['PlotId']):
+            self.refresh_plot(plot['PlotId'])
+            return None
+        self.change_inventory(variety['ProduceItemId'], amount)
+        self.log_action('Harvest', PlotId=plot['PlotId'], Yield=amount)
+        self.refresh_plot(plot['PlotId'])
+        return amount
+
+    def clear(self, plot_id) -> bool:
+        """Reset a (withered) plot to empty"""
+        if not self.db.reset_plot(plot_id):
+            return False
+        self.refresh_plot(plot_id)
+        return True
+
+    # ==================== Trees ====================
+
+    def add_tree(self, slots: int) -> TreeState:
+        """Track a tree with ``slots`` apple positions"""
+        tree = TreeState(slots, self.rng)
+        self.trees.append(tree)
+        return tree
+
+    def collect(self, tag: str) -> Optional[dict]:
+        """Put one tree drop ('apple' / 'wood') into the inventory; returns its item"""
+        item = self.find_item(TREE_ITEM_NAMES.get(tag.lower(), [tag]))
+        if item and self.change_inventory(item['ItemId'], 1):
+            return item
+        return None
+
+    def chop(self, tree: TreeState) -> List[str]:
+        """One axe hit on a tree without a sprite; returns the drops collected"""
+        slot, felled = tree.chop(self.rng)
+        drops = (['apple'] if slot is not None else []) + (['wood'] if felled else [])
+        return [tag for tag in drops if self.collect(tag)]
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed-timestep simulation clock.
+
+The game simulates in steps of exactly 1 / SIM_TICK_RATE seconds however
+often it renders. Each rendered frame adds its duration to an accumulator
+and runs as many whole ticks as fit; the remainder, as a fraction of a tick
+(``alpha``), lets drawing interpolate between the last two simulated states.
+Rendering can then be capped lower (weak hardware) or run higher than the
+simulation without changing gameplay speed, and headless runs can feed
+simulated frame times to step faster than real time.
+"""
+from __future__ import annotations
+
+from config import SIM_MAX_FRAME_TIME, SIM_TICK_RATE
+
+
+class FixedTimestep:
+    """Accumulator turning variable frame times into fixed simulation ticks."""
+
+    def __init__(self, tick_rate: float = SIM_TICK_RATE,
+                 max_frame_time: float = SIM_MAX_FRAME_TIME):
+        self.dt = 1.0 / tick_rate
+        # A frame longer than this (debugger, window drag, load hitch) is cut
+        # short so the simulation never falls into catching up forever
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.ticks = 0           # ticks run since creation
+        self.dropped_time = 0.0  # frame time discarded by the clamp
+
+    @property
+    def sim_time(self) -> float:
+        """Simulated seconds so far"""
+        return self.ticks * self.dt
+
+    @property
+    def alpha(self) -> float:
+        """How far (0..1) rendering is between the previous and the latest tick"""
+        return min(1.0, self.accumulator / self.dt)
+
+    def advance(self, frame_time: float) -> int:
+        """Add ``frame_time`` seconds; returns how many ticks to run now."""
+        if frame_time > self.max_frame_time:
+            self.dropped_time += frame_time - self.max_frame_time
+            frame_time = self.max_frame_time
+        self.accumulator += max(0.0, frame_time)
+        ticks = int(self.accumulator // self.dt)
+        self.accumulator -= ticks * self.dt
+        if self.accumulator < 0.0:
+            self.accumulator = 0.0
+        self.ticks += ticks
+        return ticks
+
+    def reset(self):
+        """Forget the leftover time (after a scene switch or long load)"""
+        self.accumulator = 0.0
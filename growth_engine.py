@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized crop growth engine: keeps plot growth state in NumPy arrays and
+advances every plot in one step.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError as exc:
+    raise ImportError(
+        "numpy is required for the crop growth engine. Install it with 'pip install numpy'."
+    ) from exc
+
+from config import CROP_WITHER_FACTOR
+
+STATUS_CODES = {'Empty': 0, 'Growing': 1, 'Mature': 2, 'Withered': 3}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# Number of visual stages while Growing; Mature uses the stage after them.
+GROWING_STAGES = 3
+MATURE_STAGE = GROWING_STAGES
+NO_STAGE = -1
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass
+class GrowthEvent:
+    """A plot whose status or visual stage changed during a step."""
+
+    plot_id: int
+    old_status: str
+    new_status: str
+    old_stage: int
+    new_stage: int
+
+
+def _to_timestamp(value) -> float:
+    """Convert a naive-UTC datetime (as returned by SQL Server) to epoch seconds."""
+    if value is None:
+        return np.nan
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            return value.timestamp()
+        return (value - _EPOCH).total_seconds()
+    return float(value)
+
+
+class GrowthEngine:
+    """Holds per-plot growth state as parallel arrays indexed by row."""
+
+    def __init__(self, wither_factor: float = CROP_WITHER_FACTOR):
+        self.wither_factor = wither_factor
+        self.row_of: Dict[int, int] = {}
+        self._allocate(0)
+
+    def _allocate(self, size: int):
+        self.plot_ids = np.zeros(size, dtype=np.int64)
+        self.planted_at = np.full(size, np.nan, dtype=np.float64)
+        self.growth_hours = np.zeros(size, dtype=np.float64)
+        self.water = np.zeros(size, dtype=np.float32)
+        self.fertilizer = np.zeros(size, dtype=np.float32)
+        self.status = np.zeros(size, dtype=np.int8)
+        self.stage = np.full(size, NO_STAGE, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.plot_ids)
+
+    def load(self, plots: Iterable[dict]):
+        """Rebuild all arrays from plot rows (full resync)."""
+        plots = list(plots)
+        self._allocate(len(plots))
+        self.row_of = {}
+        for row, plot in enumerate(plots):
+            self.row_of[plot['PlotId']] = row
+            self._write_row(row, plot)
+
+    def update_plot(self, plot: dict):
+        """Patch one plot's row; appends it if the plot is new."""
+        row = self.row_of.get(plot['PlotId'])
+        if row is None:
+            row = len(self.plot_ids)
+            self.row_of[plot['PlotId']] = row
+            for name in ('plot_ids', 'planted_at', 'growth_hours', 'water',
+                         'fertilizer', 'status', 'stage'):
+                array = getattr(self, name)
+                fill = NO_STAGE if name == 'stage' else (np.nan if name == 'planted_at' else 0)
+                setattr(self, name, np.append(array, np.array([fill], dtype=array.dtype)))
+        self._write_row(row, plot)
+        # Force the next step to report this plot's stage
+        self.stage[row] = NO_STAGE
+
+    def _write_row(self, row: int, plot: dict):
+        self.plot_ids[row] = plot['PlotId']
+        self.planted_at[row] = _to_timestamp(plot.get('PlantedAt'))
+        self.growth_hours[row] = plot.get('GrowthHours') or 0
+        self.water[row] = plot.get('WaterLevel') or 0
+        self.fertilizer[row] = plot.get('FertilizerLevel') or 0
+        self.status[row] = STATUS_CODES.get(plot.get('Status'), 0)
+
+    def set_levels(self, plot_id: int, water_level=None, fertilizer_level=None):
+        """Mirror a soil level change made by the scene."""
+        row = self.row_of.get(plot_id)
+        if row is None:
+            return
+        if water_level is not None:
+            self.water[row] = water_level
+        if fertilizer_level is not None:
+            self.fertilizer[row] = fertilizer_level
+
+    def step(self, now: Optional[float] = None) -> List[GrowthEvent]:
+        """Advance every plot to ``now`` (epoch seconds) and return what changed."""
+        if not len(self.plot_ids):
+            return []
+        if now is None:
+            now = time.time()
+
+        growth_secs = self.growth_hours * 3600.0
+        timed = (~np.isnan(self.planted_at)) & (growth_secs > 0)
+        elapsed = np.where(timed, now - np.nan_to_num(self.planted_at), 0.0)
+        progress = np.zeros_like(elapsed)
+        np.divide(elapsed, growth_secs, out=progress, where=timed)
+
+        growing = STATUS_CODES['Growing']
+        mature = STATUS_CODES['Mature']
+        withered = STATUS_CODES['Withered']
+
+        new_status = self.status.copy()
+        ripe = timed & (self.status == growing) & (progress >= 1.0)
+        new_status[ripe] = mature
+        rotten = timed & np.isin(new_status, (growing, mature)) & (progress >= self.wither_factor)
+        new_status[rotten] = withered
+
+        new_stage = np.full_like(self.stage, NO_STAGE)
+        is_growing = new_status == growing
+        growing_stage = np.clip((progress * GROWING_STAGES).astype(np.int64), 0, GROWING_STAGES - 1)
+        new_stage[is_growing] = growing_stage[is_growing]
+        new_stage[new_status == mature] = MATURE_STAGE
+
+        changed = np.flatnonzero((new_status != self.status) | (new_stage != self.stage))
+        events = [
+            GrowthEvent(
+                int(self.plot_ids[row]),
+                STATUS_NAMES[int(self.status[row])],
+                STATUS_NAMES[int(new_status[row])],
+                int(self.stage[row]),
+                int(new_stage[row]),
+            )
+            for row in changed
+        ]
+        self.status = new_status
+        self.stage = new_stage
+        return events
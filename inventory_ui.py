@@ -4,6 +4,7 @@ Inventory UI System
 """
 import pygame
 from config import *
+from text_cache import get_text_cache
 
 
 def get_font(size):
@@ -25,10 +26,12 @@ class InventoryUI:
         self.is_visible = False
         self.farm_id = None
         self.inventory_items = []
+        self.pending_items = None  # Future of an in-flight reload (see poll_inventory)
         
         self.font_large = get_font(FONT_SIZE_LARGE)
         self.font_medium = get_font(FONT_SIZE_MEDIUM)
         self.font_small = get_font(FONT_SIZE_SMALL)
+        self.text_cache = get_text_cache()
         
         # UI position and size
         self.panel_width = 600
@@ -56,14 +59,31 @@ class InventoryUI:
             self.farm_id = farm_id
             self.load_inventory()
     
+    def refresh(self):
+        """Reload inventory only while the panel is open"""
+        if self.is_visible:
+            self.load_inventory()
+    
     def load_inventory(self):
-        """Load inventory data"""
+        """Start loading inventory data in the background"""
         if self.farm_id:
-            self.inventory_items = self.db.get_farm_inventory(self.farm_id)
-            self.scroll_offset = 0
-            # Calculate max scroll distance
-            items_height = len(self.inventory_items) * 60 + 20
-            self.max_scroll = max(0, items_height - (self.panel_height - 100))
+            self.pending_items = self.db.submit(self.db.get_farm_inventory, self.farm_id)
+    
+    def poll_inventory(self):
+        """Apply a finished reload without waiting for one still in flight"""
+        future = self.pending_items
+        if future is None or not future.done():
+            return
+        self.pending_items = None
+        try:
+            self.inventory_items = future.result()
+        except Exception as e:
+            print(f"Inventory load error: {e}")
+            return
+        self.scroll_offset = 0
+        # Calculate max scroll distance
+        items_height = len(self.inventory_items) * 60 + 20
+        self.max_scroll = max(0, items_height - (self.panel_height - 100))
     
     def handle_event(self, event):
         """Handle event"""
@@ -95,11 +115,10 @@ class InventoryUI:
         """Draw inventory interface"""
         if not self.is_visible:
             return
+        self.poll_inventory()
         
         # Semi-transparent background overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill(COLOR_BLACK)
+        overlay = self.text_cache.panel((SCREEN_WIDTH, SCREEN_HEIGHT), COLOR_BLACK, 150)
         self.screen.blit(overlay, (0, 0))
         
         # Inventory panel
@@ -109,12 +128,12 @@ class InventoryUI:
         pygame.draw.rect(self.screen, COLOR_BLACK, panel_rect, 3, border_radius=10)
         
         # Title
-        title_text = self.font_large.render("Inventory", True, COLOR_DARK_GREEN)
+        title_text = self.text_cache.render(self.font_large, "Inventory", COLOR_DARK_GREEN)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, self.panel_y + 30))
         self.screen.blit(title_text, title_rect)
         
         # Close hint
-        close_text = self.font_small.render("[I] or [ESC] to Close", True, COLOR_GRAY)
+        close_text = self.text_cache.render(self.font_small, "[I] or [ESC] to Close", COLOR_GRAY)
         self.screen.blit(close_text, (self.panel_x + self.panel_width - 150, self.panel_y + 10))
         
         # Separator line
@@ -128,7 +147,8 @@ class InventoryUI:
         
         # Draw item list
         if not self.inventory_items:
-            empty_text = self.font_medium.render("Inventory is empty", True, COLOR_GRAY)
+            empty_message = "Loading..." if self.pending_items else "Inventory is empty"
+            empty_text = self.text_cache.render(self.font_medium, empty_message, COLOR_GRAY)
             empty_rect = empty_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             self.screen.blit(empty_text, empty_rect)
         else:
@@ -166,25 +186,25 @@ class InventoryUI:
                     'Tool': 'T',
                     'Misc': 'X'
                 }.get(item['ItemType'], '?')
-                type_text = self.font_small.render(type_abbr, True, COLOR_WHITE)
+                type_text = self.text_cache.render(self.font_small, type_abbr, COLOR_WHITE)
                 type_text_rect = type_text.get_rect(center=type_rect.center)
                 self.screen.blit(type_text, type_text_rect)
                 
                 # Item name
-                name_text = self.font_medium.render(item['Name'], True, COLOR_BLACK)
+                name_text = self.text_cache.render(self.font_medium, item['Name'], COLOR_BLACK)
                 self.screen.blit(name_text, (self.panel_x + 85, item_y + 8))
                 
                 # Item quantity
-                quantity_text = self.font_small.render(
+                quantity_text = self.text_cache.render(self.font_small, 
                     f"x{item['Quantity']}", 
-                    True, COLOR_DARK_GREEN
+                    COLOR_DARK_GREEN
                 )
                 self.screen.blit(quantity_text, (self.panel_x + 85, item_y + 28))
                 
                 # Item price
-                price_text = self.font_small.render(
+                price_text = self.text_cache.render(self.font_small, 
                     f"Price: {item['BasePrice']:.2f}", 
-                    True, COLOR_BLUE
+                    COLOR_BLUE
                 )
                 price_rect = price_text.get_rect(right=self.panel_x + self.panel_width - 50, 
                                                  centery=item_y + 25)
@@ -210,9 +230,9 @@ class InventoryUI:
         total_items = sum(item['Quantity'] for item in self.inventory_items)
         total_value = sum(item['Quantity'] * item['BasePrice'] for item in self.inventory_items)
         
-        stats_text = self.font_small.render(
+        stats_text = self.text_cache.render(self.font_small, 
             f"Types: {len(self.inventory_items)} | Total: {total_items} | Value: {total_value:.2f}",
-            True, COLOR_GRAY
+            COLOR_GRAY
         )
         stats_rect = stats_text.get_rect(center=(SCREEN_WIDTH // 2, 
                                                   self.panel_y + self.panel_height - 15))
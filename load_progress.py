@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Weighted stage progress for scene loading.
+
+The loader thread marks stages as started/finished (stages may overlap and
+run on other threads); the loading screen reads ``fraction()``, ``active()``
+and per-stage timings from the main thread.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class LoadProgress:
+    """Thread-safe tracker of named, weighted loading stages."""
+
+    def __init__(self, stages: Dict[str, float], parallel: Optional[bool] = None):
+        self.weights = dict(stages)
+        # With a single core a CPU-bound stage on a second thread only adds GIL contention
+        self.parallel = (os.cpu_count() or 1) > 1 if parallel is None else parallel
+        self.total = float(sum(self.weights.values())) or 1.0
+        self.lock = threading.Lock()
+        self.started: Dict[str, float] = {}
+        self.timings: Dict[str, float] = {}
+        self.start_time = time.perf_counter()
+        self.finish_time: Optional[float] = None
+
+    # ==================== Loader Side ====================
+
+    def begin(self, name: str):
+        with self.lock:
+            self.started.setdefault(name, time.perf_counter())
+
+    def end(self, name: str):
+        with self.lock:
+            start = self.started.setdefault(name, time.perf_counter())
+            self.timings.setdefault(name, time.perf_counter() - start)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as stage ``name``."""
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def track(self, name: str, futures: Iterable[Future]):
+        """Stage ``name`` runs until every future in ``futures`` is done."""
+        futures = list(futures)
+        self.begin(name)
+        remaining = [len(futures)]
+        counter_lock = threading.Lock()
+
+        def on_done(_future):
+            with counter_lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                self.end(name)
+
+        if not futures:
+            self.end(name)
+        for future in futures:
+            future.add_done_callback(on_done)
+
+    def run_async(self, name: str, func: Callable, *args, **kwargs) -> Future:
+        """Run ``func`` as stage ``name`` on its own thread and return a Future.
+
+        Without :attr:`parallel` the stage runs right away on the calling thread.
+        """
+        future: Future = Future()
+
+        def worker():
+            with self.stage(name):
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except BaseException as exc:
+                    future.set_exception(exc)
+
+        self.begin(name)
+        if self.parallel:
+            threading.Thread(target=worker, name=f"load-{name}", daemon=True).start()
+        else:
+            worker()
+        return future
+
+    def finish(self):
+        """Mark loading complete (time-to-playable stops here)."""
+        with self.lock:
+            if self.finish_time is None:
+                self.finish_time = time.perf_counter()
+
+    # ==================== Loading Screen Side ====================
+
+    def fraction(self) -> float:
+        """Share of the total stage weight that has finished (0..1)."""
+        with self.lock:
+            if self.finish_time is not None:
+                return 1.0
+            done = sum(self.weights.get(name, 0.0) for name in self.timings)
+        return min(1.0, done / self.total)
+
+    def active(self) -> List[str]:
+        """Stages that have started but not finished, in start order."""
+        with self.lock:
+            running = [name for name in self.started if name not in self.timings]
+        return sorted(running, key=self.started.get)
+
+    def elapsed(self) -> float:
+        """Seconds since loading began (frozen once finished)."""
+        end = self.finish_time if self.finish_time is not None else time.perf_counter()
+        return end - self.start_time
+
+    def summary(self) -> str:
+        """One line of per-stage timings, e.g. ``map 131ms | database 3ms (total 140ms)``."""
+        with self.lock:
+            parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in
+                     sorted(self.timings.items(), key=lambda item: -item[1])]
+        return f"{' | '.join(parts)} (total {self.elapsed() * 1000:.0f}ms)"
@@ -5,6 +5,9 @@ Login Scene - Player Selection with Navigation
 import pygame
 import os
 from config import *
+from asset_cache import get_asset_cache
+from text_cache import get_text_cache
+from player_directory import PlayerDirectory
 
 
 def get_font(size):
@@ -27,6 +30,7 @@ class Button:
         self.hover_color = BUTTON_HOVER_COLOR
         self.text_color = BUTTON_TEXT_COLOR
         self.font = get_font(font_size)
+        self.text_cache = get_text_cache()
         self.is_hovered = False
         
         # Load custom image if provided
@@ -47,7 +51,7 @@ class Button:
         if os.path.exists(full_path):
             try:
                 # Load original image
-                original_image = pygame.image.load(full_path).convert_alpha()
+                original_image = get_asset_cache().load(full_path)
                 # Scale to button size
                 self.image = pygame.transform.scale(original_image, (self.rect.width, self.rect.height))
                 
@@ -76,7 +80,7 @@ class Button:
             pygame.draw.rect(surface, COLOR_BLACK, self.rect, 2, border_radius=5)
         
         # Draw text on top of button
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = self.text_cache.render(self.font, self.text, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
     
@@ -99,9 +103,11 @@ class LoginScene:
         self.font_large = get_font(FONT_SIZE_LARGE)
         self.font_medium = get_font(FONT_SIZE_MEDIUM)
         self.font_small = get_font(FONT_SIZE_SMALL)
+        self.text_cache = get_text_cache()
         
-        self.players = []
-        self.current_player_index = 0  # Current selected player index
+        # Active players, loaded page by page around the selected one
+        self.directory = PlayerDirectory(db)
+        self.search_text = ''  # Typed name prefix to jump to
         self.selected_farm = None
         
         # Navigation buttons
@@ -131,7 +137,7 @@ class LoginScene:
             if os.path.exists(image_path):
                 try:
                     # Load and scale image to fit screen
-                    original_image = pygame.image.load(image_path)
+                    original_image = get_asset_cache().load(image_path, convert_alpha=False)
                     self.background_image = pygame.transform.scale(
                         original_image, 
                         (SCREEN_WIDTH, SCREEN_HEIGHT)
@@ -147,23 +153,22 @@ class LoginScene:
             self.background_image = None
     
     def load_players(self):
-        """Load all players"""
-        self.players = self.db.get_all_players()
-        if self.players:
-            # Load farms for the first player
+        """Load the first page of players"""
+        self.directory.load()
+        if self.directory.total:
+            # Select the first player's farm
             self.load_current_player_farms()
     
     def load_current_player_farms(self):
-        """Load farms for current player"""
-        if self.players and 0 <= self.current_player_index < len(self.players):
-            player = self.players[self.current_player_index]
-            farms = self.db.get_player_farms(player['PlayerId'])
-            # Auto select first farm
-            self.selected_farm = farms[0] if farms else None
+        """Select the current player's farm (farms come with the player page)"""
+        player = self.directory.current()
+        farms = player['Farms'] if player else []
+        # Auto select first farm
+        self.selected_farm = farms[0] if farms else None
     
     def create_buttons(self):
         """Create navigation buttons with custom images"""
-        if not self.players:
+        if not self.directory.total:
             return
         
         # Get card configuration for button positioning
@@ -211,21 +216,24 @@ class LoginScene:
     
     def switch_player(self, direction):
         """Switch player (direction: -1 for previous, 1 for next)"""
-        if not self.players:
+        if not self.directory.total:
             return
         
-        self.current_player_index = (self.current_player_index + direction) % len(self.players)
+        self.directory.move(direction)
         self.load_current_player_farms()
     
     def get_current_player(self):
         """Get current selected player"""
-        if self.players and 0 <= self.current_player_index < len(self.players):
-            return self.players[self.current_player_index]
-        return None
+        return self.directory.current()
+    
+    def edit_search(self, text):
+        """Set the typed name prefix and jump to the first matching player"""
+        self.search_text = text
+        self.directory.search(text)
     
     def handle_event(self, event):
         """Handle event"""
-        if not self.players:
+        if not self.directory.total:
             return None
         
         # Handle previous button
@@ -259,12 +267,22 @@ class LoginScene:
                         'player': player,
                         'farm': self.selected_farm
                     }
+            elif event.key == pygame.K_BACKSPACE:
+                if self.search_text:
+                    self.edit_search(self.search_text[:-1])
+            elif event.key == pygame.K_ESCAPE:
+                self.edit_search('')
+            elif event.unicode and event.unicode.isprintable() and not event.unicode.isspace():
+                # Typing a name jumps to it
+                self.edit_search(self.search_text + event.unicode)
         
         return None
     
     def update(self, dt):
         """Update scene"""
-        pass
+        # Apply a finished name search
+        if self.directory.poll():
+            self.load_current_player_farms()
     
     def draw(self):
         """Draw scene"""
@@ -275,14 +293,14 @@ class LoginScene:
             self.screen.fill(COLOR_LIGHT_GREEN)
         
         # Draw title (using configured position)
-        title_text = self.font_large.render("Farm Game", True, COLOR_DARK_GREEN)
+        title_text = self.text_cache.render(self.font_large, "Farm Game", COLOR_DARK_GREEN)
         title_y = LOGIN_TITLE_Y if 'LOGIN_TITLE_Y' in dir() else 80
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, title_y))
         self.screen.blit(title_text, title_rect)
         
-        if not self.players:
+        if not self.directory.total:
             # No players found
-            message = self.font_medium.render("No players found in database", True, COLOR_RED)
+            message = self.text_cache.render(self.font_medium, "No players found in database", COLOR_RED)
             message_rect = message.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             self.screen.blit(message, message_rect)
             return
@@ -296,7 +314,7 @@ class LoginScene:
         self.draw_player_card(player)
         
         # Draw navigation buttons
-        if len(self.players) > 1:
+        if self.directory.total > 1:
             self.prev_button.draw(self.screen)
             self.next_button.draw(self.screen)
         
@@ -304,9 +322,8 @@ class LoginScene:
         self.start_button.draw(self.screen)
         
         # Draw hint text
-        hint_text = self.font_small.render(
-            "Use arrow keys or click arrows to switch | Press Enter or click to start",
-            True,
+        hint_text = self.text_cache.render(self.font_small, 
+            "Arrow keys or arrows to switch | Type a name to jump | Enter to start",
             COLOR_GRAY
         )
         hint_rect = hint_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40))
@@ -324,9 +341,7 @@ class LoginScene:
         card_x = SCREEN_WIDTH // 2 - card_width // 2 + card_x_offset
         
         # Semi-transparent card background
-        card_surface = pygame.Surface((card_width, card_height))
-        card_surface.set_alpha(card_alpha)
-        card_surface.fill(COLOR_WHITE)
+        card_surface = self.text_cache.panel((card_width, card_height), COLOR_WHITE, card_alpha)
         self.screen.blit(card_surface, (card_x, card_y))
         
         # Card border
@@ -337,12 +352,12 @@ class LoginScene:
         card_center_x = card_x + card_width // 2
         
         # Player name
-        name_text = self.font_large.render(player['Name'], True, COLOR_DARK_GREEN)
+        name_text = self.text_cache.render(self.font_large, player['Name'], COLOR_DARK_GREEN)
         name_rect = name_text.get_rect(center=(card_center_x, card_y + 40))
         self.screen.blit(name_text, name_rect)
         
         # Player level
-        level_text = self.font_medium.render(f"Level: {player['Level']}", True, COLOR_BLACK)
+        level_text = self.text_cache.render(self.font_medium, f"Level: {player['Level']}", COLOR_BLACK)
         level_rect = level_text.get_rect(center=(card_center_x, card_y + 85))
         self.screen.blit(level_text, level_rect)
         
@@ -350,27 +365,24 @@ class LoginScene:
         stats_y = card_y + 130
         
         # Gold
-        gold_text = self.font_small.render(
+        gold_text = self.text_cache.render(self.font_small, 
             f"Gold: {player['CurrencyGold']:.0f}",
-            True,
             COLOR_BLACK
         )
         gold_rect = gold_text.get_rect(center=(card_center_x - 80, stats_y))
         self.screen.blit(gold_text, gold_rect)
         
         # Gem
-        gem_text = self.font_small.render(
+        gem_text = self.text_cache.render(self.font_small, 
             f"Gem: {player['CurrencyGem']}",
-            True,
             COLOR_BLACK
         )
         gem_rect = gem_text.get_rect(center=(card_center_x + 80, stats_y))
         self.screen.blit(gem_text, gem_rect)
         
         # Experience
-        exp_text = self.font_small.render(
+        exp_text = self.text_cache.render(self.font_small, 
             f"Experience: {player['Exp']}",
-            True,
             COLOR_BLACK
         )
         exp_rect = exp_text.get_rect(center=(card_center_x, stats_y + 35))
@@ -379,23 +391,31 @@ class LoginScene:
         # Farm info
         if self.selected_farm:
             farm_y = card_y + 210
-            farm_title = self.font_small.render("Farm:", True, COLOR_GRAY)
+            farm_title = self.text_cache.render(self.font_small, "Farm:", COLOR_GRAY)
             farm_title_rect = farm_title.get_rect(center=(card_center_x, farm_y))
             self.screen.blit(farm_title, farm_title_rect)
             
-            farm_name = self.font_small.render(
+            farm_name = self.text_cache.render(self.font_small, 
                 f"{self.selected_farm['Name']} (Soil Quality: {self.selected_farm['SoilQuality']})",
-                True,
                 COLOR_BLACK
             )
             farm_name_rect = farm_name.get_rect(center=(card_center_x, farm_y + 30))
             self.screen.blit(farm_name, farm_name_rect)
         
         # Player counter (above card)
-        counter_text = self.font_small.render(
-            f"Player {self.current_player_index + 1} / {len(self.players)}",
-            True,
+        counter_text = self.text_cache.render(self.font_small, 
+            f"Player {self.directory.index + 1} / {self.directory.total}",
             COLOR_GRAY
         )
         counter_rect = counter_text.get_rect(center=(card_center_x, card_y - 30))
         self.screen.blit(counter_text, counter_rect)
+        
+        # Typed name search (above the counter)
+        if self.search_text:
+            missed = self.directory.search_missed
+            search_text = self.text_cache.render(self.font_small,
+                f"Find: {self.search_text}" + ("  (no match)" if missed else ""),
+                COLOR_RED if missed else COLOR_DARK_GREEN
+            )
+            search_rect = search_text.get_rect(center=(card_center_x, card_y - 60))
+            self.screen.blit(search_text, search_rect)
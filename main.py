@@ -20,6 +20,12 @@ from config import *
 from database import db
 from login_scene import LoginScene
 from farm_scene import FarmScene
+from resource_manager import preload_resources
+from text_cache import get_text_cache
+from load_progress import LoadProgress
+from profiler import get_profiler, profiled
+from fixed_timestep import FixedTimestep
+from replay import ReplayRecorder, snapshot_farm
 
 
 def get_font(size):
@@ -43,19 +49,26 @@ class Game:
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(GAME_TITLE)
 
-        # Clock
+        # Start decoding game graphics in the background while the login screen is up
+        preload_resources()
+
+        # Clock: rendering is capped at FPS, the simulation runs fixed ticks
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep()
         self.running = True
+        self.profiler = get_profiler()
 
         # Loading screen helpers
         self.loading_font = get_font(48)
         self.loading_sub_font = get_font(28)
+        self.text_cache = get_text_cache()
         self.loading_title = "Loading..."
         self.loading_subtitle = ""
         self.loading_hint = "Please wait..."
         self.loading_task = None
         self.loading_result = None
         self.loading_error = None
+        self.loading_progress = None
 
         # Connect to database
         if not db.connect():
@@ -68,16 +81,20 @@ class Game:
         self.scene_name = "login"
         self.login_scene = LoginScene(self.screen, db)
         self.farm_scene = None
+        # Session recorder of the current farm visit (REPLAY_RECORDING)
+        self.recorder = None
+        self.loading_recorder = None
 
         print("Game started successfully!")
         print(f"Resolution: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
-        print(f"FPS: {FPS}")
+        print(f"FPS: {FPS}  Simulation: {SIM_TICK_RATE} ticks/s")
 
     def run(self):
         """Main game loop"""
         while self.running:
-            # Calculate time delta
-            dt = self.clock.tick(FPS) / 1000.0  # Convert to seconds
+            # Real time since the last frame, run as whole simulation ticks
+            frame_time = self.clock.tick(FPS) / 1000.0  # Convert to seconds
+            self.profiler.begin_frame()
 
             # Handle events
             for event in pygame.event.get():
@@ -86,14 +103,19 @@ class Game:
                 else:
                     self.handle_event(event)
 
-            # Update
-            self.update(dt)
+            # Update (zero or more fixed ticks, independent of the frame rate)
+            for _ in range(self.timestep.advance(frame_time)):
+                self.update(self.timestep.dt)
 
-            # Draw
-            self.draw()
+            # Draw, interpolated between the last two ticks
+            dirty_rects = self.draw(self.timestep.alpha)
 
-            # Update display
-            pygame.display.flip()
+            # Update display (only the changed regions in dirty-rect mode)
+            if dirty_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty_rects)
+            self.profiler.end_frame()
 
         # Cleanup
         self.cleanup()
@@ -107,28 +129,37 @@ class Game:
                 self.switch_to_farm(result['player'], result['farm'])
 
         elif self.scene_name == "farm":
+            if self.recorder:
+                self.recorder.event(event)
             result = self.farm_scene.handle_event(event)
             if result == "login":
                 # Return to login screen
                 self.switch_to_login()
 
+    @profiled('update')
     def update(self, dt):
-        """Update game state"""
+        """Advance the game state by one fixed tick of dt seconds"""
         if self.scene_name == "login":
             self.login_scene.update(dt)
         elif self.scene_name == "farm":
+            if self.recorder:
+                self.recorder.tick(pygame.key.get_pressed())
             self.farm_scene.update(dt)
         elif self.scene_name == "loading":
             self.poll_loading_task()
 
-    def draw(self):
-        """Draw scene"""
+    @profiled('draw')
+    def draw(self, alpha=1.0):
+        """Draw scene; returns the changed rects in dirty-rect mode, else None"""
         if self.scene_name == "login":
             self.login_scene.draw()
         elif self.scene_name == "farm":
-            self.farm_scene.draw()
+            if DIRTY_RECT_RENDERING:
+                return self.farm_scene.draw_dirty(alpha)
+            self.farm_scene.draw(alpha)
         elif self.scene_name == "loading":
             self.draw_loading_screen()
+        return None
 
     def set_loading_screen(self, title="Loading...", subtitle=None, hint="Please wait..."):
         """Update loading texts that the draw function will use."""
@@ -139,19 +170,44 @@ class Game:
     def draw_loading_screen(self):
         """Render a simple loading screen each frame."""
         self.screen.fill(COLOR_LIGHT_GREEN)
-        title_surface = self.loading_font.render(self.loading_title, True, COLOR_DARK_GREEN)
+        title_surface = self.text_cache.render(self.loading_font, self.loading_title, COLOR_DARK_GREEN)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30))
         self.screen.blit(title_surface, title_rect)
 
         if self.loading_subtitle:
-            subtitle_surface = self.loading_sub_font.render(self.loading_subtitle, True, COLOR_BLACK)
+            subtitle_surface = self.text_cache.render(self.loading_sub_font, self.loading_subtitle, COLOR_BLACK)
             subtitle_rect = subtitle_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10))
             self.screen.blit(subtitle_surface, subtitle_rect)
 
-        hint_surface = self.loading_sub_font.render(self.loading_hint, True, COLOR_BLACK)
+        hint_surface = self.text_cache.render(self.loading_sub_font, self.loading_hint, COLOR_BLACK)
         hint_rect = hint_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         self.screen.blit(hint_surface, hint_rect)
 
+        if self.loading_progress:
+            self.draw_loading_progress(SCREEN_HEIGHT // 2 + 100)
+
+    def draw_loading_progress(self, y):
+        """Progress bar plus the stages that are still running."""
+        progress = self.loading_progress
+        bar_rect = pygame.Rect(0, 0, 400, 18)
+        bar_rect.center = (SCREEN_WIDTH // 2, y)
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_rect.width * progress.fraction())
+        pygame.draw.rect(self.screen, COLOR_WHITE, bar_rect, border_radius=4)
+        if fill_rect.width > 0:
+            pygame.draw.rect(self.screen, COLOR_DARK_GREEN, fill_rect, border_radius=4)
+        pygame.draw.rect(self.screen, COLOR_BLACK, bar_rect, 2, border_radius=4)
+
+        active = progress.active()
+        status = f"{', '.join(active)}..." if active else "Starting..."
+        status_surface = self.text_cache.render(
+            self.loading_sub_font,
+            f"{int(progress.fraction() * 100)}%  {status}  {progress.elapsed():.1f}s",
+            COLOR_BLACK
+        )
+        status_rect = status_surface.get_rect(center=(SCREEN_WIDTH // 2, y + 35))
+        self.screen.blit(status_surface, status_rect)
+
     def switch_to_farm(self, player_data, farm_data):
         """Begin loading the farm scene asynchronously."""
         print(f"Player {player_data['Name']} entering farm {farm_data['Name']}")
@@ -163,6 +219,7 @@ class Game:
         self.scene_name = "loading"
         self.loading_result = None
         self.loading_error = None
+        self.loading_progress = LoadProgress(FarmScene.LOAD_STAGES)
 
         self.loading_task = threading.Thread(
             target=self._load_farm_scene,
@@ -172,9 +229,21 @@ class Game:
         self.loading_task.start()
 
     def _load_farm_scene(self, player_data, farm_data):
-        """Worker thread that builds the farm scene."""
+        """Worker thread that builds the farm scene.
+
+        Its images are converted to the display format here too (see asset_cache);
+        the window is never resized or re-created while a scene is loading.
+        """
         try:
-            scene = FarmScene(self.screen, db, player_data, farm_data)
+            rng = None
+            if REPLAY_RECORDING:
+                # Snapshot the farm before the scene reads (and changes) it
+                self.loading_recorder = ReplayRecorder(
+                    snapshot_farm(db, player_data['PlayerId'], farm_data['FarmId']))
+                rng = self.loading_recorder.make_rng()
+            scene = FarmScene(self.screen, db, player_data, farm_data, self.loading_progress, rng)
+            if self.loading_recorder:
+                self.loading_recorder.attach(scene)
             self.loading_result = scene
         except Exception as exc:
             self.loading_error = str(exc)
@@ -197,23 +266,39 @@ class Game:
             return
 
         if self.loading_result:
+            print(f"Farm ready: {self.loading_progress.summary()}")
             self.farm_scene = self.loading_result
             self.loading_result = None
+            self.recorder, self.loading_recorder = self.loading_recorder, None
             self.scene_name = "farm"
+            # Do not replay the time spent loading as a burst of ticks
+            self.timestep.reset()
+
+    def save_recording(self):
+        """Write the current farm visit's recording, if one is running"""
+        if self.recorder:
+            path = self.recorder.save()
+            if path:
+                print(f"Session recorded to {path}")
+        self.recorder = None
+        self.loading_recorder = None
 
     def switch_to_login(self):
         """Switch to login screen"""
         print("Return to login screen")
+        self.save_recording()
         self.login_scene = LoginScene(self.screen, db)
         self.farm_scene = None
         self.scene_name = "login"
         self.loading_result = None
         self.loading_error = None
         self.loading_task = None
+        self.loading_progress = None
 
     def cleanup(self):
         """Cleanup resources"""
         print("Closing game...")
+        self.save_recording()
         db.disconnect()
         pygame.quit()
         print("Game closed")
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Compiled TMX map cache.
+
+pytmx parses map.tmx, every .tsx tileset and all tileset images on each load.
+A compiled map holds everything FarmMap needs -- the tile index array of every
+tile layer, object groups, image layers and one packed sheet of the tile
+images that are actually used -- in a single binary file that is
+memory-mapped on later loads, so no XML is parsed at all. The file is keyed
+by a hash of the TMX file, its tilesets and their images (mtime + size);
+any change makes the cache miss and it is rebuilt.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pygame
+
+from texture_atlas import TextureAtlas, pack_atlas, source_stamps
+
+MAP_CACHE_VERSION = 1
+_MAGIC = b'FGMC1'
+_HEADER = struct.Struct('<5sI')
+_SOURCE_RE = re.compile(r'source="([^"]+)"')
+
+
+@dataclass
+class MapObject:
+    """One object of a TMX object group."""
+
+    name: str
+    x: float
+    y: float
+    width: float
+    height: float
+    image_key: Optional[str] = None
+
+
+@dataclass
+class CompiledLayer:
+    """A TMX layer reduced to plain data: tile gids, objects or one image."""
+
+    name: str
+    kind: str                 # 'tiles', 'objects' or 'image'
+    visible: bool = True
+    cols: int = 0
+    rows: int = 0
+    gids: Sequence[int] = ()  # row-major pytmx gids, 0 = empty cell
+    objects: List[MapObject] = field(default_factory=list)
+    image_key: Optional[str] = None
+
+    def tiles(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield (x, y, gid) for every non-empty cell, row by row (like pytmx)."""
+        cols = self.cols
+        for index, gid in enumerate(self.gids):
+            if gid:
+                yield index % cols, index // cols, gid
+
+
+@dataclass
+class CompiledMap:
+    """Everything FarmMap reads from a TMX file."""
+
+    key: str
+    width: int
+    height: int
+    tile_width: int
+    tile_height: int
+    layers: List[CompiledLayer]
+    atlas: TextureAtlas
+
+    def layer(self, name: str) -> Optional[CompiledLayer]:
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def image(self, key: Optional[str]) -> Optional[pygame.Surface]:
+        return self.atlas.subsurface(key) if key else None
+
+
+# ==================== Cache Key ====================
+
+def map_sources(map_path: str) -> Dict[str, str]:
+    """The TMX file plus every tileset and image it references (found by a cheap scan)."""
+    sources = {'map': map_path}
+    pending = [map_path]
+    while pending:
+        path = pending.pop()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            continue
+        base = os.path.dirname(path)
+        for ref in _SOURCE_RE.findall(text):
+            ref_path = os.path.normpath(os.path.join(base, ref))
+            key = os.path.relpath(ref_path, os.path.dirname(map_path)).replace(os.sep, '/')
+            if key in sources:
+                continue
+            sources[key] = ref_path
+            if ref_path.lower().endswith('.tsx'):
+                pending.append(ref_path)
+    return sources
+
+
+def cache_key(map_path: str) -> str:
+    """Hash of the map's source files (mtime + size of each) and the cache format."""
+    payload = {
+        'version': MAP_CACHE_VERSION,
+        'stamps': source_stamps(map_sources(map_path)),
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def cache_path(cache_dir: str, map_path: str) -> str:
+    stem = os.path.splitext(os.path.basename(map_path))[0]
+    return os.path.join(cache_dir, f"{stem}.mapc")
+
+
+# ==================== Compile ====================
+
+def compile_tmx(tmx_data, key: str) -> CompiledMap:
+    """Reduce a pytmx TiledMap to a CompiledMap (tile images packed into one sheet)."""
+    from pytmx import TiledObjectGroup, TiledTileLayer, TiledImageLayer
+
+    images: Dict[str, pygame.Surface] = {}
+
+    def image_key(gid):
+        surf = tmx_data.images[gid] if gid and gid < len(tmx_data.images) else None
+        if not surf:
+            return None
+        images.setdefault(str(gid), surf)
+        return str(gid)
+
+    layers = []
+    for index, layer in enumerate(tmx_data.layers):
+        visible = bool(layer.visible)
+        if isinstance(layer, TiledTileLayer):
+            gids = array('I', (gid for row in layer.data for gid in row))
+            if visible:
+                for gid in set(gids):
+                    image_key(gid)
+            layers.append(CompiledLayer(layer.name, 'tiles', visible,
+                                        layer.width, layer.height, gids))
+        elif isinstance(layer, TiledObjectGroup):
+            objects = [
+                MapObject(obj.name or '', obj.x, obj.y, obj.width or 0, obj.height or 0,
+                          image_key(obj.gid) if getattr(obj, 'image', None) else None)
+                for obj in layer
+            ]
+            layers.append(CompiledLayer(layer.name, 'objects', visible, objects=objects))
+        elif isinstance(layer, TiledImageLayer):
+            key_name = None
+            if layer.image:
+                key_name = f"image:{index}"
+                images[key_name] = layer.image
+            layers.append(CompiledLayer(layer.name, 'image', visible, image_key=key_name))
+
+    return CompiledMap(
+        key=key,
+        width=tmx_data.width * tmx_data.tilewidth,
+        height=tmx_data.height * tmx_data.tileheight,
+        tile_width=tmx_data.tilewidth,
+        tile_height=tmx_data.tileheight,
+        layers=layers,
+        atlas=pack_atlas('map-tiles', images),
+    )
+
+
+# ==================== Disk Cache ====================
+
+def save_compiled(compiled: CompiledMap, path: str) -> bool:
+    """Write ``compiled`` as index JSON + gid arrays + raw RGBA sheet."""
+    chunks = []
+    offset = 0
+    layer_entries = []
+    for layer in compiled.layers:
+        entry = {'name': layer.name, 'kind': layer.kind, 'visible': layer.visible}
+        if layer.kind == 'tiles':
+            data = array('I', layer.gids).tobytes()
+            entry.update(cols=layer.cols, rows=layer.rows, offset=offset, length=len(data))
+            chunks.append(data)
+            offset += len(data)
+        elif layer.kind == 'objects':
+            entry['objects'] = [[obj.name, obj.x, obj.y, obj.width, obj.height, obj.image_key]
+                                for obj in layer.objects]
+        else:
+            entry['image'] = layer.image_key
+        layer_entries.append(entry)
+
+    sheet = compiled.atlas.surface
+    pixels = pygame.image.tobytes(sheet, 'RGBA')
+    index = {
+        'version': MAP_CACHE_VERSION,
+        'key': compiled.key,
+        'byteorder': sys.byteorder,
+        'size': [compiled.width, compiled.height],
+        'tile_size': [compiled.tile_width, compiled.tile_height],
+        'layers': layer_entries,
+        'sheet': {'size': list(sheet.get_size()), 'offset': offset, 'length': len(pixels),
+                  'regions': compiled.atlas.index()['regions']},
+    }
+    header = json.dumps(index).encode('utf-8')
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, len(header)))
+            f.write(header)
+            for data in chunks:
+                f.write(data)
+            f.write(pixels)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        print(f"Failed to write map cache {path}: {exc}")
+        return False
+    return True
+
+
+def load_compiled(path: str, key: str) -> Optional[CompiledMap]:
+    """Memory-map a compiled map; None if missing, unreadable or built from other sources."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_len = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC:
+            return None
+        start = _HEADER.size
+        index = json.loads(mapped[start:start + index_len].decode('utf-8'))
+        if (index.get('version') != MAP_CACHE_VERSION or index.get('key') != key
+                or index.get('byteorder') != sys.byteorder):
+            return None
+        blob = memoryview(mapped)[start + index_len:]
+
+        layers = []
+        for entry in index['layers']:
+            layer = CompiledLayer(entry['name'], entry['kind'], entry['visible'])
+            if layer.kind == 'tiles':
+                layer.cols, layer.rows = entry['cols'], entry['rows']
+                layer.gids = blob[entry['offset']:entry['offset'] + entry['length']].cast('I')
+            elif layer.kind == 'objects':
+                layer.objects = [MapObject(*values) for values in entry['objects']]
+            else:
+                layer.image_key = entry.get('image')
+            layers.append(layer)
+
+        sheet_info = index['sheet']
+        pixels = blob[sheet_info['offset']:sheet_info['offset'] + sheet_info['length']]
+        sheet = pygame.image.frombuffer(pixels, tuple(sheet_info['size']), 'RGBA')
+        sheet = sheet.convert_alpha() if pygame.display.get_surface() is not None else sheet.copy()
+        atlas = TextureAtlas('map-tiles', sheet,
+                             {name: pygame.Rect(rect) for name, rect in sheet_info['regions'].items()})
+    except (OSError, ValueError, KeyError, TypeError, struct.error, pygame.error) as exc:
+        print(f"Ignoring unreadable map cache {path}: {exc}")
+        return None
+
+    return CompiledMap(
+        key=key,
+        width=index['size'][0],
+        height=index['size'][1],
+        tile_width=index['tile_size'][0],
+        tile_height=index['tile_size'][1],
+        layers=layers,
+        atlas=atlas,
+    )
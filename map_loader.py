@@ -6,12 +6,18 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pygame
 
+from asset_cache import get_asset_cache
+from collision_grid import CollisionGrid
+from config import MAP_CHUNK_SIZE
+from map_cache import (CompiledLayer, CompiledMap, MapObject, cache_key, cache_path,
+                       compile_tmx, load_compiled, save_compiled)
+from profiler import get_profiler, profiled
+
 try:
-    from pytmx import TiledObjectGroup, TiledTileLayer, TiledImageLayer
     from pytmx.util_pygame import load_pygame
 except ImportError as exc:
     raise ImportError(
@@ -19,6 +25,21 @@ except ImportError as exc:
     ) from exc
 
 
+def _alpha_format_matches_display() -> bool:
+    """True if SRCALPHA surfaces already have the display's alpha format.
+
+    convert_alpha() is then a plain copy, so baked chunks can skip it. Also
+    True without a display mode, when there is nothing to convert to.
+    """
+    probe = pygame.Surface((1, 1), pygame.SRCALPHA)
+    try:
+        converted = probe.convert_alpha()
+    except pygame.error:
+        return True
+    return (converted.get_bitsize() == probe.get_bitsize()
+            and converted.get_masks() == probe.get_masks())
+
+
 @dataclass
 class MapSprite:
     """A lightweight sprite used for rendering TMX layers."""
@@ -31,60 +52,145 @@ class MapSprite:
 class FarmMap:
     """Loads TMX data and exposes renderable sprites plus collision rects."""
 
-    def __init__(self, map_path: str, layers: Optional[Dict[str, int]] = None):
+    def __init__(self, map_path: str, layers: Optional[Dict[str, int]] = None,
+                 chunk_size: int = MAP_CHUNK_SIZE, cache_dir: Optional[str] = None):
         self.map_path = map_path
         self.layers = layers or {}
+        self.chunk_size = max(1, int(chunk_size))
+        # Compiled-map cache directory (None = always parse the TMX file)
+        self.cache_dir = cache_dir
+        self.compiled: Optional[CompiledMap] = None
+        self.tmx_data = None  # pytmx data, only set when the TMX file was parsed
+        self.from_cache = False
 
         self.sprites: List[MapSprite] = []
         self.collision_rects: List[pygame.Rect] = []
+        # Blocked tiles of the "Collision" tile layer (None if the map has none)
+        self.collision_grid: Optional[CollisionGrid] = None
         self.width = 0
         self.height = 0
         self.water_tile: Optional[pygame.Surface] = None
+        self.water_surface: Optional[pygame.Surface] = None
+
+        # Pre-rendered static layers: {z: {(chunk_x, chunk_y): surface}}
+        self.chunks: Dict[int, Dict[Tuple[int, int], pygame.Surface]] = {}
+        self.chunk_z_order: List[int] = []
 
         self._load_map()
+        self._bake_chunks()
         self._load_water_tile()
 
+    def _load_compiled(self) -> CompiledMap:
+        """Memory-map the compiled cache if it is current, otherwise parse the TMX file."""
+        key = ''
+        path = None
+        if self.cache_dir:
+            key = cache_key(self.map_path)
+            path = cache_path(self.cache_dir, self.map_path)
+            compiled = load_compiled(path, key)
+            if compiled is not None:
+                self.from_cache = True
+                return compiled
+
+        self.tmx_data = load_pygame(self.map_path)
+        compiled = compile_tmx(self.tmx_data, key)
+        if path:
+            save_compiled(compiled, path)
+        return compiled
+
     def _load_map(self):
-        """Read TMX file and extract sprites/collisions."""
-        tmx_data = load_pygame(self.map_path)
-        self.tmx_data = tmx_data
-        tile_w = tmx_data.tilewidth
-        tile_h = tmx_data.tileheight
-        self.width = tmx_data.width * tile_w
-        self.height = tmx_data.height * tile_h
-
-        for layer in tmx_data.visible_layers:
-            if isinstance(layer, TiledTileLayer):
+        """Read TMX data and extract sprites/collisions."""
+        compiled = self._load_compiled()
+        self.compiled = compiled
+        tile_w = compiled.tile_width
+        tile_h = compiled.tile_height
+        self.width = compiled.width
+        self.height = compiled.height
+
+        for layer in compiled.layers:
+            if layer.kind == 'tiles' and layer.name.lower() == 'collision':
+                # Collision data, never drawn (even if the layer is left visible)
+                self.collision_grid = CollisionGrid.from_gids(
+                    layer.gids, layer.cols, layer.rows, tile_w, tile_h)
+                continue
+            if not layer.visible:
+                continue
+            if layer.kind == 'tiles':
                 z_val = self.layers.get(layer.name, self.layers.get('ground', 0))
-                for x, y, surf in layer.tiles():
+                for x, y, gid in layer.tiles():
+                    surf = compiled.image(str(gid))
                     if not surf:
                         continue
                     rect = surf.get_rect(topleft=(x * tile_w, y * tile_h))
                     self.sprites.append(MapSprite(surf, rect, z_val))
 
-            elif isinstance(layer, TiledObjectGroup):
+            elif layer.kind == 'objects':
                 lname = (layer.name or '').lower()
                 if lname == 'collision':# ײ
-                    for obj in layer:
+                    for obj in layer.objects:
                         rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
                         self.collision_rects.append(rect)
                 else:
                     z_val = self.layers.get(layer.name, self.layers.get('main', 5))
-                    for obj in layer:
-                        surf = getattr(obj, 'image', None)
+                    for obj in layer.objects:
+                        surf = compiled.image(obj.image_key)
                         if not surf:
                             continue
                         rect = surf.get_rect(topleft=(obj.x, obj.y - surf.get_height()))
                         self.sprites.append(MapSprite(surf, rect, z_val))
 
-            elif isinstance(layer, TiledImageLayer):
-                surf = layer.image
+            elif layer.kind == 'image':
+                surf = compiled.image(layer.image_key)
                 if not surf:
                     continue
                 z_val = self.layers.get(layer.name, self.layers.get('ground', 0))
                 rect = surf.get_rect(topleft=(0, 0))
                 self.sprites.append(MapSprite(surf, rect, z_val))
 
+    def objects(self, layer_name: str) -> List[MapObject]:
+        """Objects of a TMX object group (visible or not); empty if there is none."""
+        layer = self.compiled.layer(layer_name) if self.compiled else None
+        if layer is None or layer.kind != 'objects':
+            return []
+        return layer.objects
+
+    def tile_layer(self, layer_name: str) -> Optional[CompiledLayer]:
+        """Tile index data of a TMX tile layer (visible or not), or None."""
+        layer = self.compiled.layer(layer_name) if self.compiled else None
+        if layer is None or layer.kind != 'tiles':
+            return None
+        return layer
+
+    def _bake_chunks(self):
+        """Compose the static TMX sprites into per-layer chunk surfaces.
+
+        Map tiles never change after loading, so every sprite is blitted once
+        (ordered by z, then rect bottom for pseudo depth) into the chunks it
+        overlaps. Drawing then only touches chunks in view.
+        """
+        self.chunks = {}
+        size = self.chunk_size
+        for sprite in sorted(self.sprites, key=lambda s: (s.z, s.rect.bottom)):
+            layer_chunks = self.chunks.setdefault(sprite.z, {})
+            rect = sprite.rect
+            first_cx = max(0, rect.left // size)
+            first_cy = max(0, rect.top // size)
+            last_cx = (rect.right - 1) // size
+            last_cy = (rect.bottom - 1) // size
+            for cy in range(first_cy, last_cy + 1):
+                for cx in range(first_cx, last_cx + 1):
+                    chunk = layer_chunks.get((cx, cy))
+                    if chunk is None:
+                        chunk = pygame.Surface((size, size), pygame.SRCALPHA)
+                        layer_chunks[(cx, cy)] = chunk
+                    chunk.blit(sprite.image, (rect.x - cx * size, rect.y - cy * size))
+
+        if self.chunks and not _alpha_format_matches_display():
+            for layer_chunks in self.chunks.values():
+                for key, chunk in layer_chunks.items():
+                    layer_chunks[key] = chunk.convert_alpha()
+        self.chunk_z_order = sorted(self.chunks)
+
     def _load_water_tile(self):
         """Load tiled water background so empty areas appear as water instead of solid color."""
         base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -92,38 +198,56 @@ class FarmMap:
         if not os.path.exists(water_path):
             return
         try:
-            self.water_tile = pygame.image.load(water_path).convert_alpha()
+            self.water_tile = get_asset_cache().load(water_path)
         except Exception as exc:
             print(f"Failed to load water tile {water_path}: {exc}")
             self.water_tile = None
 
+    def _get_water_surface(self, screen_w: int, screen_h: int) -> Optional[pygame.Surface]:
+        """Return a screen-sized (plus one tile) pre-tiled water surface."""
+        if not self.water_tile:
+            return None
+        tile_w = self.water_tile.get_width()
+        tile_h = self.water_tile.get_height()
+        width = screen_w + tile_w
+        height = screen_h + tile_h
+        surf = self.water_surface
+        if surf is None or surf.get_width() < width or surf.get_height() < height:
+            surf = pygame.Surface((width, height), pygame.SRCALPHA)
+            for y in range(0, height, tile_h):
+                for x in range(0, width, tile_w):
+                    surf.blit(self.water_tile, (x, y))
+            self.water_surface = surf = surf.convert_alpha()
+        return surf
+
+    @profiled('map')
     def draw(self, surface: pygame.Surface, camera_x: float, camera_y: float):
-        """Draw sprites in layer order with a faux-3D effect."""
+        """Draw the water backdrop and the pre-baked layer chunks in view."""
         screen_w = surface.get_width()
         screen_h = surface.get_height()
 
         # Draw tiled water first to cover void areas
-        if self.water_tile:
+        water = self._get_water_surface(screen_w, screen_h)
+        if water:
             tile_w = self.water_tile.get_width()
             tile_h = self.water_tile.get_height()
-            start_x = int((camera_x) // tile_w) - 1
-            start_y = int((camera_y) // tile_h) - 1
-            end_x = int((camera_x + screen_w) // tile_w) + 2
-            end_y = int((camera_y + screen_h) // tile_h) + 2
-            for ty in range(start_y, end_y):
-                for tx in range(start_x, end_x):
-                    dest_x = tx * tile_w - camera_x
-                    dest_y = ty * tile_h - camera_y
-                    surface.blit(self.water_tile, (dest_x, dest_y))
-
-        if not self.sprites:
+            surface.blit(water, (-(camera_x % tile_w), -(camera_y % tile_h)))
+
+        if not self.chunks:
             return
 
-        # Sort first by layer (z), then by vertical position for pseudo depth.
-        for sprite in sorted(self.sprites, key=lambda s: (s.z, s.rect.bottom)):
-            dest = sprite.rect.move(-camera_x, -camera_y)
-            if dest.right < 0 or dest.left > surface.get_width():
-                continue
-            if dest.bottom < 0 or dest.top > surface.get_height():
-                continue
-            surface.blit(sprite.image, dest)
+        size = self.chunk_size
+        blits = 0
+        first_cx = int(camera_x // size)
+        first_cy = int(camera_y // size)
+        last_cx = int((camera_x + screen_w) // size)
+        last_cy = int((camera_y + screen_h) // size)
+        for z in self.chunk_z_order:
+            layer_chunks = self.chunks[z]
+            for cy in range(first_cy, last_cy + 1):
+                for cx in range(first_cx, last_cx + 1):
+                    chunk = layer_chunks.get((cx, cy))
+                    if chunk is not None:
+                        surface.blit(chunk, (cx * size - camera_x, cy * size - camera_y))
+                        blits += 1
+        get_profiler().count('blits', blits)
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory stand-in for database.Database (no SQL Server needed).
+Used by the headless benchmark and for offline runs.
+"""
+from datetime import datetime, timedelta
+import random
+
+from config import CROP_WITHER_FACTOR, DEMO_PLOT_COLUMNS, DEMO_PLOT_ROWS, LOGIN_PAGE_SIZE
+from db_pool import AsyncQueries
+from profiler import profiled
+
+# Stored plot columns (get_farm_plots rows also carry CropName / GrowthHours)
+PLOT_COLUMNS = ('PlotId', 'FarmId', 'X', 'Y', 'Status', 'CropVarietyId', 'PlantedAt',
+                'WaterLevel', 'FertilizerLevel')
+
+
+class MemoryDatabase(AsyncQueries):
+    """Same method surface as Database, backed by plain dicts"""
+
+    def __init__(self):
+        self.players = {}
+        self.farms = {}
+        self.plots = {}
+        self.farm_plot_ids = {}   # FarmId -> [PlotId] (one farm's plots without a full scan)
+        self.items = {}
+        self.crop_varieties = {}
+        self.inventory = {}       # (FarmId, ItemId) -> Quantity
+        self.action_log = []
+        self.query_count = 0
+        self.update_count = 0
+        # Current UTC time for plant/ripeness checks (replays substitute their tick clock)
+        self.clock = datetime.utcnow
+
+    def connect(self):
+        """Nothing to connect to"""
+        return True
+
+    def disconnect(self):
+        """Stop the db.submit workers"""
+        self.shutdown_queries()
+
+    @profiled('db.query', 'db')
+    def _read(self, rows):
+        """Return fresh row dicts, like a real cursor would"""
+        self.query_count += 1
+        return [dict(row) for row in rows]
+
+    @profiled('db.update', 'db')
+    def _write(self):
+        self.update_count += 1
+        return True
+
+    # ==================== Demo Data ====================
+
+    def seed_demo_data(self, plot_columns=DEMO_PLOT_COLUMNS, plot_rows=DEMO_PLOT_ROWS, seed=None,
+                       farm_count=1):
+        """Populate items, crops and ``farm_count`` players, each with one farm and a plot grid"""
+        rng = random.Random(seed)
+        now = self.clock()
+
+        items = [
+            (1, 'Corn Seed', 'Seed', 2.0),
+            (2, 'Tomato Seed', 'Seed', 3.0),
+            (3, 'Corn', 'Produce', 8.0),
+            (4, 'Tomato', 'Produce', 10.0),
+            (5, 'Apple', 'Produce', 5.0),
+            (6, 'Wood', 'Material', 1.0),
+        ]
+        for item_id, name, item_type, price in items:
+            self.items[item_id] = {
+                'ItemId': item_id, 'Name': name, 'ItemType': item_type,
+                'StackLimit': 999, 'BasePrice': price
+            }
+        self.crop_varieties = {
+            1: {'CropVarietyId': 1, 'Name': 'Corn', 'GrowthHours': 4,
+                'BaseYield': 3, 'SeedItemId': 1, 'ProduceItemId': 3},
+            2: {'CropVarietyId': 2, 'Name': 'Tomato', 'GrowthHours': 6,
+                'BaseYield': 2, 'SeedItemId': 2, 'ProduceItemId': 4},
+        }
+        plot_id = 1
+        statuses = ['Empty', 'Growing', 'Growing', 'Mature', 'Withered']
+        for farm_id in range(1, farm_count + 1):
+            suffix = f" {farm_id}" if farm_id > 1 else ""
+            self.players[farm_id] = {
+                'PlayerId': farm_id, 'Name': f'Bench{suffix}', 'Level': 1, 'Exp': 0,
+                'CurrencyGold': 100.0, 'CurrencyGem': 0, 'Status': 'Active'
+            }
+            self.farms[farm_id] = {'FarmId': farm_id, 'PlayerId': farm_id,
+                                   'Name': f'Bench Farm{suffix}', 'SoilQuality': 50}
+            self.inventory[(farm_id, 1)] = 50
+            self.inventory[(farm_id, 2)] = 50
+            plot_id = self._seed_plots(rng, now, farm_id, plot_id, plot_columns, plot_rows, statuses)
+        return self
+
+    def _seed_plots(self, rng, now, farm_id, plot_id, plot_columns, plot_rows, statuses):
+        """Random plot grid for one demo farm; returns the next free PlotId"""
+        for x in range(plot_columns):
+            for y in range(plot_rows):
+                status = rng.choice(statuses)
+                variety = self.crop_varieties[rng.choice([1, 2])] if status != 'Empty' else None
+                planted = None
+                if variety:
+                    hours = variety['GrowthHours']
+                    offset = {'Growing': rng.uniform(0, hours),
+                              'Mature': hours,
+                              'Withered': hours * CROP_WITHER_FACTOR}[status]
+                    planted = now - timedelta(hours=offset)
+                self.plots[plot_id] = {
+                    'PlotId': plot_id, 'FarmId': farm_id, 'X': x, 'Y': y, 'Status': status,
+                    'CropVarietyId': variety['CropVarietyId'] if variety else None,
+                    'PlantedAt': planted,
+                    'WaterLevel': rng.randint(0, 100), 'FertilizerLevel': 0
+                }
+                self.farm_plot_ids.setdefault(farm_id, []).append(plot_id)
+                plot_id += 1
+        return plot_id
+
+    def load_snapshot(self, snapshot):
+        """Populate from a farm snapshot (see replay.snapshot_farm)"""
+        player, farm = dict(snapshot['player']), dict(snapshot['farm'])
+        self.players[player['PlayerId']] = player
+        self.farms[farm['FarmId']] = farm
+        self.items = {item['ItemId']: dict(item) for item in snapshot['items']}
+        self.crop_varieties = {variety['CropVarietyId']: dict(variety)
+                               for variety in snapshot['varieties']}
+        for plot in snapshot['plots']:
+            row = {key: plot[key] for key in PLOT_COLUMNS}
+            if isinstance(row['PlantedAt'], str):
+                row['PlantedAt'] = datetime.fromisoformat(row['PlantedAt'])
+            self.plots[row['PlotId']] = row
+            self.farm_plot_ids.setdefault(row['FarmId'], []).append(row['PlotId'])
+        for row in snapshot['inventory']:
+            self.inventory[(farm['FarmId'], row['ItemId'])] = row['Quantity']
+        return self
+
+    # ==================== Player Related ====================
+
+    def get_all_players(self):
+        """Get all players"""
+        return self._read(p for p in sorted(self.players.values(), key=lambda p: p['PlayerId'])
+                          if p['Status'] == 'Active')
+
+    def get_player_by_id(self, player_id):
+        """Get player info by ID"""
+        result = self._read([self.players[player_id]] if player_id in self.players else [])
+        return result[0] if result else None
+
+    def get_player_page(self, key=None, limit=LOGIN_PAGE_SIZE, backward=False):
+        """Keyset page of active players with their 'Farms' (see Database.get_player_page)"""
+        players = sorted((p for p in self.players.values() if p['Status'] == 'Active' and (
+                              key is None or (p['PlayerId'] < key if backward else p['PlayerId'] > key))),
+                         key=lambda p: p['PlayerId'])
+        page = self._read(players[-limit:] if backward else players[:limit])
+        farms = {player['PlayerId']: [] for player in page}
+        for farm in sorted(self.farms.values(), key=lambda f: f['FarmId']):
+            if farm['PlayerId'] in farms:
+                farms[farm['PlayerId']].append(dict(farm))
+        for player in page:
+            player['Farms'] = farms[player['PlayerId']]
+        return page
+
+    def count_active_players(self, before_id=None):
+        """Number of active players (with a PlayerId below ``before_id`` if given)"""
+        self._read(())
+        return sum(1 for p in self.players.values() if p['Status'] == 'Active'
+                   and (before_id is None or p['PlayerId'] < before_id))
+
+    def find_player_by_name(self, prefix):
+        """First active player (by name, then PlayerId) whose name starts with ``prefix``"""
+        prefix = prefix.casefold()
+        matches = sorted((p for p in self.players.values() if p['Status'] == 'Active'
+                          and p['Name'].casefold().startswith(prefix)),
+                         key=lambda p: (p['Name'].casefold(), p['PlayerId']))
+        result = self._read(matches[:1])
+        return result[0] if result else None
+
+    # ==================== Farm Related ====================
+
+    def get_player_farms(self, player_id):
+        """Get all farms of a player"""
+        return self._read(f for f in sorted(self.farms.values(), key=lambda f: f['FarmId'])
+                          if f['PlayerId'] == player_id)
+
+    def get_farm_by_id(self, farm_id):
+        """Get farm info by ID"""
+        result = self._read([self.farms[farm_id]] if farm_id in self.farms else [])
+        return result[0] if result else None
+
+    # ==================== Plot Related ====================
+
+    def _plot_row(self, plot):
+        variety = self.crop_varieties.get(plot['CropVarietyId'])
+        row = dict(plot)
+        row['CropName'] = variety['Name'] if variety else None
+        row['GrowthHours'] = variety['GrowthHours'] if variety else None
+        return row
+
+    def get_farm_plots(self, farm_id):
+        """Get all plots of a farm"""
+        plots = sorted(self._farm_plots(farm_id), key=lambda p: (p['X'], p['Y']))
+        return self._read(self._plot_row(p) for p in plots)
+
+    def _farm_plots(self, farm_id):
+        return [self.plots[plot_id] for plot_id in self.farm_plot_ids.get(farm_id, ())]
+
+    def get_plot(self, plot_id):
+        """Get a single plot"""
+        plot = self.plots.get(plot_id)
+        result = self._read([self._plot_row(plot)] if plot else [])
+        return result[0] if result else None
+
+    def update_plot_status(self, plot_id, status):
+        """Update plot status"""
+        if plot_id not in self.plots:
+            return False
+        self.plots[plot_id]['Status'] = status
+        return self._write()
+
+    def plant_crop(self, plot_id, crop_variety_id):
+        """Plant crop"""
+        plot = self.plots.get(plot_id)
+        if not plot or plot['Status'] != 'Empty':
+            return False
+        plot.update(Status='Growing', CropVarietyId=crop_variety_id, PlantedAt=self.clock())
+        return self._write()
+
+    def _is_ripe(self, plot):
+        variety = self.crop_varieties.get(plot['CropVarietyId'])
+        if not variety or not plot['PlantedAt']:
+            return False
+        elapsed = self.clock() - plot['PlantedAt']
+        return elapsed >= timedelta(hours=variety['GrowthHours'])
+
+    def harvest_plot(self, plot_id):
+        """Harvest crop"""
+        plot = self.plots.get(plot_id)
+        if not plot:
+            return False
+        if plot['Status'] != 'Mature' and not (plot['Status'] == 'Growing' and self._is_ripe(plot)):
+            return False
+        return self.reset_plot(plot_id)
+
+    def reset_plot(self, plot_id):
+        """Force reset plot to empty state"""
+        plot = self.plots.get(plot_id)
+        if not plot:
+            return False
+        plot.update(Status='Empty', CropVarietyId=None, PlantedAt=None,
+                    WaterLevel=0, FertilizerLevel=0)
+        return self._write()
+
+    def set_plot_levels(self, plot_id, water_level=None, fertilizer_level=None):
+        """Update soil moisture / fertilizer."""
+        plot = self.plots.get(plot_id)
+        if not plot or (water_level is None and fertilizer_level is None):
+            return False
+        if water_level is not None:
+            plot['WaterLevel'] = water_level
+        if fertilizer_level is not None:
+            plot['FertilizerLevel'] = fertilizer_level
+        return self._write()
+
+    def queue_plot_levels(self, plot_id, water_level=None, fertilizer_level=None):
+        """Writes are instant in memory"""
+        return self.set_plot_levels(plot_id, water_level, fertilizer_level)
+
+    def apply_daily_tick(self, farm_id, rain_delta=0, wither_factor=CROP_WITHER_FACTOR):
+        """Add rain and advance crop status, then return all plots"""
+        now = self.clock()
+        for plot in self._farm_plots(farm_id):
+            plot['WaterLevel'] = min(100, (plot['WaterLevel'] or 0) + rain_delta)
+            variety = self.crop_varieties.get(plot['CropVarietyId'])
+            if not variety or not plot['PlantedAt'] or plot['Status'] not in ('Growing', 'Mature'):
+                continue
+            elapsed_hours = (now - plot['PlantedAt']).total_seconds() / 3600
+            if variety['GrowthHours'] > 0 and elapsed_hours >= variety['GrowthHours'] * wither_factor:
+                plot['Status'] = 'Withered'
+            elif plot['Status'] == 'Growing' and elapsed_hours >= variety['GrowthHours']:
+                plot['Status'] = 'Mature'
+        self._write()
+        return self.get_farm_plots(farm_id)
+
+    # ==================== Inventory Related ====================
+
+    def get_farm_inventory(self, farm_id):
+        """Get farm inventory"""
+        rows = []
+        for (fid, item_id), quantity in self.inventory.items():
+            item = self.items.get(item_id)
+            if fid != farm_id or quantity <= 0 or not item:
+                continue
+            rows.append({
+                'InventoryId': item_id, 'FarmId': fid, 'ItemId': item_id, 'Quantity': quantity,
+                'Name': item['Name'], 'ItemType': item['ItemType'], 'BasePrice': item['BasePrice']
+            })
+        rows.sort(key=lambda row: (row['ItemType'], row['Name']))
+        return self._read(rows)
+
+    def update_inventory(self, farm_id, item_id, quantity_change):
+        """Update inventory quantity"""
+        key = (farm_id, item_id)
+        self.inventory[key] = self.inventory.get(key, 0) + quantity_change
+        return self._write()
+
+    def queue_inventory_change(self, farm_id, item_id, quantity_change):
+        """Writes are instant in memory"""
+        return self.update_inventory(farm_id, item_id, quantity_change)
+
+    # ==================== Crop Variety Related ====================
+
+    def get_all_crop_varieties(self):
+        """Get all crop varieties"""
+        return self._read(self.crop_varieties[k] for k in sorted(self.crop_varieties))
+
+    # ==================== Item Related ====================
+
+    def get_all_items(self):
+        """Get all items"""
+        return self._read(sorted(self.items.values(), key=lambda i: (i['ItemType'], i['Name'])))
+
+    def get_item_by_id(self, item_id):
+        """Get item catalog entry by ID"""
+        result = self._read([self.items[item_id]] if item_id in self.items else [])
+        return result[0] if result else None
+
+    # ==================== Action Log ====================
+
+    def log_action(self, player_id, farm_id, action, meta_json):
+        """Log player action"""
+        self.action_log.append((player_id, farm_id, action, meta_json))
+        return self._write()
+
+    def queue_action_log(self, player_id, farm_id, action, meta_json):
+        """Writes are instant in memory"""
+        return self.log_action(player_id, farm_id, action, meta_json)
+
+    def poll_write_failures(self):
+        """Nothing is ever queued, so nothing can fail in the background"""
+        return []
+
+    def poll_dropped_plots(self):
+        """Nothing is ever queued, so no levels are dropped"""
+        return []
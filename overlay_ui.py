@@ -4,19 +4,21 @@ Overlay UI for showing currently selected tool / seed icons.
 """
 import pygame
 
+from text_cache import get_text_cache
 from config import (
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
     COLOR_WHITE,
     COLOR_BLACK,
     COLOR_YELLOW,
+    OVERLAY_ICON_SIZE,
 )
 
 
 class OverlayUI:
     """Draws tool / seed icons on top of the HUD."""
 
-    ICON_SIZE = 64
+    ICON_SIZE = OVERLAY_ICON_SIZE
     SLOT_PADDING = 12
     TOOL_POS = (SCREEN_WIDTH - 40, SCREEN_HEIGHT - 40)
     SEED_POS = (SCREEN_WIDTH - 120, SCREEN_HEIGHT - 40)
@@ -34,6 +36,21 @@ class OverlayUI:
         )
         self.slot_surface.fill((0, 0, 0, 160))
 
+        # Fonts are created once; rendered labels come from the shared text cache
+        self.label_font = pygame.font.Font(None, 22)
+        self.fallback_font = pygame.font.Font(None, 20)
+        self.text_cache = get_text_cache()
+
+        # Pre-scale every tool / seed icon to the slot size
+        self.resources.warm_scaled_cache({'overlay': self.ICON_SIZE})
+
+    def get_rect(self):
+        """Screen area covered by both slots and their labels."""
+        slot_rect = self.slot_surface.get_rect(center=self.SEED_POS)
+        slot_rect.union_ip(self.slot_surface.get_rect(center=self.TOOL_POS))
+        label_height = 24
+        return slot_rect.inflate(4, 4).move(0, -label_height // 2).inflate(0, label_height)
+
     def draw(self):
         """Draw both tool and seed slots."""
         self._draw_slot(
@@ -66,24 +83,21 @@ class OverlayUI:
         )
 
         # Render icon if available
-        icon = self.resources.overlay_images.get(key)
-        if icon:
-            scaled_icon = pygame.transform.scale(icon, (self.ICON_SIZE, self.ICON_SIZE))
+        scaled_icon = self.resources.get_scaled(f"overlay/{key}", self.ICON_SIZE) if key else None
+        if scaled_icon:
             icon_rect = scaled_icon.get_rect(center=(x, y))
             self.screen.blit(scaled_icon, icon_rect)
         else:
             # Fallback text if icon missing
-            font = pygame.font.Font(None, 20)
-            text = font.render(key or "N/A", True, COLOR_WHITE)
+            text = self.text_cache.render(self.fallback_font, key or "N/A", COLOR_WHITE)
             text_rect = text.get_rect(center=(x, y))
             self.screen.blit(text, text_rect)
 
         if label:
-            font = pygame.font.Font(None, 22)
-            label_surf = font.render(label, True, COLOR_WHITE)
+            label_surf = self.text_cache.render(self.label_font, label, COLOR_WHITE)
             label_rect = label_surf.get_rect(midbottom=(x, slot_rect.top - 4))
             # subtle shadow for readability
             shadow_rect = label_rect.move(1, 1)
-            shadow = font.render(label, True, COLOR_BLACK)
+            shadow = self.text_cache.render(self.label_font, label, COLOR_BLACK)
             self.screen.blit(shadow, shadow_rect)
             self.screen.blit(label_surf, label_rect)
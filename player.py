@@ -43,6 +43,8 @@ class Player:
         self.direction_vector = pygame.math.Vector2()
         self.x = self.hitbox.left
         self.y = self.hitbox.top
+        # Sprite position at the previous simulation tick (for interpolated drawing)
+        self.prev_topleft = self.rect.topleft
 
         # Tool/seed selection for overlay UI
         self.tools = ['hoe', 'axe', 'water']
@@ -56,7 +58,7 @@ class Player:
         self.tool_action = None
         self.sleep = False
 
-    def update(self, dt, keys_pressed, tile_size, max_x, max_y, obstacles=None):
+    def update(self, dt, keys_pressed, tile_size, max_x, max_y, obstacles=None, collision_grid=None):
         """Update player state and resolve collisions using sprite-style hitbox handling."""
         self.is_moving = False
         self.direction_vector = pygame.math.Vector2()
@@ -88,7 +90,7 @@ class Player:
             self.direction_vector.update(0, 0)
             self.is_moving = False
         
-        self.move(dt, max_x, max_y, obstacles)
+        self.move(dt, max_x, max_y, obstacles, collision_grid)
         
         using_tool = self.tool_animation_time > 0
         if using_tool:
@@ -124,10 +126,23 @@ class Player:
                 self.animation_frame = (self.animation_frame + 1) % frame_count
                 self.animation_timer = 0
     
-    def draw(self, surface, camera_x=0, camera_y=0):
-        """Draw player"""
-        screen_x = self.rect.x - camera_x
-        screen_y = self.rect.y - camera_y
+    def store_previous_position(self):
+        """Remember where the sprite is before the next simulation tick"""
+        self.prev_topleft = self.rect.topleft
+    
+    def render_rect(self, alpha=1.0):
+        """Sprite rect between the previous (alpha 0) and current (alpha 1) tick"""
+        prev_x, prev_y = self.prev_topleft
+        rect = self.rect.copy()
+        rect.topleft = (round(prev_x + (self.rect.x - prev_x) * alpha),
+                        round(prev_y + (self.rect.y - prev_y) * alpha))
+        return rect
+    
+    def draw(self, surface, camera_x=0, camera_y=0, alpha=1.0):
+        """Draw player (interpolated ``alpha`` of the way from the previous tick)"""
+        rect = self.render_rect(alpha)
+        screen_x = rect.x - camera_x
+        screen_y = rect.y - camera_y
         
         if self.use_sprite_graphics:
             self.draw_sprite(surface, screen_x, screen_y)
@@ -140,8 +155,10 @@ class Player:
         
         if frames and len(frames) > 0:
             frame_index = min(self.animation_frame, len(frames) - 1)
-            sprite = frames[frame_index]
-            scaled_sprite = pygame.transform.scale(sprite, (self.width, self.height))
+            scaled_sprite = self.resources.get_scaled(
+                f"character/{self.current_action}/{frame_index}",
+                (self.width, self.height)
+            )
             sprite_rect = scaled_sprite.get_rect(topleft=(int(screen_x), int(screen_y)))
             surface.blit(scaled_sprite, sprite_rect)
         else:
@@ -259,21 +276,26 @@ class Player:
         self.pos = pygame.math.Vector2(center)
         self.x = self.hitbox.left
         self.y = self.hitbox.top
+        self.prev_topleft = self.rect.topleft
 
-    def move(self, dt, max_x, max_y, obstacles):
+    def move(self, dt, max_x, max_y, obstacles, collision_grid=None):
         """Move with axis-aligned collision resolution identical to the reference player."""
         if self.direction_vector.length_squared() > 0:
             self.direction_vector = self.direction_vector.normalize()
         
         # Horizontal axis
+        start = self.hitbox.copy()
         self.pos.x += self.direction_vector.x * self.speed * dt
         self.hitbox.centerx = round(self.pos.x)
+        self._sweep_grid('horizontal', collision_grid, start)
         self._resolve_collisions('horizontal', obstacles)
         self.rect.center = self.hitbox.center
         
         # Vertical axis
+        start = self.hitbox.copy()
         self.pos.y += self.direction_vector.y * self.speed * dt
         self.hitbox.centery = round(self.pos.y)
+        self._sweep_grid('vertical', collision_grid, start)
         self._resolve_collisions('vertical', obstacles)
         self.rect.center = self.hitbox.center
         
@@ -285,9 +307,31 @@ class Player:
         self.x = self.hitbox.left
         self.y = self.hitbox.top
 
+    def _sweep_grid(self, axis, grid, start):
+        """Stop the hitbox at the first blocked tile between ``start`` and its new position."""
+        if grid is None:
+            return
+        if axis == 'horizontal':
+            delta = self.hitbox.x - start.x
+            allowed = grid.sweep_x(start, delta)
+            if allowed != delta:
+                self.hitbox.x = start.x + allowed
+                self.pos.x = self.hitbox.centerx
+        else:
+            delta = self.hitbox.y - start.y
+            allowed = grid.sweep_y(start, delta)
+            if allowed != delta:
+                self.hitbox.y = start.y + allowed
+                self.pos.y = self.hitbox.centery
+
     def _resolve_collisions(self, axis, obstacles):
         if not obstacles:
             return
+        if hasattr(obstacles, 'query_rect'):
+            # Spatial index: only test obstacles around the hitbox (with margin
+            # for obstacles the hitbox may be pushed into while resolving)
+            search = self.hitbox.inflate(self.hitbox.width, self.hitbox.height)
+            obstacles = obstacles.query_rect(search)
         for ob in obstacles:
             rect = ob.hitbox if hasattr(ob, "hitbox") else ob
             if not self.hitbox.colliderect(rect):
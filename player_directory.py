@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Paginated, prefetching player directory for the login screen.
+
+Only a window of a few keyset pages of active players (in PlayerId order,
+each player carrying its farms) is held in memory. While the player browses,
+the pages just past both ends of the window -- wrapping from the last player
+to the first and back -- are loaded on db.submit workers, so stepping to the
+next/previous player normally never waits for a query. Name search runs in
+the background too and recentres the window on the first match.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from config import LOGIN_DIRECTORY_PAGES, LOGIN_PAGE_SIZE
+
+# (key, backward) arguments of a get_player_page call
+PageSpec = Tuple[Optional[int], bool]
+
+
+class PlayerDirectory:
+    """Windowed view of all active players with a selected position."""
+
+    def __init__(self, db, page_size: int = LOGIN_PAGE_SIZE,
+                 max_pages: int = LOGIN_DIRECTORY_PAGES):
+        self.db = db
+        self.page_size = max(1, page_size)
+        self.max_players = self.page_size * max(2, max_pages)
+        self.total = 0              # active players (positions 0 .. total-1)
+        self.index = 0              # selected position
+        self.window: List[dict] = []
+        self.window_start = 0       # position of window[0]
+        self.search_missed = False  # last search found nobody
+        self._prefetch: Dict[str, Tuple[PageSpec, Future]] = {}
+        self._search: Optional[Future] = None
+
+    def load(self):
+        """Count the players and load the first page (blocking, once)"""
+        self.total = self.db.count_active_players()
+        self._set_window(self.db.get_player_page(limit=self.page_size), 0)
+        self.index = 0
+        self._prefetch_neighbours()
+
+    @property
+    def window_end(self) -> int:
+        return self.window_start + len(self.window)
+
+    def current(self) -> Optional[dict]:
+        """Selected player dict (with 'Farms'), or None if there are no players"""
+        if self.window_start <= self.index < self.window_end:
+            return self.window[self.index - self.window_start]
+        return None
+
+    # ==================== Navigation ====================
+
+    def move(self, direction: int) -> Optional[dict]:
+        """Select the previous (direction < 0) / next player, wrapping around the ends"""
+        if not self.total:
+            return None
+        side = 'next' if direction > 0 else 'prev'
+        target = (self.index + (1 if direction > 0 else -1)) % self.total
+        if not self.window_start <= target < self.window_end:
+            self._extend(side)
+        if not self.window_start <= target < self.window_end:
+            # Players were removed since they were counted; start over
+            self.load()
+            return self.current()
+        self.index = target
+        self._prefetch_neighbours()
+        return self.current()
+
+    def _spec(self, side: str) -> PageSpec:
+        """get_player_page arguments for the page past one end of the window"""
+        if side == 'next':
+            # Past the last player: the first page
+            return (self.window[-1]['PlayerId'] if self.window_end < self.total else None, False)
+        # Before the first player: the last page
+        return (self.window[0]['PlayerId'] if self.window_start > 0 else None, True)
+
+    def _fetch(self, spec: PageSpec) -> List[dict]:
+        key, backward = spec
+        return self.db.get_player_page(key, limit=self.page_size, backward=backward)
+
+    def _extend(self, side: str):
+        """Add the page past ``side`` of the window (prefetched if possible)"""
+        spec = self._spec(side)
+        page = None
+        pending = self._prefetch.pop(side, None)
+        if pending and pending[0] == spec:
+            try:
+                page = pending[1].result()
+            except Exception as e:
+                print(f"Player page prefetch failed: {e}")
+        if page is None:
+            page = self._fetch(spec)
+        key = spec[0]
+        if side == 'next':
+            if key is None:
+                self._set_window(page, 0)
+            else:
+                self.window.extend(page)
+                self._trim(keep_end=True)
+        elif key is None:
+            self._set_window(page, max(0, self.total - len(page)))
+        else:
+            self.window[:0] = page
+            self.window_start -= len(page)
+            self._trim(keep_end=False)
+
+    def _trim(self, keep_end: bool):
+        """Drop players from the far end once the window holds more than max_players"""
+        excess = len(self.window) - self.max_players
+        if excess <= 0:
+            return
+        if keep_end:
+            del self.window[:excess]
+            self.window_start += excess
+        else:
+            del self.window[-excess:]
+
+    def _set_window(self, page: List[dict], start: int):
+        self.window = list(page)
+        self.window_start = start
+        if not self.window:
+            self.total = 0
+
+    def _prefetch_neighbours(self):
+        """Start loading the page past each end the selection is within a page of"""
+        if len(self.window) >= self.total:
+            self._cancel_prefetch()
+            return
+        near = {'next': self.window_end - self.index <= self.page_size,
+                'prev': self.index - self.window_start < self.page_size}
+        for side in ('next', 'prev'):
+            if not near[side]:
+                continue
+            spec = self._spec(side)
+            pending = self._prefetch.get(side)
+            if pending and pending[0] == spec:
+                continue
+            if pending:
+                pending[1].cancel()
+            self._prefetch[side] = (spec, self.db.submit(self._fetch, spec))
+
+    def _cancel_prefetch(self):
+        for _, future in self._prefetch.values():
+            future.cancel()
+        self._prefetch.clear()
+
+    # ==================== Search ====================
+
+    def search(self, prefix: str):
+        """Jump to the first player whose name starts with ``prefix`` (applied by poll)"""
+        if self._search is not None:
+            self._search.cancel()
+        self._search = self.db.submit(self._locate, prefix) if prefix else None
+        self.search_missed = False
+
+    def _locate(self, prefix: str):
+        """Worker side of search: (total, window, window_start, index) or None"""
+        player = self.db.find_player_by_name(prefix)
+        if player is None:
+            return None
+        player_id = player['PlayerId']
+        position = self.db.count_active_players(player_id)
+        # Half a page before the match, then a page starting at it
+        before = self.db.get_player_page(player_id, limit=max(1, self.page_size // 2), backward=True)
+        page = self.db.get_player_page(before[-1]['PlayerId'] if before else None,
+                                       limit=self.page_size)
+        return self.db.count_active_players(), before + page, position - len(before), position
+
+    def poll(self) -> bool:
+        """Apply a finished search; True if the selected player changed"""
+        future = self._search
+        if future is None or not future.done():
+            return False
+        self._search = None
+        try:
+            found = future.result()
+        except Exception as e:
+            print(f"Player search failed: {e}")
+            found = None
+        if found is None:
+            self.search_missed = True
+            return False
+        self.total, window, start, index = found
+        self._set_window(window, start)
+        self.index = index
+        self._cancel_prefetch()
+        self._prefetch_neighbours()
+        return True
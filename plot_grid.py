@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Dense plot index aligned to the TMX tile grid.
+
+One cell per map tile holds the plot drawn on that tile (or None), so a
+world point maps to its tile and then to its plot with two divisions and a
+list index, however many plots the farm has. The "Farmable" tile layer
+marks where plots may be; plots placed elsewhere are still indexed but
+reported by :meth:`PlotGrid.place`.
+"""
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+
+class PlotGrid:
+    """Tile -> plot lookup table plus the farmable mask of the map."""
+
+    def __init__(self, cols: int, rows: int, tile_width: int, tile_height: int,
+                 farmable: Optional[np.ndarray] = None):
+        self.cols = cols
+        self.rows = rows
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        # No Farmable layer: every tile may hold a plot
+        self.farmable = (np.ones((rows, cols), dtype=bool) if farmable is None
+                         else np.asarray(farmable, dtype=bool))
+        self._cells: List[Optional[dict]] = [None] * (cols * rows)
+        self._placed: Dict[Hashable, int] = {}   # plot key -> cell index
+        self._owners: Dict[int, Hashable] = {}   # cell index -> plot key
+
+    @classmethod
+    def from_gids(cls, gids: Sequence[int], cols: int, rows: int,
+                  tile_width: int, tile_height: int) -> "PlotGrid":
+        """Every non-empty cell of a row-major tile layer is farmable."""
+        gids = np.asarray(gids, dtype=np.uint32)
+        return cls(cols, rows, tile_width, tile_height, gids.reshape(rows, cols) != 0)
+
+    def __len__(self) -> int:
+        """Number of indexed plots."""
+        return len(self._placed)
+
+    def clear(self):
+        self._cells = [None] * (self.cols * self.rows)
+        self._placed.clear()
+        self._owners.clear()
+
+    # ==================== Lookups ====================
+
+    def tile_at(self, x: float, y: float) -> Optional[Tuple[int, int]]:
+        """Tile containing world point (x, y), or None outside the map."""
+        tile_x = int(x // self.tile_width)
+        tile_y = int(y // self.tile_height)
+        if 0 <= tile_x < self.cols and 0 <= tile_y < self.rows:
+            return tile_x, tile_y
+        return None
+
+    def is_farmable(self, tile_x: int, tile_y: int) -> bool:
+        if 0 <= tile_x < self.cols and 0 <= tile_y < self.rows:
+            return bool(self.farmable[tile_y, tile_x])
+        return False
+
+    def plot_at_tile(self, tile_x: int, tile_y: int) -> Optional[dict]:
+        if 0 <= tile_x < self.cols and 0 <= tile_y < self.rows:
+            return self._cells[tile_y * self.cols + tile_x]
+        return None
+
+    def plot_at(self, x: float, y: float) -> Optional[dict]:
+        """Plot on the tile under world point (x, y), if any."""
+        tile = self.tile_at(x, y)
+        return self.plot_at_tile(*tile) if tile else None
+
+    def plots_in_rect(self, rect: pygame.Rect) -> List[dict]:
+        """Plots on the tiles overlapped by ``rect`` (row by row, no duplicates)."""
+        x0 = max(0, rect.left // self.tile_width)
+        x1 = min(self.cols - 1, (rect.right - 1) // self.tile_width)
+        y0 = max(0, rect.top // self.tile_height)
+        y1 = min(self.rows - 1, (rect.bottom - 1) // self.tile_height)
+        plots = []
+        for tile_y in range(y0, y1 + 1):
+            row = tile_y * self.cols
+            for plot in self._cells[row + x0:row + x1 + 1]:
+                if plot is not None:
+                    plots.append(plot)
+        return plots
+
+    # ==================== Placement ====================
+
+    def place(self, plot: dict, key: Hashable = None) -> bool:
+        """Index ``plot`` at the tile under its ``world_rect`` top-left corner.
+
+        A plot that moved is removed from its old tile first. Returns False if
+        the tile is outside the map or not farmable (the plot is still indexed
+        when it is inside the map).
+        """
+        key = plot.get('PlotId') if key is None else key
+        self.remove(key)
+        rect = plot['world_rect']
+        tile = self.tile_at(rect.x, rect.y)
+        if tile is None:
+            return False
+        index = tile[1] * self.cols + tile[0]
+        # Two plots on one tile: the later one wins
+        self._placed.pop(self._owners.get(index), None)
+        self._cells[index] = plot
+        self._placed[key] = index
+        self._owners[index] = key
+        return bool(self.farmable[tile[1], tile[0]])
+
+    def remove(self, key: Hashable):
+        index = self._placed.pop(key, None)
+        if index is not None:
+            self._cells[index] = None
+            del self._owners[index]
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Built-in frame profiler.
+
+Functions decorated with ``@profiled('name')`` (and ``with
+profiler.section('name')`` blocks) are timed while the profiler is enabled;
+when it is off the decorator costs one attribute check. Per-frame section
+times and counters (blits, DB calls, ...) are kept for the last
+PROFILER_HISTORY frames for the on-screen graph (profiler_overlay.py), and
+every timed call of the last PROFILER_TRACE_FRAMES frames can be written as
+Chrome trace JSON (chrome://tracing or https://ui.perfetto.dev). Nothing here
+imports pygame.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from config import (PROFILER_ENABLED, PROFILER_HISTORY, PROFILER_TRACE_DIR,
+                    PROFILER_TRACE_FRAMES)
+
+# (name, start, end, thread id) of one timed call
+TraceEvent = Tuple[str, float, float, int]
+
+# Trace export directory (relative PROFILER_TRACE_DIR is taken from the game directory)
+TRACE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), PROFILER_TRACE_DIR)
+
+
+@dataclass
+class FrameSample:
+    """Timings of one frame: total seconds, seconds per section, counter values."""
+
+    start: float
+    total: float
+    sections: Dict[str, float] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+
+
+class Profiler:
+    """Collects section timings and counters per frame."""
+
+    def __init__(self, enabled: bool = PROFILER_ENABLED, history: int = PROFILER_HISTORY,
+                 trace_frames: int = PROFILER_TRACE_FRAMES):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.history: Deque[FrameSample] = deque(maxlen=max(1, history))
+        self.trace: Deque[Tuple[FrameSample, List[TraceEvent]]] = deque(maxlen=max(1, trace_frames))
+        self.frame_index = 0
+        self.origin = time.perf_counter()
+        self.thread_names: Dict[int, str] = {}
+        self._frame_start: Optional[float] = None
+        self._sections: Dict[str, float] = defaultdict(float)
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._events: List[TraceEvent] = []
+
+    def set_enabled(self, enabled: bool):
+        """Turn recording on/off (history and trace start over when turned on)."""
+        if enabled and not self.enabled:
+            with self.lock:
+                self.history.clear()
+                self.trace.clear()
+                self._sections.clear()
+                self._counters.clear()
+                self._events = []
+                self._frame_start = None
+        self.enabled = enabled
+
+    # ==================== Recording ====================
+
+    def record(self, name: str, start: float, end: float):
+        """Add one timed call of section ``name`` to the current frame."""
+        thread = threading.current_thread()
+        with self.lock:
+            self._sections[name] += end - start
+            self._events.append((name, start, end, thread.ident))
+            if thread.ident not in self.thread_names:
+                self.thread_names[thread.ident] = thread.name
+
+    @contextmanager
+    def section(self, name: str):
+        """Time the enclosed block as section ``name``."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def count(self, name: str, amount: int = 1):
+        """Add ``amount`` to counter ``name`` for the current frame."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self._counters[name] += amount
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Close the current frame and store its sample."""
+        if not self.enabled or self._frame_start is None:
+            return
+        end = time.perf_counter()
+        with self.lock:
+            sample = FrameSample(self._frame_start, end - self._frame_start,
+                                 dict(self._sections), dict(self._counters))
+            events, self._events = self._events, []
+            self._sections.clear()
+            self._counters.clear()
+        self.history.append(sample)
+        self.trace.append((sample, events))
+        self.frame_index += 1
+        self._frame_start = None
+
+    # ==================== Reporting ====================
+
+    def averages(self, frames: int = 60) -> Tuple[float, float, Dict[str, float], Dict[str, float]]:
+        """Mean / max frame seconds, mean section seconds and mean counters over recent frames."""
+        samples = list(self.history)[-frames:]
+        if not samples:
+            return 0.0, 0.0, {}, {}
+        sections: Dict[str, float] = defaultdict(float)
+        counters: Dict[str, float] = defaultdict(float)
+        for sample in samples:
+            for name, seconds in sample.sections.items():
+                sections[name] += seconds
+            for name, value in sample.counters.items():
+                counters[name] += value
+        n = len(samples)
+        return (sum(sample.total for sample in samples) / n,
+                max(sample.total for sample in samples),
+                {name: value / n for name, value in sections.items()},
+                {name: value / n for name, value in counters.items()})
+
+    def trace_events(self) -> List[dict]:
+        """Recorded frames as Chrome trace events (complete events + counters)."""
+        pid = os.getpid()
+        main_tid = threading.main_thread().ident
+
+        def us(seconds):
+            return round((seconds - self.origin) * 1e6, 1)
+
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in self.thread_names.items()]
+        for sample, calls in list(self.trace):
+            events.append({'name': 'frame', 'cat': 'frame', 'ph': 'X', 'pid': pid, 'tid': main_tid,
+                           'ts': us(sample.start), 'dur': round(sample.total * 1e6, 1)})
+            if sample.counters:
+                events.append({'name': 'counters', 'ph': 'C', 'pid': pid, 'tid': main_tid,
+                               'ts': us(sample.start), 'args': dict(sample.counters)})
+            for name, start, end, tid in calls:
+                events.append({'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'pid': pid,
+                               'tid': tid, 'ts': us(start), 'dur': round((end - start) * 1e6, 1)})
+        return events
+
+    def export_trace(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the recorded frames as Chrome trace JSON; returns the path (None on error)."""
+        if path is None:
+            path = os.path.join(TRACE_DIR, time.strftime('trace-%Y%m%d-%H%M%S.json'))
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, f)
+        except OSError as e:
+            print(f"Failed to write trace {path}: {e}")
+            return None
+        return path
+
+
+def profiled(name: str, counter: Optional[str] = None) -> Callable:
+    """Decorator: time every call as section ``name`` (and bump ``counter``)."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            if counter:
+                profiler.count(counter)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, start, time.perf_counter())
+        return wrapper
+    return decorate
+
+
+# Global profiler instance
+profiler = None
+
+
+def get_profiler() -> Profiler:
+    """Get the shared profiler"""
+    global profiler
+    if profiler is None:
+        profiler = Profiler()
+    return profiler
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+On-screen frame-time graph for the built-in profiler (profiler.py).
+
+Kept apart from profiler.py so that the profiler, and the database modules
+that use @profiled, do not import pygame.
+"""
+import pygame
+
+from config import FPS
+from profiler import Profiler
+
+
+class ProfilerOverlay:
+    """Frame-time graph with per-section bars and counters, drawn top-right."""
+
+    # Stacked in this order in the graph (sections nest, so only leaves are stacked)
+    GRAPH_SECTIONS = [
+        ('update', (90, 160, 255)),
+        ('map', (80, 200, 120)),
+        ('plots', (230, 200, 60)),
+        ('entities', (240, 130, 50)),
+        ('ui', (200, 90, 200)),
+    ]
+    GRAPH_HEIGHT = 70
+    GRAPH_MS = 2000.0 / FPS  # graph top = two frame budgets
+
+    def __init__(self, profiler: Profiler, font: pygame.font.Font, text_cache):
+        self.profiler = profiler
+        self.font = font
+        self.text_cache = text_cache
+
+    def area(self, screen_rect: pygame.Rect) -> pygame.Rect:
+        """Screen rect covered by the overlay."""
+        width = self.profiler.history.maxlen * 2 + 20
+        lines = len(self.GRAPH_SECTIONS) + 3
+        height = self.GRAPH_HEIGHT + 32 + lines * self.font.get_linesize()
+        return pygame.Rect(screen_rect.right - width - 10, 90, width, height)
+
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
+        area = self.area(screen.get_rect())
+        screen.blit(self.text_cache.panel(area.size, (0, 0, 0), 190), area)
+
+        # Frame-time graph: grey = whole frame, coloured = sections
+        graph = pygame.Rect(area.x + 10, area.y + 10, area.width - 20, self.GRAPH_HEIGHT)
+        scale = graph.height / (self.GRAPH_MS / 1000.0)
+        samples = list(self.profiler.history)
+        x = graph.right - 2 * len(samples)
+        for sample in samples:
+            bar = min(graph.height, int(sample.total * scale))
+            pygame.draw.rect(screen, (90, 90, 90), (x, graph.bottom - bar, 2, bar))
+            y = graph.bottom
+            for name, color in self.GRAPH_SECTIONS:
+                height = int(sample.sections.get(name, 0.0) * scale)
+                if height > 0:
+                    height = min(height, y - graph.top)
+                    y -= height
+                    pygame.draw.rect(screen, color, (x, y, 2, height))
+            x += 2
+        budget_y = graph.bottom - graph.height // 2
+        pygame.draw.line(screen, (255, 80, 80), (graph.left, budget_y), (graph.right, budget_y))
+
+        # Averages over the last second
+        mean, worst, sections, counters = self.profiler.averages(FPS)
+        lines = [(f"frame {mean * 1000:.1f} ms  max {worst * 1000:.1f} ms", (255, 255, 255))]
+        for name, color in self.GRAPH_SECTIONS:
+            lines.append((f"{name:<9}{sections.get(name, 0.0) * 1000:6.2f} ms", color))
+        db_ms = sum(seconds for name, seconds in sections.items() if name.startswith('db.'))
+        lines.append((f"db {counters.get('db', 0.0):.1f} calls  {db_ms * 1000:.2f} ms   "
+                      f"world blits {counters.get('blits', 0.0):.0f}", (220, 220, 220)))
+        lines.append(("F3 hide   F4 save trace", (160, 160, 160)))
+        y = graph.bottom + 6
+        for text, color in lines:
+            screen.blit(self.text_cache.render(self.font, text, color), (graph.left, y))
+            y += self.font.get_linesize()
+        return area
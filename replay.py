@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+Deterministic session recording and headless replay.
+
+A recording holds everything the farm scene's simulation depends on:
+
+* a snapshot of the farm's database rows at load time,
+* the seed of the scene's random generator (decorations, apples, rain),
+* per fixed tick: the held movement keys and the input events handled
+  before that tick.
+
+The scene's clock (crop growth) and the in-memory database's clock advance
+by whole ticks from the recording's start time, so a replay does not depend
+on how fast it runs.
+
+File layout: ``FGRP``, version (u8), header length (u32), JSON header, then
+the zlib-compressed tick stream. Each record is ``<BBH`` (held-key mask,
+event count, repeat) followed by its events; identical idle ticks collapse
+into one record and a record's events belong to its first tick.
+
+    python replay.py .cache/replays/session-20261016-120000.frep
+    python replay.py session.frep --render     # also draw every tick
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
+
+import pygame
+
+from config import REPLAY_DIR, SCREEN_HEIGHT, SCREEN_WIDTH, SIM_TICK_RATE
+
+MAGIC = b'FGRP'
+VERSION = 1
+# Recordings directory (relative REPLAY_DIR is taken from the game directory)
+RECORDING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), REPLAY_DIR)
+
+# Keys Player.update polls, one bit each in the per-tick mask
+RECORDED_KEYS = (pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d,
+                 pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
+KEY_BITS = {key: bit for bit, key in enumerate(RECORDED_KEYS)}
+
+# Event codes and payloads of the input events the farm scene reacts to
+EVENT_KEYDOWN = 1      # key (u32)
+EVENT_MOUSEDOWN = 2    # button, x, y
+EVENT_MOUSEWHEEL = 3   # y
+EVENT_FORMATS = {EVENT_KEYDOWN: '<I', EVENT_MOUSEDOWN: '<Bhh', EVENT_MOUSEWHEEL: '<b'}
+
+_RECORD = struct.Struct('<BBH')
+_EPOCH = datetime(1970, 1, 1)
+
+Event = Tuple[int, tuple]
+
+
+def encode_event(event) -> Optional[Event]:
+    """(code, payload) for a pygame event worth recording, else None"""
+    if event.type == pygame.KEYDOWN:
+        return EVENT_KEYDOWN, (event.key,)
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        return EVENT_MOUSEDOWN, (event.button, event.pos[0], event.pos[1])
+    if event.type == pygame.MOUSEWHEEL:
+        return EVENT_MOUSEWHEEL, (max(-128, min(127, event.y)),)
+    return None
+
+
+def decode_event(code: int, payload: tuple):
+    """Rebuild the pygame event a recorded (code, payload) stands for"""
+    if code == EVENT_KEYDOWN:
+        return pygame.event.Event(pygame.KEYDOWN, key=payload[0], mod=0, unicode='')
+    if code == EVENT_MOUSEDOWN:
+        button, x, y = payload
+        return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=(x, y))
+    return pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=payload[0])
+
+
+class KeyMask:
+    """Stands in for pygame.key.get_pressed(): only the recorded keys, from a bit mask."""
+
+    def __init__(self):
+        self.mask = 0
+
+    def __call__(self):
+        return self
+
+    def __getitem__(self, key):
+        bit = KEY_BITS.get(key)
+        return bit is not None and bool(self.mask >> bit & 1)
+
+    def capture(self, pressed) -> int:
+        """Take the recorded keys from a real get_pressed() result"""
+        self.mask = sum(1 << bit for bit, key in enumerate(RECORDED_KEYS) if pressed[key])
+        return self.mask
+
+
+class TickClock:
+    """Epoch seconds that only move when a simulation tick runs."""
+
+    def __init__(self, start: float, dt: float):
+        self.start = start
+        self.dt = dt
+        self.ticks = 0
+
+    def __call__(self) -> float:
+        return self.start + self.ticks * self.dt
+
+    def utcnow(self) -> datetime:
+        """Same time as a naive UTC datetime (MemoryDatabase.clock)"""
+        return _EPOCH + timedelta(seconds=self())
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot store {type(value).__name__} in a replay header")
+
+
+def snapshot_farm(db, player_id, farm_id) -> dict:
+    """Rows the farm scene loads, for MemoryDatabase.load_snapshot"""
+    return {
+        'player': db.get_player_by_id(player_id),
+        'farm': db.get_farm_by_id(farm_id),
+        'plots': db.get_farm_plots(farm_id),
+        'inventory': db.get_farm_inventory(farm_id),
+        'items': db.get_all_items(),
+        'varieties': db.get_all_crop_varieties(),
+    }
+
+
+def state_digest(db, player_id, farm_id) -> str:
+    """Hash of the player, plots and inventory (compare replays of one log)"""
+    state = {
+        'player': db.get_player_by_id(player_id),
+        'plots': db.get_farm_plots(farm_id),
+        'inventory': db.get_farm_inventory(farm_id),
+    }
+    data = json.dumps(state, sort_keys=True, default=_json_value)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class ReplayLog:
+    """Header plus the list of [mask, events, repeat] tick records."""
+
+    def __init__(self, header: dict, records: Optional[list] = None):
+        self.header = header
+        self.records = records if records is not None else []
+
+    @property
+    def tick_count(self) -> int:
+        return sum(repeat for _mask, _events, repeat in self.records)
+
+    def append(self, mask: int, events: List[Event]):
+        last = self.records[-1] if self.records else None
+        if not events and last and last[0] == mask and not last[1] and last[2] < 0xFFFF:
+            last[2] += 1
+        else:
+            self.records.append([mask, list(events), 1])
+
+    def ticks(self) -> Iterator[Tuple[int, List[Event]]]:
+        """(mask, events) for every tick in order"""
+        for mask, events, repeat in self.records:
+            yield mask, events
+            for _ in range(repeat - 1):
+                yield mask, []
+
+    def to_bytes(self) -> bytes:
+        stream = bytearray()
+        for mask, events, repeat in self.records:
+            stream += _RECORD.pack(mask, len(events), repeat)
+            for code, payload in events:
+                stream.append(code)
+                stream += struct.pack(EVENT_FORMATS[code], *payload)
+        header = json.dumps(self.header, default=_json_value).encode('utf-8')
+        return (MAGIC + struct.pack('<BI', VERSION, len(header)) + header
+                + zlib.compress(bytes(stream), 9))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ReplayLog':
+        if data[:4] != MAGIC:
+            raise ValueError("Not a replay file")
+        version, header_len = struct.unpack_from('<BI', data, 4)
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        offset = 4 + struct.calcsize('<BI')
+        header = json.loads(data[offset:offset + header_len].decode('utf-8'))
+        stream = zlib.decompress(data[offset + header_len:])
+        records, pos = [], 0
+        while pos < len(stream):
+            mask, count, repeat = _RECORD.unpack_from(stream, pos)
+            pos += _RECORD.size
+            events = []
+            for _ in range(count):
+                code = stream[pos]
+                fmt = EVENT_FORMATS[code]
+                events.append((code, struct.unpack_from(fmt, stream, pos + 1)))
+                pos += 1 + struct.calcsize(fmt)
+            records.append([mask, events, repeat])
+        return cls(header, records)
+
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> 'ReplayLog':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """
+    Records a live farm session. The game calls ``event`` for every event it
+    hands the scene and ``tick`` right before each fixed-timestep update.
+    """
+
+    def __init__(self, snapshot: dict, seed: Optional[int] = None,
+                 tick_rate: float = SIM_TICK_RATE, started_at: Optional[float] = None):
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        started_at = time.time() if started_at is None else started_at
+        self.log = ReplayLog({
+            'seed': self.seed,
+            'tick_rate': tick_rate,
+            'started_at': started_at,
+            'player_id': snapshot['player']['PlayerId'],
+            'farm_id': snapshot['farm']['FarmId'],
+            'snapshot': snapshot,
+        })
+        self.keys = KeyMask()
+        self.clock = TickClock(started_at, 1.0 / tick_rate)
+        self.pending: List[Event] = []
+
+    def make_rng(self) -> random.Random:
+        """The scene's random generator (pass as FarmScene(rng=...))"""
+        return random.Random(self.seed)
+
+    def attach(self, scene):
+        """Feed the scene recorded keys and the tick clock"""
+        scene.key_source = self.keys
+        scene.clock = self.clock
+
+    def event(self, event):
+        encoded = encode_event(event)
+        if encoded:
+            self.pending.append(encoded)
+
+    def tick(self, pressed):
+        self.log.append(self.keys.capture(pressed), self.pending)
+        self.pending = []
+        self.clock.ticks += 1
+
+    def save(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the recording; returns the path (None on error)"""
+        if path is None:
+            path = os.path.join(RECORDING_DIR, time.strftime('session-%Y%m%d-%H%M%S.frep'))
+        try:
+            return self.log.save(path)
+        except OSError as e:
+            print(f"Failed to write replay {path}: {e}")
+            return None
+
+
+def replay(path: str, render: bool = False, max_ticks: Optional[int] = None) -> dict:
+    """Run a recording headless as fast as possible; returns a report."""
+    from farm_scene import FarmScene
+    from memory_database import MemoryDatabase
+
+    log = ReplayLog.load(path)
+    header = log.header
+    player_id, farm_id = header['player_id'], header['farm_id']
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    clock = TickClock(header['started_at'], 1.0 / header['tick_rate'])
+    db = MemoryDatabase().load_snapshot(header['snapshot'])
+    db.clock = clock.utcnow
+
+    load_start = time.perf_counter()
+    scene = FarmScene(screen, db, db.get_player_by_id(player_id), db.get_farm_by_id(farm_id),
+                      rng=random.Random(header['seed']))
+    load_time = time.perf_counter() - load_start
+    keys = KeyMask()
+    scene.key_source = keys
+    scene.clock = clock
+
+    run_start = time.perf_counter()
+    for mask, events in log.ticks():
+        if max_ticks is not None and clock.ticks >= max_ticks:
+            break
+        left = False
+        for code, payload in events:
+            if scene.handle_event(decode_event(code, payload)) == "login":
+                left = True
+        if left:
+            break
+        keys.mask = mask
+        clock.ticks += 1
+        scene.update(clock.dt)
+        if render:
+            scene.draw()
+    run_time = time.perf_counter() - run_start
+
+    report = {
+        'ticks': clock.ticks,
+        'recorded_ticks': log.tick_count,
+        'sim_seconds': clock.ticks * clock.dt,
+        'scene_load_ms': load_time * 1000.0,
+        'run_seconds': run_time,
+        'realtime_factor': clock.ticks * clock.dt / run_time if run_time else 0.0,
+        'day': scene.day_counter,
+        'digest': state_digest(db, player_id, farm_id),
+    }
+    db.disconnect()
+    pygame.quit()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded farm session headless")
+    parser.add_argument('path', help="recording (.frep)")
+    parser.add_argument('--render', action='store_true', help="also draw every tick")
+    parser.add_argument('--ticks', type=int, help="stop after this many ticks")
+    parser.add_argument('--json', metavar='PATH', help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = replay(args.path, args.render, args.ticks)
+    print(f"Replayed {report['ticks']}/{report['recorded_ticks']} ticks "
+          f"({report['sim_seconds']:.1f} s) in {report['run_seconds']:.2f} s: "
+          f"{report['realtime_factor']:.1f}x real time, scene load {report['scene_load_ms']:.1f} ms")
+    print(f"Day {report['day']}  state digest {report['digest']}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    sys.exit(main())
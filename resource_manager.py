@@ -4,7 +4,108 @@
 """
 import pygame
 import os
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+from asset_cache import get_asset_cache
+from config import PLAYER_SIZE, TILE_SIZE, SCALED_CACHE_SIZE, OVERLAY_ICON_SIZE, ATLAS_CACHE_DIR
+from texture_atlas import TextureAtlas, pack_atlas, read_index, index_is_fresh, source_stamps
+
+# 资源根目录（以当前脚本所在目录为基准，避免工作目录不同导致找不到资源）
+GRAPHICS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "graphics")
+# 图集缓存目录（相对路径同样以脚本目录为基准）
+ATLAS_DIR = (os.path.join(os.path.dirname(os.path.abspath(__file__)), ATLAS_CACHE_DIR)
+             if ATLAS_CACHE_DIR else None)
+
+
+# 所有角色动作和方向
+CHARACTER_ACTIONS = [
+    'down', 'down_idle', 'down_axe', 'down_hoe', 'down_water',
+    'up', 'up_idle', 'up_axe', 'up_hoe', 'up_water',
+    'left', 'left_idle', 'left_axe', 'left_hoe', 'left_water',
+    'right', 'right_idle', 'right_axe', 'right_hoe', 'right_water'
+]
+
+# 土壤的所有状态
+SOIL_TYPES = [
+    'b', 'bl', 'bm', 'br', 'l', 'lm', 'lr', 'lrb', 'lrt',
+    'o', 'r', 'rm', 'soil', 't', 'tb', 'tbl', 'tbr',
+    'tl', 'tm', 'tr', 'x'
+]
+
+# 有生长阶段的作物
+CROP_NAMES = ['corn', 'tomato']
+
+OVERLAY_TOOLS = ['axe', 'corn', 'hoe', 'tomato', 'water']
+
+# 打包成纹理图集的资源族 -> 图集中每帧的尺寸（None 表示保持原始尺寸）
+# 尺寸与绘制尺寸一致，这样 get_scaled 可以直接返回图集的子表面
+ATLAS_FAMILIES = {
+    'character': (PLAYER_SIZE, PLAYER_SIZE),
+    'soil': (TILE_SIZE, TILE_SIZE),
+    'fruit': None,
+    'overlay': (OVERLAY_ICON_SIZE, OVERLAY_ICON_SIZE),
+}
+
+
+def list_frames(folder_path: str) -> List[str]:
+    """列出序列帧文件夹中排好序的 png 完整路径"""
+    full_path = os.path.join(GRAPHICS_PATH, folder_path)
+    return [os.path.join(full_path, f)
+            for f in sorted(f for f in os.listdir(full_path) if f.endswith('.png'))]
+
+
+def atlas_sources(family: str) -> Dict[str, str]:
+    """图集资源族的 {资源键: 源文件路径}"""
+    sources = {}
+    
+    def add_frames(prefix, folder_path):
+        try:
+            for i, path in enumerate(list_frames(folder_path)):
+                sources[f'{prefix}/{i}'] = path
+        except OSError:
+            pass
+    
+    if family == 'character':
+        for action in CHARACTER_ACTIONS:
+            add_frames(f'character/{action}', os.path.join('character', action))
+    elif family == 'soil':
+        for soil_type in SOIL_TYPES:
+            sources[f'soil/{soil_type}'] = os.path.join(GRAPHICS_PATH, 'soil', f'{soil_type}.png')
+        add_frames('soil_water', 'soil_water')
+    elif family == 'fruit':
+        sources['fruit/apple'] = os.path.join(GRAPHICS_PATH, 'fruit', 'apple.png')
+        for crop in CROP_NAMES:
+            add_frames(f'fruit/{crop}', os.path.join('fruit', crop))
+    elif family == 'overlay':
+        for tool in OVERLAY_TOOLS:
+            sources[f'overlay/{tool}'] = os.path.join(GRAPHICS_PATH, 'overlay', f'{tool}.png')
+    return sources
+
+
+def cached_atlas_families() -> List[str]:
+    """磁盘上仍然有效（源文件未改动）的图集资源族"""
+    if not ATLAS_DIR:
+        return []
+    families = []
+    for family, frame_size in ATLAS_FAMILIES.items():
+        index = read_index(ATLAS_DIR, family)
+        if index is not None and index_is_fresh(index, atlas_sources(family), frame_size):
+            families.append(family)
+    return families
+
+
+def resource_manifest(skip_families: Optional[List[str]] = None) -> List[str]:
+    """列出 graphics 目录下所有 png 文件（用于后台预解码），可跳过已有图集的资源族"""
+    skip = set()
+    for family in skip_families or []:
+        skip.update(os.path.normpath(path) for path in atlas_sources(family).values())
+    paths = []
+    for root, _, files in os.walk(GRAPHICS_PATH):
+        paths.extend(path for path in (os.path.normpath(os.path.join(root, f))
+                                       for f in sorted(files) if f.endswith('.png'))
+                     if path not in skip)
+    return paths
 
 
 class ResourceManager:
@@ -12,9 +113,9 @@ class ResourceManager:
     
     def __init__(self):
         """初始化资源管理器"""
-        # 始终以当前脚本所在目录为基准，避免工作目录不同导致找不到资源
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        self.graphics_path = os.path.join(base_dir, "graphics")
+        self.graphics_path = GRAPHICS_PATH
+        # 按路径共享的图片缓存（线程池解码）
+        self.assets = get_asset_cache()
         
         # 存储所有加载的资源
         self.character_animations = {}  # 角色动画
@@ -28,18 +129,21 @@ class ResourceManager:
         self.rain_drops = []            # 雨滴效果
         self.water_animation = []       # 水面动画
         self.world_images = {}          # 世界贴图
+        self.atlases: Dict[str, TextureAtlas] = {}  # 纹理图集（按资源族）
+        
+        # 缩放后贴图的 LRU 缓存: {(key, (w, h)): surface}
+        self.scaled_cache: "OrderedDict[Tuple[str, Tuple[int, int]], pygame.Surface]" = OrderedDict()
+        self.scaled_cache_size = SCALED_CACHE_SIZE
         
         # 加载所有资源
         self.load_all_resources()
+        self.warm_scaled_cache()
     
     def load_image(self, path: str, convert_alpha=True) -> pygame.Surface:
         """加载单个图片"""
         try:
             full_path = os.path.join(self.graphics_path, path)
-            if convert_alpha:
-                return pygame.image.load(full_path).convert_alpha()
-            else:
-                return pygame.image.load(full_path).convert()
+            return self.assets.load(full_path, convert_alpha)
         except Exception as e:
             print(f"加载图片失败 {path}: {e}")
             # 返回一个占位符表面
@@ -67,19 +171,12 @@ class ResourceManager:
         """加载角色所有动画"""
         print("正在加载角色动画...")
         
-        # 所有角色动作和方向
-        actions = [
-            'down', 'down_idle', 'down_axe', 'down_hoe', 'down_water',
-            'up', 'up_idle', 'up_axe', 'up_hoe', 'up_water',
-            'left', 'left_idle', 'left_axe', 'left_hoe', 'left_water',
-            'right', 'right_idle', 'right_axe', 'right_hoe', 'right_water'
-        ]
-        
-        for action in actions:
+        for action in CHARACTER_ACTIONS:
             folder_path = os.path.join('character', action)
             self.character_animations[action] = self.load_animation_frames(folder_path)
-            if self.character_animations[action]:
-                print(f"  ? 加载 {action}: {len(self.character_animations[action])} 帧")
+        
+        frame_count = sum(len(frames) for frames in self.character_animations.values())
+        print(f"  ? 加载 {len(self.character_animations)} 个动作: {frame_count} 帧")
     
     def load_environment(self):
         """加载环境物品"""
@@ -95,7 +192,8 @@ class ResourceManager:
         for file in env_files:
             name = file.replace('.png', '').replace(' ', '_').lower()
             self.environment_images[name] = self.load_image(os.path.join('environment', file))
-            print(f"  ? 加载 {name}")
+        
+        print(f"  ? 加载 {len(self.environment_images)} 种环境物品")
     
     def load_fruits(self):
         """加载水果/作物"""
@@ -105,13 +203,10 @@ class ResourceManager:
         self.fruit_images['apple'] = self.load_image(os.path.join('fruit', 'apple.png'))
         print("  ? 加载 apple")
         
-        # 玉米生长阶段
-        self.fruit_images['corn'] = self.load_animation_frames(os.path.join('fruit', 'corn'))
-        print(f"  ? 加载 corn: {len(self.fruit_images['corn'])} 阶段")
-        
-        # 番茄生长阶段
-        self.fruit_images['tomato'] = self.load_animation_frames(os.path.join('fruit', 'tomato'))
-        print(f"  ? 加载 tomato: {len(self.fruit_images['tomato'])} 阶段")
+        # 玉米、番茄生长阶段
+        for crop in CROP_NAMES:
+            self.fruit_images[crop] = self.load_animation_frames(os.path.join('fruit', crop))
+            print(f"  ? 加载 {crop}: {len(self.fruit_images[crop])} 阶段")
     
     def load_objects(self):
         """加载物体"""
@@ -126,30 +221,23 @@ class ResourceManager:
         for file in obj_files:
             name = file.replace('.png', '')
             self.objects_images[name] = self.load_image(os.path.join('objects', file))
-            print(f"  ? 加载 {name}")
+        
+        print(f"  ? 加载 {len(self.objects_images)} 种物体")
     
     def load_overlay(self):
         """加载工具覆盖层图标"""
         print("正在加载工具图标...")
         
-        tools = ['axe', 'corn', 'hoe', 'tomato', 'water']
-        
-        for tool in tools:
+        for tool in OVERLAY_TOOLS:
             self.overlay_images[tool] = self.load_image(os.path.join('overlay', f'{tool}.png'))
-            print(f"  ? 加载 {tool}")
+        
+        print(f"  ? 加载 {len(self.overlay_images)} 种工具图标")
     
     def load_soil(self):
         """加载土壤贴图"""
         print("正在加载土壤贴图...")
         
-        # 土壤的所有状态
-        soil_types = [
-            'b', 'bl', 'bm', 'br', 'l', 'lm', 'lr', 'lrb', 'lrt',
-            'o', 'r', 'rm', 'soil', 't', 'tb', 'tbl', 'tbr',
-            'tl', 'tm', 'tr', 'x'
-        ]
-        
-        for soil_type in soil_types:
+        for soil_type in SOIL_TYPES:
             path = os.path.join('soil', f'{soil_type}.png')
             self.soil_images[soil_type] = self.load_image(path)
         
@@ -188,19 +276,90 @@ class ResourceManager:
         print("开始加载游戏资源...")
         print("="*50)
         
-        self.load_character_animations()
-        self.load_environment()
-        self.load_fruits()
-        self.load_objects()
-        self.load_overlay()
-        self.load_soil()
-        self.load_effects()
-        self.load_world()
+        # 磁盘上有效的图集直接整张加载，其余图片先在线程池中并行解码，
+        # 下面的加载只做 convert_alpha
+        cached = cached_atlas_families()
+        self.assets.prefetch(resource_manifest(skip_families=cached))
+        
+        loaders = [
+            ('character', self.load_character_animations),
+            (None, self.load_environment),
+            ('fruit', self.load_fruits),
+            (None, self.load_objects),
+            ('overlay', self.load_overlay),
+            ('soil', self.load_soil),
+            (None, self.load_effects),
+            (None, self.load_world),
+        ]
+        for family, loader in loaders:
+            atlas = TextureAtlas.load(ATLAS_DIR, family) if family in cached else None
+            if atlas is not None:
+                self.install_atlas(atlas)
+                print(f"正在从图集加载 {family}: {len(atlas.regions)} 帧")
+            else:
+                loader()
+        
+        self.build_atlases()
+        self.assets.save_disk_cache()
         
         print("="*50)
         print("资源加载完成！")
         print("="*50 + "\n")
     
+    def build_atlases(self):
+        """把尚未打包的资源族缩放到绘制尺寸并打包成图集（可写入磁盘缓存）"""
+        for family, frame_size in ATLAS_FAMILIES.items():
+            if family in self.atlases:
+                continue
+            sources = atlas_sources(family)
+            images = {}
+            for key in sources:
+                surf = self.get_surface(key)
+                if surf is None:
+                    continue
+                if frame_size and surf.get_size() != frame_size:
+                    surf = pygame.transform.scale(surf, frame_size)
+                images[key] = surf
+            if not images:
+                continue
+            atlas = pack_atlas(family, images, frame_size, source_stamps(sources))
+            if ATLAS_DIR:
+                atlas.save(ATLAS_DIR)
+            self.install_atlas(atlas)
+    
+    def install_atlas(self, atlas: TextureAtlas):
+        """用图集子表面替换该资源族的单独贴图（子表面与图集共享像素）"""
+        family = atlas.name
+        self.atlases[family] = atlas
+        if family == 'character':
+            self.character_animations = {}
+        elif family == 'soil':
+            self.soil_images = {}
+            self.soil_water_images = []
+        elif family == 'fruit':
+            self.fruit_images = {}
+        elif family == 'overlay':
+            self.overlay_images = {}
+        
+        for key in atlas_sources(family):
+            if key not in atlas:
+                continue
+            surf = atlas.subsurface(key)
+            parts = key.split('/')
+            if parts[0] == 'character':
+                self.character_animations.setdefault(parts[1], []).append(surf)
+            elif parts[0] == 'soil_water':
+                self.soil_water_images.append(surf)
+            elif parts[0] == 'fruit' and len(parts) > 2:
+                self.fruit_images.setdefault(parts[1], []).append(surf)
+            else:
+                table = {'soil': self.soil_images, 'fruit': self.fruit_images,
+                         'overlay': self.overlay_images}[parts[0]]
+                table[parts[1]] = surf
+        
+        # 旧的缩放缓存可能引用了被替换的贴图
+        self.scaled_cache.clear()
+    
     def get_character_animation(self, action: str) -> List[pygame.Surface]:
         """获取角色动画"""
         return self.character_animations.get(action, [])
@@ -220,11 +379,129 @@ class ResourceManager:
     def get_soil_image(self, soil_type: str) -> pygame.Surface:
         """获取土壤贴图"""
         return self.soil_images.get(soil_type, self.soil_images.get('o'))
+    
+    def get_surface(self, key: str) -> Optional[pygame.Surface]:
+        """
+        按资源键获取原始贴图
+        键格式: 'character/down/0', 'soil/o', 'soil_water/1', 'objects/bush',
+        'overlay/axe', 'fruit/corn/2', 'environment/water', 'world/ground'
+        """
+        parts = key.split('/')
+        category = parts[0]
+        name = parts[1] if len(parts) > 1 else None
+        index = parts[2] if len(parts) > 2 else None
+        
+        if category == 'character':
+            frames = self.character_animations.get(name, [])
+            return self._pick_frame(frames, index)
+        if category == 'soil_water':
+            return self._pick_frame(self.soil_water_images, name)
+        if category == 'fruit':
+            data = self.fruit_images.get(name)
+            if isinstance(data, list):
+                return self._pick_frame(data, index)
+            return data
+        
+        tables = {
+            'soil': self.soil_images,
+            'objects': self.objects_images,
+            'overlay': self.overlay_images,
+            'environment': self.environment_images,
+            'world': self.world_images,
+        }
+        table = tables.get(category)
+        if table is None or name is None:
+            return None
+        return table.get(name)
+    
+    @staticmethod
+    def _pick_frame(frames: List[pygame.Surface], index) -> Optional[pygame.Surface]:
+        """从序列帧中取第 index 帧（越界时取最后一帧）"""
+        if not frames:
+            return None
+        try:
+            idx = int(index) if index is not None else 0
+        except (TypeError, ValueError):
+            return None
+        return frames[max(0, min(idx, len(frames) - 1))]
+    
+    def get_scaled(self, key: str, size: Union[int, Tuple[int, int]]) -> Optional[pygame.Surface]:
+        """获取缩放到指定尺寸的贴图（LRU 缓存，已转换为显示格式）"""
+        if isinstance(size, int):
+            size = (size, size)
+        size = (int(size[0]), int(size[1]))
+        cache_key = (key, size)
+        
+        cached = self.scaled_cache.get(cache_key)
+        if cached is not None:
+            self.scaled_cache.move_to_end(cache_key)
+            return cached
+        
+        source = self.get_surface(key)
+        if source is None:
+            return None
+        
+        if source.get_size() == size:
+            scaled = source
+        else:
+            scaled = pygame.transform.scale(source, size)
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                try:
+                    scaled = scaled.convert_alpha()
+                except pygame.error:
+                    pass
+        
+        self.scaled_cache[cache_key] = scaled
+        while len(self.scaled_cache) > self.scaled_cache_size:
+            self.scaled_cache.popitem(last=False)
+        return scaled
+    
+    def warm_scaled_cache(self, groups: Optional[Dict[str, int]] = None):
+        """预先缩放常用尺寸的贴图（角色、土壤、工具图标等）"""
+        if groups is None:
+            groups = {
+                'character': PLAYER_SIZE,
+                'soil': TILE_SIZE,
+                'soil_water': TILE_SIZE,
+            }
+        
+        for category, size in groups.items():
+            for key in self._iter_keys(category):
+                self.get_scaled(key, size)
+    
+    def _iter_keys(self, category: str) -> List[str]:
+        """列出某一类资源的全部资源键"""
+        if category == 'character':
+            return [f'character/{action}/{i}'
+                    for action, frames in self.character_animations.items()
+                    for i in range(len(frames))]
+        if category == 'soil_water':
+            return [f'soil_water/{i}' for i in range(len(self.soil_water_images))]
+        if category == 'fruit':
+            keys = []
+            for name, data in self.fruit_images.items():
+                if isinstance(data, list):
+                    keys.extend(f'fruit/{name}/{i}' for i in range(len(data)))
+                else:
+                    keys.append(f'fruit/{name}')
+            return keys
+        tables = {
+            'soil': self.soil_images,
+            'objects': self.objects_images,
+            'overlay': self.overlay_images,
+            'environment': self.environment_images,
+            'world': self.world_images,
+        }
+        return [f'{category}/{name}' for name in tables.get(category, {})]
 
 
 # 全局资源管理器实例
 resources = None
 
+def preload_resources():
+    """在后台线程池中开始解码图片（不阻塞），已有有效图集缓存的资源族不再解码"""
+    get_asset_cache().prefetch(resource_manifest(cached_atlas_families()))
+
 def init_resources():
     """初始化全局资源管理器"""
     global resources
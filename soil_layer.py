@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Autotiled, pre-baked soil under the farm plots.
+
+A tilled plot (any status but Empty) picks its soil graphic from which of
+its four neighbours are tilled too, so adjacent beds join into one field.
+Every plot's soil is drawn once into a single surface covering all plots;
+when a plot changes only that plot and its neighbours are redrawn, and a
+frame just blits the surface.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import pygame
+
+from config import COLOR_BROWN, PLOT_COLORS
+
+# Neighbour bits: tilled plot above, right, below, left
+TOP, RIGHT, BOTTOM, LEFT = 1, 2, 4, 8
+_NEIGHBOURS = ((0, -1, TOP), (1, 0, RIGHT), (0, 1, BOTTOM), (-1, 0, LEFT))
+
+
+def _soil_variant(mask: int) -> str:
+    """Soil graphic for a tilled plot whose tilled neighbours are ``mask``."""
+    t, r, b, l = (bool(mask & bit) for bit in (TOP, RIGHT, BOTTOM, LEFT))
+    count = t + r + b + l
+    if count == 4:
+        return 'x'
+    if count == 3:
+        return {LEFT: 'tbr', RIGHT: 'tbl', BOTTOM: 'lrb', TOP: 'lrt'}[~mask & 15]
+    if count == 2:
+        return {LEFT | RIGHT: 'lr', TOP | BOTTOM: 'tb',
+                LEFT | BOTTOM: 'tr', RIGHT | BOTTOM: 'tl',
+                LEFT | TOP: 'br', RIGHT | TOP: 'bl'}[mask]
+    if count == 1:
+        return {LEFT: 'r', RIGHT: 'l', TOP: 'b', BOTTOM: 't'}[mask]
+    return 'o'
+
+
+# Precomputed mask -> graphic table
+SOIL_VARIANTS = tuple(_soil_variant(mask) for mask in range(16))
+
+
+class SoilLayer:
+    """One baked surface with the soil of every plot, updated per plot."""
+
+    def __init__(self, get_image: Callable[[str], Optional[pygame.Surface]], tile_size: int):
+        # get_image('x') -> soil graphic already scaled to tile_size (or None)
+        self.get_image = get_image
+        self.tile_size = tile_size
+        self.surface: Optional[pygame.Surface] = None
+        self.bounds = pygame.Rect(0, 0, 0, 0)
+        self._plots: Dict[Tuple[int, int], dict] = {}
+        self._looks: Dict[Tuple[int, int], Hashable] = {}
+
+    @staticmethod
+    def _cell(plot: dict) -> Tuple[int, int]:
+        return plot['X'], plot['Y']
+
+    def _tilled(self, cell: Tuple[int, int]) -> bool:
+        plot = self._plots.get(cell)
+        return plot is not None and plot['Status'] != 'Empty'
+
+    def mask(self, plot: dict) -> int:
+        """4-neighbour bitmask of tilled plots around ``plot``."""
+        x, y = self._cell(plot)
+        mask = 0
+        for dx, dy, bit in _NEIGHBOURS:
+            if self._tilled((x + dx, y + dy)):
+                mask |= bit
+        return mask
+
+    def look(self, plot: dict) -> Hashable:
+        """What the soil of ``plot`` shows: ('soil', variant) or ('color', rgb)."""
+        if plot['Status'] != 'Empty':
+            variant = SOIL_VARIANTS[self.mask(plot)]
+            if self.get_image(variant) is not None:
+                return ('soil', variant)
+        return ('color', PLOT_COLORS.get(plot['Status'], COLOR_BROWN))
+
+    def shown(self, plot: dict) -> Optional[Hashable]:
+        """The look currently baked for ``plot`` (None if it is not in the layer)."""
+        return self._looks.get(self._cell(plot))
+
+    # ==================== Baking ====================
+
+    def rebuild(self, plots: Iterable[dict]):
+        """Bake the soil of all ``plots`` (plot positions changed or first load)."""
+        self._plots = {self._cell(plot): plot for plot in plots if plot.get('world_rect')}
+        self._looks = {}
+        rects = [plot['world_rect'] for plot in self._plots.values()]
+        if not rects:
+            self.surface = None
+            self.bounds = pygame.Rect(0, 0, 0, 0)
+            return
+        self.bounds = rects[0].unionall(rects[1:])
+        self.surface = pygame.Surface(self.bounds.size, pygame.SRCALPHA)
+        for cell in self._plots:
+            self._redraw(cell)
+
+    def update(self, plot: dict):
+        """Re-tile ``plot`` and its neighbours after its status changed."""
+        rect = plot.get('world_rect')
+        if not rect:
+            return
+        cell = self._cell(plot)
+        known = self._plots.get(cell) is plot
+        self._plots[cell] = plot
+        if self.surface is None or not known and not self.bounds.contains(rect):
+            self.rebuild(list(self._plots.values()))
+            return
+        x, y = cell
+        self._redraw(cell)
+        for dx, dy, _ in _NEIGHBOURS:
+            self._redraw((x + dx, y + dy))
+
+    def _redraw(self, cell: Tuple[int, int]):
+        plot = self._plots.get(cell)
+        if plot is None:
+            return
+        look = self.look(plot)
+        if self._looks.get(cell) == look:
+            return
+        self._looks[cell] = look
+        rect = plot['world_rect'].move(-self.bounds.x, -self.bounds.y)
+        self.surface.fill((0, 0, 0, 0), rect)
+        kind, value = look
+        if kind == 'soil':
+            self.surface.blit(self.get_image(value), rect)
+        else:
+            self.surface.fill(value, rect)
+
+    # ==================== Drawing ====================
+
+    def draw(self, screen: pygame.Surface, camera_x: int, camera_y: int):
+        if self.surface is not None:
+            screen.blit(self.surface, (self.bounds.x - camera_x, self.bounds.y - camera_y))
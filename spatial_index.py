@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Uniform-grid spatial index shared by the farm scene, map and player.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pygame
+
+
+@dataclass(eq=False)
+class _Entry:
+    """Bookkeeping for one indexed item."""
+
+    item: Any
+    rect: pygame.Rect
+    order: int
+    cells: List[Tuple[int, int]] = field(default_factory=list)
+
+
+class SpatialGrid:
+    """Buckets items by the grid cells their rect overlaps.
+
+    Items may be any object (plot dicts, trees, plain rects); they are tracked
+    by identity, so unhashable dicts work too. Queries return items in
+    insertion order so callers keep the same draw / collision order a plain
+    list scan would give.
+    """
+
+    def __init__(self, cell_size: int = 256):
+        self.cell_size = max(1, int(cell_size))
+        self._cells: Dict[Tuple[int, int], List[_Entry]] = {}
+        self._entries: Dict[int, _Entry] = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item: Any) -> bool:
+        return id(item) in self._entries
+
+    def __iter__(self) -> Iterator[Any]:
+        for entry in sorted(self._entries.values(), key=lambda e: e.order):
+            yield entry.item
+
+    def _cells_for(self, rect: pygame.Rect) -> List[Tuple[int, int]]:
+        size = self.cell_size
+        first_x = rect.left // size
+        first_y = rect.top // size
+        last_x = (rect.right - 1) // size if rect.width > 0 else first_x
+        last_y = (rect.bottom - 1) // size if rect.height > 0 else first_y
+        return [(cx, cy)
+                for cy in range(first_y, last_y + 1)
+                for cx in range(first_x, last_x + 1)]
+
+    def clear(self):
+        """Remove every item."""
+        self._cells.clear()
+        self._entries.clear()
+        self._next_order = 0
+
+    def insert(self, item: Any, rect: Optional[pygame.Rect] = None):
+        """Add an item; ``rect`` defaults to ``item.hitbox``/``item.rect``/the item itself."""
+        if id(item) in self._entries:
+            self.update(item, rect)
+            return
+        rect = self._resolve_rect(item, rect)
+        entry = _Entry(item, rect, self._next_order)
+        self._next_order += 1
+        self._entries[id(item)] = entry
+        self._link(entry)
+
+    def remove(self, item: Any) -> bool:
+        """Drop an item from the index. Returns False if it was not indexed."""
+        entry = self._entries.pop(id(item), None)
+        if entry is None:
+            return False
+        self._unlink(entry)
+        return True
+
+    def update(self, item: Any, rect: Optional[pygame.Rect] = None):
+        """Re-bucket an item whose rect moved or was replaced."""
+        entry = self._entries.get(id(item))
+        if entry is None:
+            self.insert(item, rect)
+            return
+        self._unlink(entry)
+        entry.rect = self._resolve_rect(item, rect)
+        self._link(entry)
+
+    def query_rect(self, rect: pygame.Rect) -> List[Any]:
+        """Return items whose rect overlaps ``rect``."""
+        found: Dict[int, _Entry] = {}
+        for cell in self._cells_for(rect):
+            for entry in self._cells.get(cell, ()):
+                if entry.rect.colliderect(rect):
+                    found[id(entry.item)] = entry
+        return [entry.item for entry in sorted(found.values(), key=lambda e: e.order)]
+
+    def query_point(self, x: float, y: float) -> List[Any]:
+        """Return items whose rect contains the world point ``(x, y)``."""
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+        hits = [entry for entry in self._cells.get(cell, ())
+                if entry.rect.collidepoint(x, y)]
+        hits.sort(key=lambda e: e.order)
+        return [entry.item for entry in hits]
+
+    @staticmethod
+    def _resolve_rect(item: Any, rect: Optional[pygame.Rect]) -> pygame.Rect:
+        if rect is not None:
+            return rect
+        for attr in ('hitbox', 'rect'):
+            value = getattr(item, attr, None)
+            if isinstance(value, pygame.Rect):
+                return value
+        if isinstance(item, pygame.Rect):
+            return item
+        raise TypeError(f"Cannot determine rect for {item!r}")
+
+    def _link(self, entry: _Entry):
+        entry.cells = self._cells_for(entry.rect)
+        for cell in entry.cells:
+            self._cells.setdefault(cell, []).append(entry)
+
+    def _unlink(self, entry: _Entry):
+        for cell in entry.cells:
+            bucket = self._cells.get(cell)
+            if not bucket:
+                continue
+            try:
+                bucket.remove(entry)
+            except ValueError:
+                pass
+            if not bucket:
+                del self._cells[cell]
+        entry.cells = []
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite backend for database.Database (local play, benchmarks, offline mode).
+
+The database file is attached under the schema name ``game`` so the
+``game.*`` queries inherited from Database run unchanged; only the statements
+that use SQL Server dialect (MERGE, UPDATE ... FROM, DATEDIFF) are overridden.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from config import (SQLITE_DB_PATH, CROP_WITHER_FACTOR, DEMO_PLOT_COLUMNS, DEMO_PLOT_ROWS,
+                    LOGIN_PAGE_SIZE)
+from database import Database, _group_player_farms, _like_prefix
+from profiler import profiled
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS game.Player (
+    PlayerId      INTEGER PRIMARY KEY,
+    Name          TEXT NOT NULL,
+    Level         INTEGER NOT NULL DEFAULT 1,
+    Exp           INTEGER NOT NULL DEFAULT 0,
+    CurrencyGold  REAL NOT NULL DEFAULT 0,
+    CurrencyGem   INTEGER NOT NULL DEFAULT 0,
+    Status        TEXT NOT NULL DEFAULT 'Active'
+);
+CREATE TABLE IF NOT EXISTS game.Farm (
+    FarmId        INTEGER PRIMARY KEY,
+    PlayerId      INTEGER NOT NULL REFERENCES Player(PlayerId),
+    Name          TEXT NOT NULL,
+    SoilQuality   INTEGER NOT NULL DEFAULT 50
+);
+CREATE TABLE IF NOT EXISTS game.ItemCatalog (
+    ItemId        INTEGER PRIMARY KEY,
+    Name          TEXT NOT NULL,
+    ItemType      TEXT NOT NULL,
+    StackLimit    INTEGER NOT NULL DEFAULT 999,
+    BasePrice     REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS game.CropVariety (
+    CropVarietyId INTEGER PRIMARY KEY,
+    Name          TEXT NOT NULL,
+    GrowthHours   INTEGER NOT NULL,
+    BaseYield     INTEGER NOT NULL DEFAULT 1,
+    SeedItemId    INTEGER REFERENCES ItemCatalog(ItemId),
+    ProduceItemId INTEGER REFERENCES ItemCatalog(ItemId)
+);
+CREATE TABLE IF NOT EXISTS game.Plot (
+    PlotId          INTEGER PRIMARY KEY,
+    FarmId          INTEGER NOT NULL REFERENCES Farm(FarmId),
+    X               INTEGER NOT NULL,
+    Y               INTEGER NOT NULL,
+    Status          TEXT NOT NULL DEFAULT 'Empty',
+    CropVarietyId   INTEGER REFERENCES CropVariety(CropVarietyId),
+    PlantedAt       DATETIME2,
+    WaterLevel      INTEGER NOT NULL DEFAULT 0,
+    FertilizerLevel INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS game.IX_Plot_FarmId ON Plot(FarmId, X, Y);
+CREATE TABLE IF NOT EXISTS game.Inventory (
+    InventoryId   INTEGER PRIMARY KEY,
+    FarmId        INTEGER NOT NULL REFERENCES Farm(FarmId),
+    ItemId        INTEGER NOT NULL REFERENCES ItemCatalog(ItemId),
+    Quantity      INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (FarmId, ItemId)
+);
+CREATE TABLE IF NOT EXISTS game.ActionLog (
+    ActionLogId   INTEGER PRIMARY KEY,
+    PlayerId      INTEGER,
+    FarmId        INTEGER,
+    Action        TEXT NOT NULL,
+    MetaJson      TEXT,
+    CreatedAt     DATETIME2 NOT NULL DEFAULT (SYSUTCDATETIME())
+);
+"""
+
+# Seconds since a DATETIME2 column value, computed in SQL
+_ELAPSED_SQL = "(julianday(SYSUTCDATETIME()) - julianday({column})) * 86400.0"
+
+
+def _adapt_datetime(value):
+    return value.isoformat(' ')
+
+
+def _convert_datetime(value):
+    return datetime.fromisoformat(value.decode())
+
+
+def _dict_factory(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_converter('DATETIME2', _convert_datetime)
+
+
+class SQLiteDatabase(Database):
+    """Database backed by a local SQLite file (WAL mode, cached prepared statements)"""
+
+    INVENTORY_MERGE_SQL = """
+        INSERT INTO game.Inventory (FarmId, ItemId, Quantity)
+        VALUES (?, ?, ?)
+        ON CONFLICT (FarmId, ItemId)
+        DO UPDATE SET Quantity = Quantity + excluded.Quantity
+        """
+
+    def __init__(self, path=SQLITE_DB_PATH, seed_demo=False):
+        super().__init__()
+        if path != ':memory:' and not os.path.isabs(path):
+            # Relative to the game directory, not the working directory
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        self.path = path
+        self.seed_demo = seed_demo
+        # SQLite work is in-process and short, so one connection serialised by a
+        # lock is shared by every thread (including the db.submit workers)
+        # instead of a ConnectionPool
+        self.conn = None
+        self.lock = threading.RLock()
+        # Current UTC time behind SYSUTCDATETIME() (farm_server substitutes a simulated clock)
+        self.clock = datetime.utcnow
+
+    def connect(self):
+        """Open the database file and create missing game.* tables"""
+        try:
+            self.conn = sqlite3.connect(
+                ':memory:',
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            self.conn.row_factory = _dict_factory
+            self.conn.create_function('SYSUTCDATETIME', 0, lambda: self.clock().isoformat(' '))
+            self.conn.execute("ATTACH DATABASE ? AS game", (self.path,))
+            self.conn.execute("PRAGMA game.journal_mode = WAL")
+            self.conn.execute("PRAGMA game.synchronous = NORMAL")
+            self.conn.execute("PRAGMA foreign_keys = ON")
+            self.conn.executescript(SCHEMA_SQL)
+            if self.seed_demo and not self.execute_query("SELECT 1 FROM game.Player LIMIT 1"):
+                self.seed_demo_data()
+            print(f"SQLite database opened: {self.path}")
+            return True
+        except Exception as e:
+            print(f"Database connection failed: {e}")
+            return False
+
+    def disconnect(self):
+        """Close the database file"""
+        self.shutdown_queries()
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+        print("Database disconnected")
+
+    @staticmethod
+    def _prepare(query):
+        """Database queries use pymssql's %s placeholders; sqlite3 wants ?"""
+        return query.replace('%s', '?')
+
+    @profiled('db.query', 'db')
+    def execute_query(self, query, params=None):
+        """Execute query statement"""
+        try:
+            with self.lock:
+                return self.conn.execute(self._prepare(query), params or ()).fetchall()
+        except Exception as e:
+            print(f"Query error: {e}")
+            return []
+
+    @profiled('db.update', 'db')
+    def execute_update(self, query, params=None):
+        """Execute update statement; returns the number of rows changed (False on error)"""
+        with self.lock:
+            try:
+                changed = self.conn.execute(self._prepare(query), params or ()).rowcount
+                self.conn.commit()
+                return changed
+            except Exception as e:
+                print(f"Update error: {e}")
+                self.conn.rollback()
+                return False
+
+    @profiled('db.batch', 'db')
+    def execute_transaction(self, statements):
+        """
+        Run (query, params) statements in one transaction and return the rows
+        of the last one (None on error). sqlite3 executes one statement per
+        call, so this replaces Database.execute_batch's multi-statement batch.
+        """
+        with self.lock:
+            try:
+                rows = []
+                for query, params in statements:
+                    rows = self.conn.execute(self._prepare(query), params or ()).fetchall()
+                self.conn.commit()
+                return rows
+            except Exception as e:
+                print(f"Batch error: {e}")
+                self.conn.rollback()
+                return None
+
+    # ==================== Demo Data ====================
+
+    def seed_demo_data(self, plot_columns=DEMO_PLOT_COLUMNS, plot_rows=DEMO_PLOT_ROWS, seed=None,
+                       farm_count=1):
+        """Fill the tables with the same demo farms MemoryDatabase generates"""
+        from memory_database import MemoryDatabase
+
+        demo = MemoryDatabase().seed_demo_data(plot_columns, plot_rows, seed, farm_count)
+        tables = [
+            ('Player', demo.players.values()),
+            ('Farm', demo.farms.values()),
+            ('ItemCatalog', demo.items.values()),
+            ('CropVariety', demo.crop_varieties.values()),
+            ('Plot', demo.plots.values()),
+            ('Inventory', [{'FarmId': farm_id, 'ItemId': item_id, 'Quantity': quantity}
+                           for (farm_id, item_id), quantity in demo.inventory.items()]),
+        ]
+        with self.lock:
+            try:
+                for table, rows in tables:
+                    rows = list(rows)
+                    if not rows:
+                        continue
+                    columns = list(rows[0])
+                    query = (f"INSERT OR REPLACE INTO game.{table} ({', '.join(columns)}) "
+                             f"VALUES ({', '.join('?' for _ in columns)})")
+                    self.conn.executemany(query, [tuple(row[c] for c in columns) for row in rows])
+                self.conn.commit()
+            except Exception as e:
+                print(f"Seed error: {e}")
+                self.conn.rollback()
+                return False
+        self.cache.invalidate()
+        return True
+
+    # ==================== Player Related ====================
+
+    def get_player_page(self, key=None, limit=LOGIN_PAGE_SIZE, backward=False):
+        """Database.get_player_page with LIMIT instead of TOP"""
+        where = "Status = 'Active'"
+        params = []
+        if key is not None:
+            where += " AND PlayerId < ?" if backward else " AND PlayerId > ?"
+            params.append(key)
+        params.append(limit)
+        query = f"""
+        SELECT p.PlayerId, p.Name, p.Level, p.Exp, p.CurrencyGold, p.CurrencyGem, p.Status,
+               f.FarmId, f.Name AS FarmName, f.SoilQuality
+        FROM (
+            SELECT PlayerId, Name, Level, Exp, CurrencyGold, CurrencyGem, Status
+            FROM game.Player
+            WHERE {where}
+            ORDER BY PlayerId {'DESC' if backward else 'ASC'}
+            LIMIT ?
+        ) AS p
+        LEFT JOIN game.Farm AS f ON f.PlayerId = p.PlayerId
+        ORDER BY p.PlayerId, f.FarmId
+        """
+        return _group_player_farms(self.execute_query(query, tuple(params)))
+
+    def find_player_by_name(self, prefix):
+        """Database.find_player_by_name with LIMIT and case-insensitive name order"""
+        query = """
+        SELECT PlayerId, Name, Level, Exp, CurrencyGold, CurrencyGem, Status
+        FROM game.Player
+        WHERE Status = 'Active' AND Name LIKE ? ESCAPE '\\'
+        ORDER BY Name COLLATE NOCASE, PlayerId
+        LIMIT 1
+        """
+        result = self.execute_query(query, (_like_prefix(prefix),))
+        return result[0] if result else None
+
+    # ==================== Plot Related ====================
+
+    def apply_daily_tick(self, farm_id, rain_delta=0, wither_factor=CROP_WITHER_FACTOR):
+        """Same as Database.apply_daily_tick, in SQLite dialect"""
+        elapsed = _ELAPSED_SQL.format(column='p.PlantedAt')
+        update = f"""
+        UPDATE game.Plot AS p
+        SET WaterLevel = MIN(100, IFNULL(p.WaterLevel, 0) + ?),
+            Status = CASE
+                WHEN p.Status IN ('Growing', 'Mature') AND p.PlantedAt IS NOT NULL
+                     AND cv.GrowthHours > 0
+                     AND {elapsed} >= cv.GrowthHours * 3600.0 * ? THEN 'Withered'
+                WHEN p.Status = 'Growing' AND p.PlantedAt IS NOT NULL
+                     AND {elapsed} >= IFNULL(cv.GrowthHours, 0) * 3600.0 THEN 'Mature'
+                ELSE p.Status
+            END
+        FROM (SELECT p2.PlotId, c.GrowthHours
+              FROM game.Plot p2
+              LEFT JOIN game.CropVariety c ON c.CropVarietyId = p2.CropVarietyId) AS cv
+        WHERE cv.PlotId = p.PlotId AND p.FarmId = ?
+        """
+        select = """
+        SELECT p.PlotId, p.FarmId, p.X, p.Y, p.Status,
+               p.CropVarietyId, p.PlantedAt, p.WaterLevel, p.FertilizerLevel,
+               cv.Name AS CropName, cv.GrowthHours
+        FROM game.Plot p
+        LEFT JOIN game.CropVariety cv ON cv.CropVarietyId = p.CropVarietyId
+        WHERE p.FarmId = ?
+        ORDER BY p.X, p.Y
+        """
+        return self.execute_transaction([
+            (update, (rain_delta, wither_factor, farm_id)),
+            (select, (farm_id,)),
+        ])
+
+    def harvest_plot(self, plot_id):
+        """Harvest crop (also accepts Growing crops whose GrowthHours have passed)"""
+        elapsed = _ELAPSED_SQL.format(column='PlantedAt')
+        query = f"""
+        UPDATE game.Plot
+        SET Status = 'Empty', CropVarietyId = NULL, PlantedAt = NULL,
+            WaterLevel = 0, FertilizerLevel = 0
+        WHERE PlotId = ?
+          AND (Status = 'Mature'
+               OR (Status = 'Growing' AND PlantedAt IS NOT NULL
+                   AND {elapsed} >= IFNULL(
+                       (SELECT GrowthHours FROM game.CropVariety cv
+                        WHERE cv.CropVarietyId = Plot.CropVarietyId), 0) * 3600.0))
+        """
+        with self.lock:
+            try:
+                changed = self.conn.execute(query, (plot_id,)).rowcount
+                self.conn.commit()
+                return changed > 0
+            except Exception as e:
+                print(f"Update error: {e}")
+                self.conn.rollback()
+                return False
+
+    # ==================== Inventory Related ====================
+
+    def update_inventory(self, farm_id, item_id, quantity_change):
+        """Update inventory quantity"""
+        success = self.execute_update(self.INVENTORY_MERGE_SQL, (farm_id, item_id, quantity_change))
+        if success:
+            self._cache_inventory_change(farm_id, item_id, quantity_change)
+        return success
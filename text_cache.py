@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Retained-mode text / panel surfaces for the HUD and menus.
+
+Rendered text, translucent panels and composed HUD blocks are cached with
+LRU eviction, so a string that did not change since the last frame is never
+rendered again. Cached surfaces are shared; callers must not modify them
+(copy first if a per-blit alpha is needed).
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import pygame
+
+from config import TEXT_CACHE_SIZE
+
+Color = Tuple[int, ...]
+
+
+class TextCache:
+    """LRU cache of rendered text, panel and composed surfaces."""
+
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        self.max_size = max(1, int(max_size))
+        self._surfaces: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def cached(self, key: Hashable, build: Callable[[], pygame.Surface]) -> pygame.Surface:
+        """Return the surface stored under ``key``, calling ``build()`` on a miss."""
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = build()
+        self._surfaces[key] = surf
+        while len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def render(self, font: pygame.font.Font, text: Any, color: Color,
+               antialias: bool = True, background: Optional[Color] = None) -> pygame.Surface:
+        """Cached ``font.render(text, antialias, color, background)``."""
+        text = str(text)
+        key = ('text', font, text, tuple(color), antialias,
+               tuple(background) if background is not None else None)
+        return self.cached(key, lambda: font.render(text, antialias, color, background))
+
+    def panel(self, size: Tuple[int, int], color: Color, alpha: Optional[int] = None) -> pygame.Surface:
+        """Cached solid ``size`` surface filled with ``color`` (optionally translucent)."""
+        size = (int(size[0]), int(size[1]))
+        key = ('panel', size, tuple(color), alpha)
+
+        def build():
+            surf = pygame.Surface(size)
+            if alpha is not None:
+                surf.set_alpha(alpha)
+            surf.fill(color)
+            return surf
+
+        return self.cached(key, build)
+
+
+# Global text cache instance
+text_cache = None
+
+
+def get_text_cache() -> TextCache:
+    """Get the shared text cache"""
+    global text_cache
+    if text_cache is None:
+        text_cache = TextCache()
+    return text_cache
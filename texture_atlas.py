@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Texture atlas packing: many small frames in one surface plus a sub-rect table.
+
+An atlas is saved as ``<name>.atlas`` (a PNG sheet, decoded in one load) and
+``<name>.json`` (regions and the source files' mtimes/sizes). A cached atlas
+is only reused while every source file and the packed frame size match.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+ATLAS_MAX_WIDTH = 1024
+ATLAS_PADDING = 1
+ATLAS_VERSION = 1
+
+Size = Optional[Tuple[int, int]]
+
+
+def source_stamps(sources: Dict[str, str]) -> Dict[str, List[int]]:
+    """Return {key: [mtime_ns, size]} for each source file (missing files are skipped)."""
+    stamps = {}
+    for key, path in sources.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stamps[key] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def read_index(directory: str, name: str) -> Optional[dict]:
+    """Read ``<name>.json`` from ``directory`` (None if missing, unreadable or outdated)."""
+    index_path = os.path.join(directory, f"{name}.json")
+    if not os.path.exists(index_path):
+        return None
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError) as exc:
+        print(f"Ignoring unreadable atlas index {index_path}: {exc}")
+        return None
+    if not isinstance(index, dict) or index.get('version') != ATLAS_VERSION:
+        return None
+    return index
+
+
+def index_is_fresh(index: dict, sources: Dict[str, str], frame_size: Size) -> bool:
+    """True if the index was packed from exactly these files at this frame size."""
+    packed_size = index.get('frame_size')
+    if (tuple(packed_size) if packed_size else None) != frame_size:
+        return False
+    if set(sources) != set(index.get('regions', {})):
+        return False
+    return source_stamps(sources) == index.get('stamps')
+
+
+@dataclass
+class TextureAtlas:
+    """One packed sheet and the rect of every frame in it."""
+
+    name: str
+    surface: pygame.Surface
+    regions: Dict[str, pygame.Rect]
+    frame_size: Size = None
+    stamps: Dict[str, List[int]] = field(default_factory=dict)
+    _subsurfaces: Dict[str, pygame.Surface] = field(default_factory=dict, repr=False)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.regions
+
+    def region(self, key: str) -> Optional[pygame.Rect]:
+        """Sub-rect of ``key`` inside :attr:`surface` (for ``blit(..., area=rect)``)."""
+        return self.regions.get(key)
+
+    def subsurface(self, key: str) -> Optional[pygame.Surface]:
+        """A view of ``key``'s pixels that shares memory with the sheet."""
+        surf = self._subsurfaces.get(key)
+        if surf is None:
+            rect = self.regions.get(key)
+            if rect is None:
+                return None
+            surf = self._subsurfaces[key] = self.surface.subsurface(rect)
+        return surf
+
+    def is_fresh(self, sources: Dict[str, str], frame_size: Size) -> bool:
+        """True if the atlas was packed from exactly these files at this frame size."""
+        return index_is_fresh(self.index(), sources, frame_size)
+
+    def index(self) -> dict:
+        """The JSON index describing this atlas."""
+        return {
+            'version': ATLAS_VERSION,
+            'frame_size': list(self.frame_size) if self.frame_size else None,
+            'regions': {key: [r.x, r.y, r.w, r.h] for key, r in self.regions.items()},
+            'stamps': self.stamps,
+        }
+
+    # ==================== Disk Cache ====================
+
+    @staticmethod
+    def _paths(directory: str, name: str) -> Tuple[str, str]:
+        return (os.path.join(directory, f"{name}.atlas"),
+                os.path.join(directory, f"{name}.json"))
+
+    def save(self, directory: str) -> bool:
+        """Write ``<name>.atlas`` and ``<name>.json`` into ``directory``."""
+        sheet_path, index_path = self._paths(directory, self.name)
+        index = self.index()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(sheet_path, 'wb') as f:
+                pygame.image.save(self.surface, f, 'png')
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+        except (OSError, pygame.error) as exc:
+            print(f"Failed to save atlas {self.name}: {exc}")
+            return False
+        return True
+
+    @classmethod
+    def load(cls, directory: str, name: str) -> Optional["TextureAtlas"]:
+        """Load a saved atlas, or None if it is missing or unreadable."""
+        sheet_path, _ = cls._paths(directory, name)
+        index = read_index(directory, name)
+        if index is None or not os.path.exists(sheet_path):
+            return None
+        try:
+            surface = pygame.image.load(sheet_path)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+        except (OSError, pygame.error) as exc:
+            print(f"Ignoring unreadable atlas {sheet_path}: {exc}")
+            return None
+        frame_size = index.get('frame_size')
+        return cls(
+            name=name,
+            surface=surface,
+            regions={key: pygame.Rect(rect) for key, rect in index['regions'].items()},
+            frame_size=tuple(frame_size) if frame_size else None,
+            stamps={key: list(stamp) for key, stamp in index.get('stamps', {}).items()},
+        )
+
+
+def pack_atlas(name: str, images: Dict[str, pygame.Surface], frame_size: Size = None,
+               stamps: Optional[Dict[str, List[int]]] = None,
+               max_width: int = ATLAS_MAX_WIDTH, padding: int = ATLAS_PADDING) -> TextureAtlas:
+    """Shelf-pack ``images`` (tallest first) into a single SRCALPHA surface."""
+    order = sorted(images, key=lambda key: (-images[key].get_height(), key))
+    width = max([max_width] + [images[key].get_width() + padding for key in order])
+
+    regions: Dict[str, pygame.Rect] = {}
+    x = y = shelf_height = used_width = 0
+    for key in order:
+        w, h = images[key].get_size()
+        if x and x + w > width:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        regions[key] = pygame.Rect(x, y, w, h)
+        x += w + padding
+        used_width = max(used_width, x - padding)
+        shelf_height = max(shelf_height, h)
+
+    sheet = pygame.Surface((max(1, used_width), max(1, y + shelf_height)), pygame.SRCALPHA)
+    for key, rect in regions.items():
+        sheet.blit(images[key], rect)
+    if pygame.display.get_surface() is not None:
+        sheet = sheet.convert_alpha()
+    return TextureAtlas(name, sheet, regions, frame_size, dict(stamps or {}))
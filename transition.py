@@ -1,5 +1,5 @@
 import pygame
-from config import SCREEN_WIDTH, SCREEN_HEIGHT
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, TRANSITION_FADE_TIME
 
 class Transition:
 	def __init__(self, reset, player):
@@ -12,18 +12,23 @@ class Transition:
 		# overlay image
 		self.image = pygame.Surface((SCREEN_WIDTH,SCREEN_HEIGHT))
 		self.color = 255
-		self.speed = -2
+		# colour change per second (fade out, then back in after the reset)
+		self.fade_speed = 255 / TRANSITION_FADE_TIME
+		self.speed = -self.fade_speed
 
-	def play(self):
-		self.color += self.speed
+	def update(self, dt):
+		"""Advance the fade by dt seconds of game time"""
+		self.color += self.speed * dt
 		if self.color <= 0:
-			self.speed *= -1
+			self.speed = self.fade_speed
 			self.color = 0
 			self.reset()
 		if self.color > 255:
 			self.color = 255
 			self.player.sleep = False
-			self.speed = -2
+			self.speed = -self.fade_speed
 
-		self.image.fill((self.color,self.color,self.color))
+	def play(self):
+		color = int(self.color)
+		self.image.fill((color,color,color))
 		self.display_surface.blit(self.image, (0,0), special_flags = pygame.BLEND_RGBA_MULT)